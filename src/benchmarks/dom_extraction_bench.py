@@ -0,0 +1,147 @@
+"""
+Micro-benchmark: element-by-element DOM reads vs. a single execute_script payload.
+
+Loads a synthetic startups.gallery-style listing and a synthetic posting page from a
+local file into headless Chrome, then runs both extraction paths and reports the number
+of WebDriver commands (HTTP round trips to chromedriver) and wall time for each.
+
+    python -m src.benchmarks.dom_extraction_bench --cards 500 --repeat 5
+"""
+
+from selenium.webdriver.common.by import By # type: ignore
+from typing import Dict, Any, List, Callable
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from src.extraction.compaction import MAIN_CONTENT_SELECTORS
+from src.scrapers.dom_scripts import GALLERY_CARDS_SCRIPT, POSTING_PAYLOAD_SCRIPT
+from src.scrapers.driver_factory import create_driver
+from src.scrapers.startup_gall_scrape import JOB_CARD_SELECTOR
+
+CARD_CLASSES = "framer-1fxtycr framer-1s7tguz"
+
+
+def gallery_page(num_cards: int) -> str:
+    """Listing page shaped like startups.gallery: cards in a framer container, two Company Name divs each"""
+    cards = "".join(
+        f'<a class="{CARD_CLASSES}" href="https://jobs.lever.co/acme{i}/{i:08d}-0000-0000-0000-000000000000">'
+        f'<div data-framer-name="Company Name">Engineer {i}</div>'
+        f'<div data-framer-name="Company Name">Acme {i} - Series A</div></a>'
+        for i in range(num_cards)
+    )
+    return f'<html><body><div class="framer-root"><div class="framer-list">{cards}</div></div></body></html>'
+
+
+def posting_page(num_paragraphs: int) -> str:
+    """Lever-shaped posting page with a headline and a long description"""
+    paragraphs = "".join(f"<p>Responsibility {i}: build and operate data pipelines.</p>" for i in range(num_paragraphs))
+    return (
+        '<html><head><title>Data Engineer | Acme</title></head><body>'
+        '<div class="posting-page"><div class="posting-headline"><h2>Data Engineer</h2></div>'
+        f'<div class="content">{paragraphs}</div></div><footer>Powered by Lever</footer></body></html>'
+    )
+
+
+def gallery_element_by_element(driver) -> List[Dict[str, Any]]:
+    """The listing read as pull_data did before: one command per card href and per text div"""
+    job_elements = driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
+    parent_container = job_elements[0].find_element(By.XPATH, "./ancestor::div[contains(@class, 'framer-')]")
+    company_divs = parent_container.find_elements(By.CSS_SELECTOR, "div[data-framer-name='Company Name']")
+    company_texts = [div.text for div in company_divs]
+    links = [link.get_attribute("href") for link in job_elements]
+    return [{"url": url, "title": company_texts[2 * i], "company_info": company_texts[2 * i + 1]}
+            for i, url in enumerate(links)]
+
+
+def gallery_single_script(driver) -> List[Dict[str, Any]]:
+    return driver.execute_script(GALLERY_CARDS_SCRIPT, JOB_CARD_SELECTOR, 0)["cards"]
+
+
+def posting_element_by_element(driver) -> Dict[str, Any]:
+    """The posting read as the Lever scraper did before: headline, title element, then content selectors"""
+    headline = driver.find_element(By.CLASS_NAME, "posting-headline")
+    title = headline.find_element(By.TAG_NAME, "h2").text
+    for selector in MAIN_CONTENT_SELECTORS["Lever"]:
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        if elements and elements[0].text.strip():
+            return {"title": title, "text": elements[0].text}
+    return {"title": title, "text": driver.find_element(By.TAG_NAME, "body").text}
+
+
+def posting_single_script(driver) -> Dict[str, Any]:
+    return driver.execute_script(POSTING_PAYLOAD_SCRIPT, ".posting-headline h2", MAIN_CONTENT_SELECTORS["Lever"])
+
+
+class CommandCounter:
+    """Counts WebDriver commands by wrapping the driver's execute method"""
+
+    def __init__(self, driver):
+        self.count = 0
+        self._execute = driver.execute
+
+        def counting_execute(*args, **kwargs):
+            self.count += 1
+            return self._execute(*args, **kwargs)
+
+        driver.execute = counting_execute
+
+
+def measure(driver, counter: CommandCounter, extract: Callable, repeat: int) -> Dict[str, Any]:
+    timings = []
+    counter.count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract(driver)
+        timings.append(time.perf_counter() - start)
+    return {
+        "round_trips": counter.count // repeat,
+        "median_ms": statistics.median(timings) * 1000,
+        "items": len(result),
+    }
+
+
+def run(num_cards: int = 200, num_paragraphs: int = 200, repeat: int = 5, headless: bool = True) -> List[Dict[str, Any]]:
+    """Run both paths on both pages and return one result row per (page, path)"""
+    rows = []
+    driver = create_driver(headless=headless)
+    counter = CommandCounter(driver)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = {
+                "gallery": (gallery_page(num_cards), gallery_element_by_element, gallery_single_script),
+                "posting": (posting_page(num_paragraphs), posting_element_by_element, posting_single_script),
+            }
+            for name, (markup, legacy, scripted) in pages.items():
+                path = os.path.join(tmp, f"{name}.html")
+                with open(path, "w") as f:
+                    f.write(markup)
+                driver.get(f"file://{path}")
+                if name == "gallery":
+                    # Both paths must read the same cards, or the comparison is meaningless
+                    assert legacy(driver) == scripted(driver)
+                for label, extract in (("element_by_element", legacy), ("single_script", scripted)):
+                    rows.append({"page": name, "path": label, **measure(driver, counter, extract, repeat)})
+    finally:
+        driver.quit()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare WebDriver round trips and wall time for DOM extraction")
+    parser.add_argument("--cards", type=int, default=200, help="Job cards on the synthetic listing page")
+    parser.add_argument("--paragraphs", type=int, default=200, help="Paragraphs on the synthetic posting page")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the median is reported")
+    parser.add_argument("--no-headless", dest="headless", action="store_false", help="Show the browser")
+    args = parser.parse_args()
+
+    rows = run(args.cards, args.paragraphs, args.repeat, args.headless)
+    print(f"{'page':<10}{'path':<22}{'round trips':>12}{'median ms':>12}")
+    for row in rows:
+        print(f"{row['page']:<10}{row['path']:<22}{row['round_trips']:>12}{row['median_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark: top-k profile queries against the memory-mapped job matching index.
+
+Fills an index with random unit vectors (embedding cost is the model's, not the index's),
+then times queries with a fixed profile vector and reports median and p95 latency.
+
+    python -m src.benchmarks.match_bench --postings 100000 --queries 200
+"""
+
+from typing import Dict, Any
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np # type: ignore
+
+from src.filtering.embedding_index import EmbeddingIndex, HashingEmbedder
+
+
+def run(num_postings: int = 100000, num_queries: int = 200, k: int = 10, dim: int = 384,
+        chunk: int = 10000) -> Dict[str, Any]:
+    """Build an index of num_postings rows in chunk-sized appends and time num_queries queries"""
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = EmbeddingIndex(tmp, embedder=HashingEmbedder(dim=dim))
+        start = time.perf_counter()
+        for offset in range(0, num_postings, chunk):
+            rows = min(chunk, num_postings - offset)
+            index.add_vectors(rng.standard_normal((rows, dim)),
+                              [{"url": f"https://jobs.lever.co/bench/{offset + i}"} for i in range(rows)])
+        build_seconds = time.perf_counter() - start
+
+        profile = rng.standard_normal(dim)
+        timings = []
+        for _ in range(num_queries):
+            start = time.perf_counter()
+            index.query_vector(profile, k)
+            timings.append(time.perf_counter() - start)
+        index.close()
+    timings.sort()
+    return {
+        "postings": num_postings,
+        "build_seconds": build_seconds,
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[int(0.95 * (len(timings) - 1))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time top-k queries against the job matching index")
+    parser.add_argument("--postings", type=int, default=100000, help="Rows in the index")
+    parser.add_argument("--queries", type=int, default=200, help="Queries to time")
+    parser.add_argument("-k", "--top", type=int, default=10, help="Matches per query")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimensions")
+    args = parser.parse_args()
+
+    result = run(args.postings, args.queries, args.top, args.dim)
+    print(f"Indexed {result['postings']} postings in {result['build_seconds']:.2f}s; "
+          f"query median {result['median_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
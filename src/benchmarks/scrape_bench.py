@@ -0,0 +1,461 @@
+"""
+Offline end-to-end benchmark of the real scrapers against recorded fixtures.
+
+Saved Ashby, Greenhouse, Lever and startups.gallery pages are served from a local
+HTTP server and the Anthropic client is replaced by a stub returning canned JSON,
+so runs need no network, no API key and cost nothing. Each mode reports throughput
+(jobs/min, pages/min), per-stage latency percentiles from the tracer and peak RSS
+of this process plus its browsers. Browser modes run under both the default and the
+lean Chrome profile so the two can be compared, and every run is appended as one
+JSON line to a results file so runs can be compared over time.
+
+Modes:
+    single   one browser, every posting loaded in Chrome in sequence
+    pooled   run_batch on a DriverPool (plain HTTP first where the platform allows it)
+    http     plain HTTP fetches only, for the platforms that support them
+    gallery  startups.gallery crawl with Load More clicks
+
+    python -m src.benchmarks.scrape_bench --modes http pooled --jobs 60 --workers 4
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, Any, List, Iterator, Optional, Callable
+import argparse
+import functools
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import tempfile
+import threading
+import time
+
+from src.extraction.prompts import estimate_tokens
+from src.scrapers.batch_scraper import run_batch
+from src.scrapers.driver_factory import create_driver
+from src.scrapers.host_limiter import DEFAULT_HOST_LIMITER, host_key
+from src.scrapers.job_app_scraper import SCRAPER_CLASSES, get_scraper_class
+from src.scrapers.startup_gall_scrape import StartupJobScraper
+from src.utils.tracing import DEFAULT_TRACER
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Request paths are routed to a fixture by the first marker they contain. Posting paths
+# keep the real domain in them so get_scraper_class routes local URLs to the right scraper.
+FIXTURE_ROUTES = [
+    ("startups.gallery", "startups_gallery.html"),
+    ("lever.co", "lever_posting.html"),
+    ("greenhouse.io", "greenhouse_posting.html"),
+    ("ashbyhq.com", "ashby_posting.html"),
+]
+
+MODES = ("single", "pooled", "http", "gallery")
+# Browser modes run once per profile so lean Chrome can be compared with the default setup
+PROFILES = ("default", "lean")
+
+
+def posting_path(index: int) -> str:
+    """Path of the index-th posting, cycling Lever, Greenhouse and Ashby (same scheme as the gallery fixture)"""
+    uuid = f"{index:08x}-0000-4000-8000-{index:012x}"
+    if index % 3 == 0:
+        return f"/jobs.lever.co/acme/{uuid}"
+    if index % 3 == 1:
+        return f"/boards.greenhouse.io/globex/jobs/{4000000 + index}"
+    return f"/jobs.ashbyhq.com/initech/{uuid}"
+
+
+class FixtureServer:
+    """Serves the recorded pages on 127.0.0.1 from a background thread"""
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, latency: float = 0.0):
+        """
+        Args:
+            fixtures_dir: Directory holding the files named in FIXTURE_ROUTES
+            latency: Seconds to delay every response, to approximate a real network
+        """
+        self.pages: Dict[str, bytes] = {}
+        for _, filename in FIXTURE_ROUTES:
+            with open(os.path.join(fixtures_dir, filename), "rb") as f:
+                self.pages[filename] = f.read()
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def route(self, path: str) -> Optional[bytes]:
+        for marker, filename in FIXTURE_ROUTES:
+            if marker in path:
+                return self.pages[filename]
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                if self.path.startswith("/static/"):
+                    body, content_type = b"", "text/css"
+                else:
+                    body, content_type = server.route(self.path), "text/html; charset=utf-8"
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def start(self) -> "FixtureServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class _StubMessages:
+    def __init__(self, owner: "StubAnthropic"):
+        self.owner = owner
+
+    def create(self, **kwargs) -> SimpleNamespace:
+        prompt = kwargs["messages"][0]["content"]
+        with self.owner._lock:
+            self.owner.calls += 1
+        if self.owner.latency:
+            time.sleep(self.owner.latency)
+        record = self.owner.response_for(prompt)
+        text = json.dumps(record)
+        if kwargs.get("tools"):
+            block = SimpleNamespace(type="tool_use", name=kwargs["tools"][0]["name"], input=record)
+        else:
+            block = SimpleNamespace(type="text", text=text)
+        return SimpleNamespace(content=[block],
+                               usage=SimpleNamespace(input_tokens=estimate_tokens(prompt),
+                                                     output_tokens=estimate_tokens(text)))
+
+
+class StubAnthropic:
+    """Stands in for anthropic.Anthropic: messages.create returns a canned extraction for the prompt's posting"""
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Seconds each call takes, to approximate API response time
+        """
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.messages = _StubMessages(self)
+
+    @staticmethod
+    def response_for(prompt: str) -> Dict[str, Any]:
+        def field(name: str) -> Optional[str]:
+            match = re.search(rf"- {name}: (.+)", prompt)
+            return match.group(1).strip() if match else None
+
+        content = prompt.split("JOB POSTING CONTENT:", 1)[-1].strip()
+        title = content.splitlines()[0].strip() if content else None
+        return {
+            "job_title": title, "company_name": "Fixture Co", "location": "Remote",
+            "employment_type": "Full-time", "department": "Engineering", "application_deadline": None,
+            "compensation": None, "required_skills": ["Python", "SQL"], "experience_level": "Senior",
+            "job_description": "Recorded fixture posting used for benchmarking.",
+            "responsibilities": ["Build pipelines"], "qualifications": ["5+ years of experience"],
+            "benefits": ["Health coverage"], "good_fit_indicators": [], "poor_fit_indicators": [],
+            "application_instructions": None, "source_url": field("source_url"), "platform": field("platform"),
+        }
+
+
+def process_tree_rss(pid: Optional[int] = None) -> int:
+    """Resident memory in bytes of a process and all its descendants (Chrome runs as children)"""
+    pid = pid or os.getpid()
+    if not os.path.isdir("/proc"):
+        # No procfs: fall back to this process's own high-water mark (KiB on Linux, bytes on macOS)
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if platform.system() == "Darwin" else maxrss * 1024
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so split after its closing parenthesis
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError):
+            continue
+        stack.extend(children.get(current, []))
+    return total
+
+
+class RssSampler:
+    """Samples process_tree_rss in a background thread and keeps the peak"""
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while True:
+            self.peak = max(self.peak, process_tree_rss())
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, process_tree_rss())
+
+
+def _no_browser():
+    raise RuntimeError("browser disabled in http mode")
+
+
+def run_single(urls: List[str], client, headless: bool = True, lean: bool = False, **_) -> List[Dict[str, Any]]:
+    """Every posting in one browser, one after another, as the single-URL CLI does"""
+    driver = create_driver(headless=headless, lean=lean)
+    try:
+        scrapers = {scraper_class: scraper_class(driver=driver, use_http=False, cache_mode="bypass", client=client)
+                    for scraper_class in SCRAPER_CLASSES.values()}
+        return [scrapers[get_scraper_class(url)].scrape_job(url) for url in urls]
+    finally:
+        driver.quit()
+
+
+def run_pooled(urls: List[str], client, headless: bool = True, lean: bool = False, workers: int = 4,
+               **_) -> List[Dict[str, Any]]:
+    """The production batch path: run_batch over a pool of browsers"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "results.jsonl")
+        run_batch(urls, output_path, workers=workers, headless=headless,
+                  driver_factory=functools.partial(create_driver, lean=lean), cache_mode="bypass", client=client)
+        with open(output_path) as f:
+            return [json.loads(line) for line in f]
+
+
+def run_http(urls: List[str], client, workers: int = 4, **_) -> List[Dict[str, Any]]:
+    """Plain HTTP fetches only; postings on browser-only platforms must be filtered out beforehand"""
+    scrapers = {scraper_class: scraper_class(driver_provider=_no_browser, cache_mode="bypass", client=client)
+                for scraper_class in SCRAPER_CLASSES.values() if scraper_class.supports_static_fetch}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda url: scrapers[get_scraper_class(url)].scrape_job(url), urls))
+
+
+def run_gallery(gallery_url: str, clicks: int, headless: bool = True, lean: bool = False,
+                **_) -> List[Dict[str, Any]]:
+    """Crawl the gallery fixture, returning the discovered cards"""
+    scraper = StartupJobScraper(gallery_url=gallery_url, driver_factory=functools.partial(create_driver, lean=lean))
+    try:
+        return list(scraper.iter_new_jobs(clicks))
+    finally:
+        scraper.cleanup()
+
+
+MODE_RUNNERS: Dict[str, Callable[..., List[Dict[str, Any]]]] = {
+    "single": run_single,
+    "pooled": run_pooled,
+    "http": run_http,
+}
+
+
+def measure(mode: str, action: Callable[[], List[Dict[str, Any]]], jobs: int, drivers: int = 0,
+            profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run one mode with a fresh tracer and report throughput, stage latencies and peak RSS
+
+    Args:
+        mode: Mode name for the results row
+        action: Runs the mode and returns one result per job
+        jobs: Number of jobs the mode was given
+        drivers: Browsers the mode launches, for the per-driver RSS estimate
+        profile: Browser profile ('default' or 'lean'), None for modes without a browser
+    """
+    DEFAULT_TRACER.reset()
+    baseline_rss = process_tree_rss()
+    start = time.perf_counter()
+    with RssSampler() as sampler:
+        results = action()
+    seconds = time.perf_counter() - start
+    failed = sum(1 for result in results if "error" in result)
+    stages = DEFAULT_TRACER.summary()
+    pages = sum(stage["count"] for stage in stages if stage["stage"] == "page_load" and stage["platform"] == "all")
+    row = {
+        "mode": mode,
+        "profile": profile,
+        "jobs": jobs,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "seconds": round(seconds, 3),
+        "jobs_per_min": round(len(results) / seconds * 60, 1) if seconds else 0.0,
+        "pages_per_min": round(pages / seconds * 60, 1) if seconds else 0.0,
+        "peak_rss_mb": round(sampler.peak / 2 ** 20, 1),
+        "stages": stages,
+    }
+    if drivers:
+        row["rss_per_driver_mb"] = round(max(sampler.peak - baseline_rss, 0) / drivers / 2 ** 20, 1)
+    return row
+
+
+def _revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def unpaced(url: str) -> Iterator[None]:
+    """Exempt a local fixture server from the shared host limiter, so runs measure the scrapers, not the pacing"""
+    host = host_key(url)
+    DEFAULT_HOST_LIMITER.unlimited_hosts.add(host)
+    try:
+        yield
+    finally:
+        DEFAULT_HOST_LIMITER.unlimited_hosts.discard(host)
+
+
+def run(modes: List[str], jobs: int = 30, workers: int = 4, headless: bool = True, llm_latency: float = 0.0,
+        network_latency: float = 0.0, gallery_clicks: int = 3,
+        profiles: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Run the selected modes against a fresh fixture server
+
+    Args:
+        profiles: Browser profiles to run each browser mode under ('default', 'lean'; both if omitted)
+
+    Returns:
+        One results record: run metadata and settings plus a row per mode and profile
+    """
+    profiles = profiles or list(PROFILES)
+    record: Dict[str, Any] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "settings": {"jobs": jobs, "workers": workers, "llm_latency": llm_latency,
+                     "network_latency": network_latency, "gallery_clicks": gallery_clicks, "profiles": profiles},
+        "modes": [],
+    }
+    with FixtureServer(latency=network_latency) as server, unpaced(server.base_url):
+        all_urls = [server.url(posting_path(i)) for i in range(jobs)]
+        for mode in modes:
+            if mode == "http":
+                client = StubAnthropic(latency=llm_latency)
+                urls = [url for url in all_urls if get_scraper_class(url).supports_static_fetch]
+                row = measure(mode, lambda: run_http(urls, client, workers=workers), jobs=len(urls))
+                row["llm_calls"] = client.calls
+                record["modes"].append(row)
+                continue
+
+            for profile in profiles:
+                options = {"headless": headless, "lean": profile == "lean", "workers": workers}
+                if mode == "gallery":
+                    gallery_url = server.url("/startups.gallery/jobs/")
+                    row = measure(mode, lambda: run_gallery(gallery_url, gallery_clicks, **options), jobs=0,
+                                  drivers=1, profile=profile)
+                    row["jobs"] = row["succeeded"]
+                else:
+                    client = StubAnthropic(latency=llm_latency)
+                    row = measure(mode, lambda: MODE_RUNNERS[mode](all_urls, client, **options), jobs=len(all_urls),
+                                  drivers=workers if mode == "pooled" else 1, profile=profile)
+                    row["llm_calls"] = client.calls
+                record["modes"].append(row)
+    return record
+
+
+def write_results(record: Dict[str, Any], path: str) -> None:
+    """Append a run to a JSONL results file"""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers offline against recorded fixtures")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Modes to run (default: all)")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES),
+                        help="Browser profiles for the browser modes (default: both, for comparison)")
+    parser.add_argument("--jobs", type=int, default=30, help="Postings per mode, cycling Lever/Greenhouse/Ashby")
+    parser.add_argument("--workers", type=int, default=4, help="Browsers (pooled) or threads (http)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds each stubbed LLM call takes")
+    parser.add_argument("--network-latency", type=float, default=0.0, help="Seconds added to every fixture response")
+    parser.add_argument("--gallery-clicks", type=int, default=3, help="Load More clicks in gallery mode")
+    parser.add_argument("--output", type=str, default="benchmark_results.jsonl",
+                        help="JSONL file each run is appended to (default: benchmark_results.jsonl)")
+    parser.add_argument("--no-headless", dest="headless", action="store_false", help="Show the browsers")
+    args = parser.parse_args()
+
+    record = run(args.modes, jobs=args.jobs, workers=args.workers, headless=args.headless,
+                 llm_latency=args.llm_latency, network_latency=args.network_latency,
+                 gallery_clicks=args.gallery_clicks, profiles=args.profiles)
+    write_results(record, args.output)
+
+    print(f"{'mode':<8} {'profile':<8} {'jobs':>5} {'failed':>6} {'jobs/min':>9} {'pages/min':>10} "
+          f"{'peak RSS MB':>12} {'MB/driver':>10}")
+    for row in record["modes"]:
+        print(f"{row['mode']:<8} {row['profile'] or '-':<8} {row['jobs']:>5} {row['failed']:>6} "
+              f"{row['jobs_per_min']:>9} {row['pages_per_min']:>10} {row['peak_rss_mb']:>12} "
+              f"{row.get('rss_per_driver_mb', '-'):>10}")
+        for stage in row["stages"]:
+            if stage["platform"] == "all":
+                print(f"    {stage['stage']:<18} p50 {stage['p50_seconds']}s  p95 {stage['p95_seconds']}s  "
+                      f"p99 {stage['p99_seconds']}s  (n={stage['count']})")
+    print(f"Results appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+from typing import Dict, Any, List, Optional, AsyncIterator, AsyncIterable, Iterable
+import asyncio
+import json
+import logging
+import random
+import time
+
+import anthropic # type: ignore
+
+from src.extraction.llm_cache import LLMCache, CACHE_MODES, cache_key
+from src.extraction.prompts import (PROMPT_VERSION, content_request, estimate_tokens, repair_request, requested_fields,
+                                    structured_savings)
+from src.extraction.schema import ParseStats, DEFAULT_PARSE_STATS, message_output, parse_extraction_message
+from src.extraction.structured_data import StructuredFieldStats, DEFAULT_STRUCTURED_STATS
+from src.utils import config
+from src.utils.tracing import Tracer, DEFAULT_TRACER
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+_DONE = object()
+
+
+class RateLimiter:
+    """Async token-bucket limiter for requests per minute and tokens per minute"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.request_capacity = float(requests_per_minute)
+        self.token_capacity = float(tokens_per_minute)
+        self._requests = self.request_capacity
+        self._tokens = self.token_capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.request_capacity, self._requests + elapsed * self.request_capacity / 60)
+        self._tokens = min(self.token_capacity, self._tokens + elapsed * self.token_capacity / 60)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request and the given number of tokens are available, then take them"""
+        tokens = min(float(tokens), self.token_capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait_requests = (1 - self._requests) * 60 / self.request_capacity
+                wait_tokens = (tokens - self._tokens) * 60 / self.token_capacity
+                await asyncio.sleep(max(wait_requests, wait_tokens, 0.01))
+
+    def adjust(self, tokens: int) -> None:
+        """Charge (or refund, if negative) the difference between estimated and actual usage"""
+        self._refill()
+        self._tokens = min(self.token_capacity, self._tokens - tokens)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an Anthropic API error is worth retrying (rate limits, overload, 5xx, network)"""
+    if isinstance(error, (anthropic.APIConnectionError, anthropic.APITimeoutError)):
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the retry-after header from an API error, if the server sent one"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncExtractor:
+    """Concurrent, rate-limited Claude extraction stage fed by scraped job_data dicts"""
+
+    def __init__(self, client=None, concurrency: int = config.LLM_CONCURRENCY,
+                 requests_per_minute: int = config.LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = config.LLM_TOKENS_PER_MINUTE,
+                 max_retries: int = config.LLM_MAX_RETRIES,
+                 base_delay: float = config.LLM_RETRY_BASE_DELAY,
+                 max_delay: float = config.LLM_RETRY_MAX_DELAY,
+                 cache: Optional[LLMCache] = None, cache_mode: str = config.LLM_CACHE_MODE,
+                 tracer: Optional[Tracer] = None, repair_attempts: int = config.LLM_REPAIR_ATTEMPTS,
+                 parse_stats: Optional[ParseStats] = None, structured_stats: Optional[StructuredFieldStats] = None):
+        """
+        Args:
+            client: anthropic.AsyncAnthropic client (one is built from the environment if omitted)
+            concurrency: Maximum in-flight API calls
+            requests_per_minute: Request budget enforced client-side
+            tokens_per_minute: Input token budget enforced client-side
+            max_retries: Retries on 429/5xx/connection errors before giving up on a posting
+            base_delay: Initial backoff in seconds; doubles per attempt with full jitter
+            max_delay: Upper bound on a single backoff
+            cache: Optional extraction cache shared with the synchronous path
+            cache_mode: 'use', 'refresh' or 'bypass'
+            tracer: Where to record LLM and parse spans (defaults to DEFAULT_TRACER)
+            repair_attempts: Cheap re-asks sending back only an unusable reply before giving up on it
+            parse_stats: Where to record how replies parsed (defaults to DEFAULT_PARSE_STATS)
+            structured_stats: Where to record fields read from structured data and the prompt
+                tokens that saved (defaults to DEFAULT_STRUCTURED_STATS)
+        """
+        if client is None:
+            # Retries are handled here so they can respect the shared rate limiter
+            client = anthropic.AsyncAnthropic(api_key=config.ANTHROPIC_API_KEY,
+                                              base_url=config.ANTHROPIC_BASE_URL, max_retries=0)
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}, got {cache_mode!r}")
+        self.client = client
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cache = None if cache_mode == "bypass" else cache
+        self.cache_mode = cache_mode
+        self.retries = 0
+        self.tracer = tracer if tracer is not None else DEFAULT_TRACER
+        self.repair_attempts = repair_attempts
+        self.parse_stats = parse_stats if parse_stats is not None else DEFAULT_PARSE_STATS
+        self.structured_stats = structured_stats if structured_stats is not None else DEFAULT_STRUCTURED_STATS
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = retry_after_seconds(error)
+        if delay is None:
+            delay = random.uniform(0, self.base_delay * (2 ** attempt))
+        return min(delay, self.max_delay)
+
+    async def extract(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract structured data for one job_data dict, retrying transient API errors"""
+        if "error" in content:
+            return content
+
+        platform = content.get("platform", "Unknown")
+        url = content.get("url")
+        key = cache_key(content.get("full_text", ""), platform)
+        try:
+            if self.cache is not None and self.cache_mode == "use":
+                cached = self.cache.get(key)
+                if cached is not None:
+                    cached["source_url"] = content.get("url")
+                    return cached
+
+            response = await self._create("llm", content, content_request(content, platform))
+            self.structured_stats.record(platform, *structured_savings(content, platform))
+            for attempt in range(self.repair_attempts + 1):
+                try:
+                    with self.tracer.span("json_parse", url=url, platform=platform):
+                        structured_data, method = parse_extraction_message(response, content, platform)
+                    self.parse_stats.record(platform, "repaired" if attempt else method)
+                    break
+                except ValueError as e:
+                    if attempt >= self.repair_attempts:
+                        self.parse_stats.record(platform, "failed")
+                        raise
+                    logger.warning(f"Unusable extraction for {url}, asking for a repair: {str(e)}")
+                    tool_input, text = message_output(response)
+                    raw_output = json.dumps(tool_input) if tool_input is not None else text
+                    response = await self._create("llm_repair", content,
+                                                  repair_request(raw_output, str(e), requested_fields(content)))
+
+            if self.cache is not None:
+                self.cache.put(key, structured_data, platform=platform, prompt_version=PROMPT_VERSION)
+        except Exception as e:
+            logger.error(f"Error processing with LLM: {str(e)}")
+            return {"error": str(e), "raw_data": content}
+        return structured_data
+
+    async def _create(self, stage: str, content: Dict[str, Any], request: Dict[str, Any]):
+        """
+        Make one Messages API call under the rate limiter, retrying transient errors
+
+        Raises:
+            Exception: The last API error once it is not retryable or retries are exhausted
+        """
+        platform = content.get("platform", "Unknown")
+        estimated_tokens = estimate_tokens(request["messages"][0]["content"])
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(estimated_tokens)
+            started = time.monotonic()
+            try:
+                with self.tracer.span(stage, url=content.get("url"), platform=platform, attempt=attempt) as span:
+                    response = await self.client.messages.create(**request)
+                    usage = getattr(response, "usage", None)
+                    if usage is not None:
+                        span.set(input_tokens=usage.input_tokens, output_tokens=usage.output_tokens)
+            except Exception as e:
+                if attempt < self.max_retries and is_retryable(e):
+                    delay = self._backoff(attempt, e)
+                    self.retries += 1
+                    logger.warning(f"Retryable LLM error for {content.get('url')} "
+                                   f"(attempt {attempt + 1}), retrying in {delay:.1f}s: {str(e)}")
+                    await asyncio.sleep(delay)
+                    continue
+                raise
+
+            if usage is not None:
+                self.limiter.adjust(usage.input_tokens - estimated_tokens)
+                if stage == "llm":
+                    self.structured_stats.observe(usage.output_tokens, time.monotonic() - started)
+            return response
+        raise RuntimeError("LLM retries exhausted")
+
+    async def extract_stream(self, source: AsyncIterable[Dict[str, Any]],
+                             ordered: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Drain job_data dicts from source through a bounded pool of API calls
+
+        Args:
+            source: Async iterable of raw job_data dicts (e.g. iter_queue over a scraper queue)
+            ordered: Emit results in source order instead of completion order
+
+        Yields:
+            Structured extraction results (or error dicts)
+        """
+        pending: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=self.concurrency * 2)
+        results: "asyncio.Queue[Any]" = asyncio.Queue()
+
+        async def feed():
+            index = 0
+            try:
+                async for item in source:
+                    await pending.put((index, item))
+                    index += 1
+            finally:
+                for _ in range(self.concurrency):
+                    await pending.put(_DONE)
+
+        async def work():
+            try:
+                while True:
+                    entry = await pending.get()
+                    if entry is _DONE:
+                        break
+                    index, item = entry
+                    await results.put((index, await self.extract(item)))
+            finally:
+                # Always signal completion, so a worker that died cannot leave the stream waiting
+                results.put_nowait(_DONE)
+
+        tasks = [asyncio.create_task(feed())] + [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        finished_workers = 0
+        next_index = 0
+        buffered: Dict[int, Dict[str, Any]] = {}
+        try:
+            while finished_workers < self.concurrency:
+                entry = await results.get()
+                if entry is _DONE:
+                    finished_workers += 1
+                    continue
+                index, result = entry
+                if not ordered:
+                    yield result
+                    continue
+                buffered[index] = result
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+            # Surface worker and producer errors instead of silently stopping early (workers first:
+            # with a worker gone the producer may be stuck on a full queue until it is cancelled)
+            for task in tasks[1:] + tasks[:1]:
+                await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def extract_all(self, contents: Iterable[Dict[str, Any]], ordered: bool = True) -> List[Dict[str, Any]]:
+        """Extract a fixed collection of job_data dicts and return the results as a list"""
+        async def source():
+            for content in contents:
+                yield content
+
+        return [result async for result in self.extract_stream(source(), ordered=ordered)]
+
+
+async def iter_queue(queue: "asyncio.Queue[Any]", sentinel: Any = None) -> AsyncIterator[Any]:
+    """Yield items from an asyncio queue until the sentinel is received"""
+    while True:
+        item = await queue.get()
+        if item is sentinel:
+            return
+        yield item
@@ -0,0 +1,230 @@
+from typing import Dict, Any, List, Optional, Iterable, Callable
+import hashlib
+import json
+import logging
+import os
+import time
+
+import anthropic # type: ignore
+
+from src.extraction.llm_cache import LLMCache, CACHE_MODES, cache_key
+from src.extraction.prompts import (PROMPT_VERSION, content_request, repair_request, requested_fields,
+                                    structured_savings)
+from src.extraction.schema import ParseStats, DEFAULT_PARSE_STATS, message_output, parse_extraction_message
+from src.extraction.structured_data import StructuredFieldStats, DEFAULT_STRUCTURED_STATS, known_fields
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+
+def custom_id_for(url: str) -> str:
+    """Stable batch request id for a posting URL (the API allows [a-zA-Z0-9_-]{1,64})"""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:48]
+
+
+class BatchExtractor:
+    """
+    Extracts many postings through the Message Batches API, trading latency for cost.
+
+    Submitted batch IDs and the postings in each batch are checkpointed to disk, so an
+    interrupted run resumes polling and collecting instead of resubmitting.
+    """
+
+    def __init__(self, client=None, checkpoint_path: str = config.LLM_BATCH_CHECKPOINT_PATH,
+                 poll_interval: float = config.LLM_BATCH_POLL_INTERVAL,
+                 max_requests: int = config.LLM_BATCH_MAX_REQUESTS,
+                 cache: Optional[LLMCache] = None, cache_mode: str = config.LLM_CACHE_MODE,
+                 repair_attempts: int = config.LLM_REPAIR_ATTEMPTS, parse_stats: Optional[ParseStats] = None,
+                 structured_stats: Optional[StructuredFieldStats] = None):
+        """
+        Args:
+            client: anthropic.Anthropic client (one is built from the environment if omitted)
+            checkpoint_path: JSON file recording submitted batches
+            poll_interval: Seconds between batch status checks
+            max_requests: Maximum postings per submitted batch
+            cache: Optional extraction cache; hits are never submitted and results are stored
+            cache_mode: 'use', 'refresh' or 'bypass'
+            repair_attempts: Real-time re-asks on the cheap model for replies that fail to parse
+            parse_stats: Where to record how replies parsed (defaults to DEFAULT_PARSE_STATS)
+            structured_stats: Where to record fields read from structured data and the prompt
+                tokens that saved (defaults to DEFAULT_STRUCTURED_STATS)
+        """
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}, got {cache_mode!r}")
+        self.client = client or anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY,
+                                                    base_url=config.ANTHROPIC_BASE_URL)
+        self.checkpoint_path = checkpoint_path
+        self.poll_interval = poll_interval
+        self.max_requests = max_requests
+        self.cache = None if cache_mode == "bypass" else cache
+        self.cache_mode = cache_mode
+        self.repair_attempts = repair_attempts
+        self.parse_stats = parse_stats if parse_stats is not None else DEFAULT_PARSE_STATS
+        self.structured_stats = structured_stats if structured_stats is not None else DEFAULT_STRUCTURED_STATS
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        return {"batches": {}}
+
+    def _save_checkpoint(self) -> None:
+        if os.path.dirname(self.checkpoint_path):
+            os.makedirs(os.path.dirname(self.checkpoint_path), exist_ok=True)
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def pending_batch_ids(self) -> List[str]:
+        """Batches submitted but not yet collected"""
+        return list(self.checkpoint["batches"])
+
+    def known_urls(self) -> set:
+        """URLs in submitted batches that have not been collected yet"""
+        return {posting["url"] for batch in self.checkpoint["batches"].values()
+                for posting in batch["postings"].values()}
+
+    def submit(self, contents: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Submit postings in batches of at most max_requests, skipping ones already submitted
+
+        Args:
+            contents: Raw job_data dicts (url, job_title, full_text, platform)
+
+        Returns:
+            IDs of the newly created batches
+        """
+        known = self.known_urls()
+        requests, postings = [], {}
+        for content in contents:
+            url = content.get("url")
+            if not url or "error" in content or url in known:
+                continue
+            known.add(url)
+            custom_id = custom_id_for(url)
+            platform = content.get("platform", "Unknown")
+            requests.append({
+                "custom_id": custom_id,
+                "params": content_request(content, platform),
+            })
+            # Structured fields are merged into the reply at collection, so they are checkpointed too
+            postings[custom_id] = {"url": url, "platform": platform,
+                                   "key": cache_key(content.get("full_text", ""), platform),
+                                   "structured": known_fields(content)}
+            self.structured_stats.record(platform, *structured_savings(content, platform))
+
+        batch_ids = []
+        for start in range(0, len(requests), self.max_requests):
+            chunk = requests[start:start + self.max_requests]
+            batch = self.client.messages.batches.create(requests=chunk)
+            self.checkpoint["batches"][batch.id] = {
+                "submitted_at": time.time(),
+                "postings": {request["custom_id"]: postings[request["custom_id"]] for request in chunk},
+            }
+            # Checkpoint after every batch so a crash mid-submit never resubmits
+            self._save_checkpoint()
+            batch_ids.append(batch.id)
+            logger.info(f"Submitted batch {batch.id} with {len(chunk)} postings")
+        return batch_ids
+
+    def wait(self, batch_id: str, timeout: Optional[float] = None) -> bool:
+        """Poll until the batch has ended; returns False if timeout elapses first"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            batch = self.client.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            logger.info(f"Batch {batch_id} is {batch.processing_status}: {batch.request_counts}")
+            time.sleep(self.poll_interval)
+
+    def collect(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """Download an ended batch's results, map them back by source_url and drop it from the checkpoint"""
+        postings = self.checkpoint["batches"][batch_id]["postings"]
+        results = {}
+        for entry in self.client.messages.batches.results(batch_id):
+            posting = postings.get(entry.custom_id)
+            if posting is None:
+                continue
+            content = {"url": posting["url"], "platform": posting["platform"],
+                       "structured": posting.get("structured") or {}}
+            results[posting["url"]] = self._parse_result(entry.result, content, posting)
+
+        # Collected batches leave the checkpoint; their results are cached and returned to the caller
+        del self.checkpoint["batches"][batch_id]
+        self._save_checkpoint()
+        return results
+
+    def _parse_result(self, result, content: Dict[str, Any], posting: Dict[str, Any]) -> Dict[str, Any]:
+        if result.type != "succeeded":
+            error = getattr(result, "error", None)
+            return {"error": f"Batch request {result.type}: {error}", "raw_data": content}
+        try:
+            structured_data = self._parse_with_repair(result.message, content, posting["platform"])
+        except Exception as e:
+            logger.error(f"Error processing with LLM: {str(e)}")
+            return {"error": str(e), "raw_data": content}
+        if self.cache is not None:
+            self.cache.put(posting["key"], structured_data, platform=posting["platform"],
+                           prompt_version=PROMPT_VERSION)
+        return structured_data
+
+    def _parse_with_repair(self, message, content: Dict[str, Any], platform: str) -> Dict[str, Any]:
+        """Parse a batch reply, re-asking the repair model in real time if it is unusable"""
+        for attempt in range(self.repair_attempts + 1):
+            try:
+                structured_data, method = parse_extraction_message(message, content, platform)
+                self.parse_stats.record(platform, "repaired" if attempt else method)
+                return structured_data
+            except ValueError as e:
+                if attempt >= self.repair_attempts:
+                    self.parse_stats.record(platform, "failed")
+                    raise
+                logger.warning(f"Unusable batch extraction for {content.get('url')}, asking for a repair: {str(e)}")
+                tool_input, text = message_output(message)
+                raw_output = json.dumps(tool_input) if tool_input is not None else text
+                message = self.client.messages.create(**repair_request(raw_output, str(e), requested_fields(content)))
+
+    def run(self, contents: Iterable[Dict[str, Any]],
+            on_results: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Resume any pending batches, submit the remaining postings and collect everything
+
+        Args:
+            contents: Raw job_data dicts
+            on_results: Called with each collected batch's results as soon as it is downloaded
+
+        Returns:
+            Structured results (or error dicts) keyed by source_url
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def emit(batch_results: Dict[str, Dict[str, Any]]) -> None:
+            results.update(batch_results)
+            if on_results is not None:
+                on_results(batch_results)
+
+        to_submit = []
+        cached_results = {}
+        for content in contents:
+            if "error" in content:
+                cached_results[content.get("url")] = content
+                continue
+            if self.cache is not None and self.cache_mode == "use":
+                cached = self.cache.get(cache_key(content.get("full_text", ""), content.get("platform", "Unknown")))
+                if cached is not None:
+                    cached["source_url"] = content.get("url")
+                    cached_results[content.get("url")] = cached
+                    continue
+            to_submit.append(content)
+        if cached_results:
+            emit(cached_results)
+
+        self.submit(to_submit)
+        for batch_id in self.pending_batch_ids():
+            self.wait(batch_id)
+            emit(self.collect(batch_id))
+        return results
@@ -0,0 +1,171 @@
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+import re
+import threading
+
+from src.extraction.prompts import estimate_tokens
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# Containers holding the posting itself, most specific first; the page body is the fallback
+MAIN_CONTENT_SELECTORS: Dict[str, List[str]] = {
+    "Ashby": ["[class*='ashby-job-posting-right-pane']", "main"],
+    "Greenhouse": [".job__description", "#content", "#app_body", "main"],
+    "Lever": [".posting-page .content", ".posting-page", "main"],
+}
+
+# Single lines that are navigation, buttons or chrome rather than posting content
+BOILERPLATE_LINES = [
+    r"apply( now| for this (job|position|role))?",
+    r"submit( your)? application",
+    r"back to (all )?jobs",
+    r"(view|see) all (open )?(jobs|positions|roles)",
+    r"share( this)? (job|posting)",
+    r"powered by (greenhouse|lever|ashby)",
+    r"(read our )?privacy (policy|notice)",
+    r"(accept|reject|allow)( all)? cookies",
+    r"cookie (settings|preferences)",
+    r"(jobs|careers) (page|home)",
+    r"log ?in|sign ?in",
+    r"\*?\s*(required|indicates a required field)",
+]
+
+# Lines dropped wherever they appear; rendered text puts each paragraph on its own line
+# (cookie banners, EEO and privacy notices)
+BOILERPLATE_PARAGRAPHS = [
+    r"we use cookies",
+    r"equal (employment )?opportunity employer",
+    r"without regard to (race|sex|age|religion|color)",
+    r"\be-?verify\b",
+    r"reasonable accommodation",
+    r"applicant privacy",
+]
+
+# Headings after which everything is non-posting content (application forms, other roles, EEO surveys)
+TRUNCATE_AFTER = [
+    r"voluntary self-identification",
+    r"(u\.s\. )?equal employment opportunity( information)?( \(completing this form is voluntary\))?",
+    r"(other|more|similar) (open )?(roles|jobs|positions|openings)",
+    r"submit your application",
+    r"apply for this (job|position|role)",
+    r"first name\s*\*?",
+    r"resume/cv\s*\*?",
+]
+
+_LINE_RE = re.compile(r"^(?:" + "|".join(BOILERPLATE_LINES) + r")[\s.!:]*$", re.IGNORECASE)
+_PARAGRAPH_RE = re.compile("|".join(BOILERPLATE_PARAGRAPHS), re.IGNORECASE)
+_TRUNCATE_RE = re.compile(r"^(?:" + "|".join(TRUNCATE_AFTER) + r")[\s.!:]*$", re.IGNORECASE)
+# A posting needs some substance before trailing sections are cut, so a form heading near the top is kept
+MIN_LINES_BEFORE_TRUNCATE = 5
+
+
+class CompactionStats:
+    """Thread-safe per-platform totals of text size before and after compaction"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, int]] = {}
+
+    def record(self, platform: str, before: str, after: str) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(platform, {"postings": 0, "bytes_before": 0, "bytes_after": 0,
+                                                        "tokens_before": 0, "tokens_after": 0})
+            totals["postings"] += 1
+            totals["bytes_before"] += len(before.encode("utf-8"))
+            totals["bytes_after"] += len(after.encode("utf-8"))
+            totals["tokens_before"] += estimate_tokens(before)
+            totals["tokens_after"] += estimate_tokens(after)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return per-platform totals with the fraction of estimated input tokens saved"""
+        with self._lock:
+            rows = []
+            for platform, totals in sorted(self._totals.items()):
+                row = {"platform": platform, **totals}
+                row["token_savings"] = round(1 - totals["tokens_after"] / totals["tokens_before"], 3) \
+                    if totals["tokens_before"] else 0.0
+                rows.append(row)
+            return rows
+
+    def format_summary(self) -> List[str]:
+        """Return one human-readable line per platform"""
+        return [
+            f"Compaction {row['platform']}: {row['postings']} postings, "
+            f"{row['bytes_before']} -> {row['bytes_after']} bytes, "
+            f"~{row['tokens_before']} -> ~{row['tokens_after']} tokens "
+            f"({row['token_savings']:.0%} saved)"
+            for row in self.summary()
+        ]
+
+    def log_summary(self) -> None:
+        for line in self.format_summary():
+            logger.info(line)
+
+
+# Shared by all scrapers unless a scraper is given its own
+DEFAULT_COMPACTION_STATS = CompactionStats()
+
+
+def compact_text(text: str, max_tokens: int = config.COMPACT_MAX_TOKENS) -> str:
+    """
+    Strip boilerplate from posting text and cap its length
+
+    Args:
+        text: Visible text of the posting's main content region
+        max_tokens: Estimated token budget; text is cut at a line boundary beyond it
+
+    Returns:
+        Compacted text
+    """
+    lines = [" ".join(line.split()) for line in (text or "").splitlines()]
+
+    kept: List[str] = []
+    seen = set()
+    content_lines = 0
+    for line in lines:
+        if not line:
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if content_lines >= MIN_LINES_BEFORE_TRUNCATE and _TRUNCATE_RE.match(line):
+            break
+        if _LINE_RE.match(line) or _PARAGRAPH_RE.search(line):
+            continue
+        # Repeated lines are menus, sticky headers and duplicated apply buttons
+        if line in seen:
+            continue
+        seen.add(line)
+        kept.append(line)
+        content_lines += 1
+
+    compacted = "\n".join(kept).strip()
+
+    max_chars = max_tokens * 4
+    if len(compacted) > max_chars:
+        cut = compacted.rfind("\n", 0, max_chars)
+        compacted = compacted[:cut if cut > 0 else max_chars]
+    return compacted
+
+
+def compact_job_data(job_data: Dict[str, Any], stats: Optional[CompactionStats] = None,
+                     max_tokens: int = config.COMPACT_MAX_TOKENS) -> Dict[str, Any]:
+    """Return a copy of job_data with full_text compacted, recording before/after sizes"""
+    before = job_data.get("full_text") or ""
+    after = compact_text(before, max_tokens=max_tokens)
+    (stats if stats is not None else DEFAULT_COMPACTION_STATS).record(job_data.get("platform", "Unknown"), before, after)
+    return {**job_data, "full_text": after}
+
+
+def select_main_content(soup, platform: str) -> Tuple[Any, bool]:
+    """
+    Pick the posting's main content element from a BeautifulSoup document
+
+    Returns:
+        (element, matched) where matched is False when falling back to the whole body
+    """
+    for selector in MAIN_CONTENT_SELECTORS.get(platform, []):
+        element = soup.select_one(selector)
+        if element is not None and element.get_text(strip=True):
+            return element, True
+    return soup.body or soup, False
@@ -0,0 +1,150 @@
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from src.extraction.prompts import PROMPT_VERSION
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("use", "bypass", "refresh")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize posting text so cosmetic whitespace/unicode differences hash identically"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.split())
+
+
+def cache_key(full_text: str, platform: str, prompt_version: str = PROMPT_VERSION) -> str:
+    """Content address for an extraction: hash of prompt version, platform and normalized text"""
+    payload = f"{prompt_version}\x00{platform}\x00{normalize_text(full_text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Persistent SQLite cache of LLM extraction results with TTL and LRU eviction"""
+
+    def __init__(self, path: str = config.LLM_CACHE_PATH, ttl_days: float = config.LLM_CACHE_TTL_DAYS,
+                 max_entries: int = config.LLM_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite database file (':memory:' for a throwaway cache)
+            ttl_days: Entries older than this are treated as misses (0 disables expiry)
+            max_entries: Least recently used entries are evicted beyond this count
+        """
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                platform TEXT,
+                prompt_version TEXT,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_extractions_accessed ON extractions(accessed_at)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT result, created_at FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                self._conn.commit()
+                self._count -= 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE extractions SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict[str, Any], platform: str = "", prompt_version: str = PROMPT_VERSION) -> None:
+        """Store a result, evicting least recently used entries past max_entries"""
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM extractions WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, platform, prompt_version, result, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, platform, prompt_version, json.dumps(result), now, now)
+            )
+            self.writes += 1
+            if not exists:
+                self._count += 1
+            if self.max_entries and self._count > self.max_entries:
+                excess = self._count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM extractions WHERE key IN "
+                    "(SELECT key FROM extractions ORDER BY accessed_at ASC LIMIT ?)", (excess,)
+                )
+                self._count -= excess
+                self.evictions += excess
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete all entries past their TTL and return how many were removed"""
+        if not self.ttl_seconds:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM extractions WHERE created_at < ?",
+                                        (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+            self._count -= cursor.rowcount
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._count
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[LLMCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMCache:
+    """Return the process-wide cache at config.LLM_CACHE_PATH, opening it on first use"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
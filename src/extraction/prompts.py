@@ -0,0 +1,138 @@
+from typing import Dict, Any, List, Optional, Tuple
+import json
+
+from src.extraction.schema import (EXTRACTION_TOOL, EXTRACTION_TOOL_NAME, JOB_FIELDS, JobRecord, extraction_tool,
+                                   loads_tolerant)
+from src.extraction.structured_data import known_fields
+from src.utils import config
+
+EXTRACTION_MODEL = "claude-3-7-sonnet-20250219"
+EXTRACTION_MAX_TOKENS = 2000
+# Fixing a malformed reply needs no reasoning about the posting, so a small model does it
+REPAIR_MODEL = config.LLM_REPAIR_MODEL
+
+# Bump whenever the prompt or model changes so cached extractions are not reused
+PROMPT_VERSION = "3"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def requested_fields(content: Dict[str, Any]) -> List[str]:
+    """
+    Fields the LLM is asked for: every field, unless the posting's structured data gave some,
+    in which case only the rest (source_url and platform are known from the fetch either way)
+    """
+    known = known_fields(content)
+    if not known:
+        return [name for name, _, _ in JOB_FIELDS]
+    return [name for name, _, _ in JOB_FIELDS if name not in known and name not in ("source_url", "platform")]
+
+
+def _prompt(content: Dict[str, Any], platform: str, fields: List[str]) -> str:
+    values = {"source_url": content.get('url', 'Not provided'), "platform": platform}
+    lines = "\n".join(f"        - {name}: {values.get(name, description)}"
+                      for name, _, description in JOB_FIELDS if name in fields)
+    return f"""
+        Extract structured information from this {platform} job posting.
+
+        JOB POSTING CONTENT:
+        {content.get('full_text', '')}
+
+        Record these fields with the {EXTRACTION_TOOL_NAME} tool:
+{lines}
+
+        Only include fields where information is explicitly provided. Use null for missing information.
+        """
+
+
+def build_extraction_prompt(content: Dict[str, Any], platform: str) -> str:
+    """Build the structured-extraction prompt for a scraped job posting, asking for requested_fields only"""
+    return _prompt(content, platform, requested_fields(content))
+
+
+def extraction_request(prompt: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Messages API arguments for an extraction call; Claude must answer through the extraction tool
+
+    Args:
+        prompt: The extraction prompt
+        fields: Fields the tool asks for, as given by requested_fields (all of them if omitted)
+    """
+    return {
+        "model": EXTRACTION_MODEL,
+        "max_tokens": EXTRACTION_MAX_TOKENS,
+        "temperature": 0,
+        "tools": [EXTRACTION_TOOL if fields is None else extraction_tool(fields)],
+        "tool_choice": {"type": "tool", "name": EXTRACTION_TOOL_NAME},
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def content_request(content: Dict[str, Any], platform: str) -> Dict[str, Any]:
+    """Messages API arguments extracting a scraped job_data dict"""
+    return extraction_request(build_extraction_prompt(content, platform), requested_fields(content))
+
+
+def structured_savings(content: Dict[str, Any], platform: str) -> Tuple[int, int, int]:
+    """
+    What a posting's structured data saves against asking the LLM for every field
+
+    Returns:
+        (fields filled without the LLM, estimated input tokens saved by the shorter prompt and
+        tool schema, estimated output tokens the reply no longer spends on those fields)
+    """
+    known = known_fields(content)
+    if not known:
+        return 0, 0, 0
+    fields = requested_fields(content)
+    all_fields = [name for name, _, _ in JOB_FIELDS]
+    full_input = estimate_tokens(_prompt(content, platform, all_fields)) + estimate_tokens(json.dumps(EXTRACTION_TOOL))
+    reduced_input = estimate_tokens(_prompt(content, platform, fields)) + \
+        estimate_tokens(json.dumps(extraction_tool(fields)))
+    skipped = {**known, "source_url": content.get('url'), "platform": platform}
+    return len(known), full_input - reduced_input, estimate_tokens(json.dumps(skipped))
+
+
+def build_repair_prompt(raw_output: str, error: str) -> str:
+    """Ask for a malformed reply to be fixed, without resending the posting"""
+    return f"""
+        This job posting extraction could not be used: {error}
+
+        EXTRACTION:
+        {raw_output}
+
+        Record the same information with the {EXTRACTION_TOOL_NAME} tool, fixing only the problem.
+        Do not add information that is not in the extraction.
+        """
+
+
+def repair_request(raw_output: str, error: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Messages API arguments for a repair re-ask on the cheap model
+
+    Args:
+        raw_output: The unusable reply
+        error: Why it could not be used
+        fields: The fields the original call asked for (requested_fields), so the re-ask
+            does not ask again for fields structured data already gave
+    """
+    return {**extraction_request(build_repair_prompt(raw_output, error), fields), "model": REPAIR_MODEL}
+
+
+def parse_extraction_response(result_text: str, content: Dict[str, Any], platform: str) -> Dict[str, Any]:
+    """
+    Parse a text reply into the structured job dict, tolerating prose and code fences
+    around the JSON and a reply truncated mid-object
+
+    Raises:
+        ValueError: If the reply has no parseable object (SchemaError if it does not fit the record)
+    """
+    structured_data = JobRecord.from_dict(loads_tolerant(result_text)).to_dict()
+    if not structured_data['source_url']:
+        structured_data['source_url'] = content.get('url')
+    if not structured_data['platform']:
+        structured_data['platform'] = platform
+    return structured_data
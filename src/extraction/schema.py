@@ -0,0 +1,298 @@
+"""
+The extracted job record: its 18 fields, the tool schema Claude fills them through,
+a tolerant parser for replies that arrive as text, and parse outcome metrics.
+"""
+
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, Any, List, Optional, Tuple
+import json
+import logging
+import re
+import threading
+
+from src.extraction.structured_data import known_fields
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_TOOL_NAME = "record_job_posting"
+
+# (field, JSON type, description) in prompt order; list fields hold strings
+JOB_FIELDS: List[Tuple[str, str, str]] = [
+    ("job_title", "string", "The exact title of the position"),
+    ("company_name", "string", "Name of the hiring company"),
+    ("location", "string", "Where the job is located (include if remote)"),
+    ("employment_type", "string", "Full-time, Part-time, Contract, etc."),
+    ("department", "string", "Which department the role belongs to"),
+    ("application_deadline", "string", "The deadline to apply if specified"),
+    ("compensation", "string", "Salary range and compensation details"),
+    ("required_skills", "array", "List of required skills"),
+    ("experience_level", "string", "Junior, Mid, Senior, Lead, etc."),
+    ("job_description", "string", "A 2-3 sentence summary of the role"),
+    ("responsibilities", "array", "List of key responsibilities"),
+    ("qualifications", "array", "List of required qualifications"),
+    ("benefits", "array", "List of benefits mentioned"),
+    ("good_fit_indicators", "array", "List of traits that make someone a good fit"),
+    ("poor_fit_indicators", "array", "List of traits that would make someone a poor fit"),
+    ("application_instructions", "string", "How to apply"),
+    ("source_url", "string", "URL of the posting"),
+    ("platform", "string", "Job board the posting is hosted on"),
+]
+LIST_FIELDS = {name for name, kind, _ in JOB_FIELDS if kind == "array"}
+
+
+def extraction_tool(names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """The extraction tool's definition, asking for the named fields only (all of them by default)"""
+    wanted = [(name, kind, description) for name, kind, description in JOB_FIELDS if names is None or name in names]
+    return {
+        "name": EXTRACTION_TOOL_NAME,
+        "description": ("Record the structured fields of a job posting. "
+                        "Use null for information the posting does not give."),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                name: ({"type": ["array", "null"], "items": {"type": "string"}, "description": description}
+                       if kind == "array" else {"type": ["string", "null"], "description": description})
+                for name, kind, description in wanted
+            },
+            "required": [name for name, _, _ in wanted],
+        },
+    }
+
+
+EXTRACTION_TOOL: Dict[str, Any] = extraction_tool()
+
+
+class SchemaError(ValueError):
+    """An extraction reply that parsed as JSON but does not fit the job record"""
+
+    def __init__(self, problems: List[str]):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+@dataclass
+class JobRecord:
+    """One extracted job posting; every field is optional because postings omit things"""
+
+    # Slotted: no per-instance __dict__ when many records are held in memory
+    __slots__ = tuple(name for name, _, _ in JOB_FIELDS)
+
+    job_title: Optional[str]
+    company_name: Optional[str]
+    location: Optional[str]
+    employment_type: Optional[str]
+    department: Optional[str]
+    application_deadline: Optional[str]
+    compensation: Optional[str]
+    required_skills: Optional[List[str]]
+    experience_level: Optional[str]
+    job_description: Optional[str]
+    responsibilities: Optional[List[str]]
+    qualifications: Optional[List[str]]
+    benefits: Optional[List[str]]
+    good_fit_indicators: Optional[List[str]]
+    poor_fit_indicators: Optional[List[str]]
+    application_instructions: Optional[str]
+    source_url: Optional[str]
+    platform: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "JobRecord":
+        """
+        Validate and normalize a parsed reply: numbers become strings, a lone string in a
+        list field becomes a one-item list, empty values become None, unknown keys are dropped
+
+        Raises:
+            SchemaError: If the reply is not an object or a field has an unusable type
+        """
+        if not isinstance(data, dict):
+            raise SchemaError([f"expected a JSON object, got {type(data).__name__}"])
+
+        values: Dict[str, Any] = {}
+        problems = []
+        for name in (f.name for f in fields(cls)):
+            value = data.get(name)
+            if isinstance(value, str) and value.strip().lower() in ("", "null", "none", "n/a"):
+                value = None
+            if value is None:
+                values[name] = None
+            elif name in LIST_FIELDS:
+                if isinstance(value, str):
+                    value = [value]
+                if not isinstance(value, list) or any(isinstance(item, (dict, list)) for item in value):
+                    problems.append(f"{name} must be a list of strings")
+                    continue
+                values[name] = [str(item).strip() for item in value if item is not None and str(item).strip()]
+            elif isinstance(value, bool) or isinstance(value, dict):
+                problems.append(f"{name} must be a string")
+            elif isinstance(value, list):
+                values[name] = "; ".join(str(item) for item in value if item is not None)
+            else:
+                values[name] = str(value).strip()
+        if problems:
+            raise SchemaError(problems)
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class IncrementalJSONParser:
+    """
+    Finds the first JSON object in streamed text, ignoring prose or code fences around it
+
+    Chunks are scanned once as they arrive, tracking string and bracket state, so the
+    parser knows when the object is complete and can close a truncated one (for a reply
+    cut off at max_tokens) without rescanning.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._closers: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self.started = False
+        self.done = False
+
+    def feed(self, chunk: str) -> None:
+        for char in chunk:
+            if self.done:
+                return
+            if not self.started:
+                if char != "{":
+                    continue
+                self.started = True
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._closers.append("}" if char == "{" else "]")
+            elif char in "}]" and self._closers:
+                self._closers.pop()
+                self.done = not self._closers
+
+    def value(self) -> Any:
+        """
+        Parse what has been fed so far, closing open strings, arrays and objects if the
+        text was truncated
+
+        Raises:
+            ValueError: If no object was found or the text cannot be repaired into JSON
+        """
+        if not self.started:
+            raise ValueError("No JSON object in response")
+        text = "".join(self._buffer)
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+
+        if not self.done:
+            if self._in_string:
+                text += '"'
+            text = text.rstrip().rstrip(",")
+            if text.endswith(":"):
+                text += " null"
+            # Inside an object, a trailing string after '{' or ',' is a key with no value yet: drop it
+            dangling = re.search(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*$', text)
+            if dangling and self._closers and self._closers[-1] == "}":
+                text = text[:dangling.start()] + ("{" if dangling.group(1) == "{" else "")
+            text += "".join(reversed(self._closers))
+        # Trailing commas are the other common slip in hand-written JSON
+        return json.loads(re.sub(r",\s*([}\]])", r"\1", text))
+
+
+def loads_tolerant(text: str) -> Any:
+    """Parse the first JSON object in text (see IncrementalJSONParser)"""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.value()
+
+
+def message_output(message) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Return (tool input, if Claude called the extraction tool; concatenated text blocks) of a reply"""
+    tool_input, texts = None, []
+    for block in getattr(message, "content", None) or []:
+        if getattr(block, "type", None) == "tool_use" and getattr(block, "name", None) == EXTRACTION_TOOL_NAME:
+            tool_input = block.input
+        elif isinstance(getattr(block, "text", None), str):
+            texts.append(block.text)
+    return tool_input, "".join(texts)
+
+
+def parse_extraction_message(message, content: Dict[str, Any], platform: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Turn a Messages API reply into a validated job dict
+
+    Fields the posting's structured data gave (content['structured']) override the reply's.
+
+    Returns:
+        (record dict with source_url and platform filled in, 'tool_use' or 'text')
+
+    Raises:
+        ValueError: If the reply has no parseable object (SchemaError if it does not fit the record)
+    """
+    tool_input, text = message_output(message)
+    if tool_input is not None:
+        data, method = tool_input, "tool_use"
+    else:
+        data, method = loads_tolerant(text), "text"
+    if isinstance(data, dict):
+        data = {**data, **known_fields(content)}
+    record = JobRecord.from_dict(data).to_dict()
+    if not record["source_url"]:
+        record["source_url"] = content.get("url")
+    if not record["platform"]:
+        record["platform"] = platform
+    return record, method
+
+
+class ParseStats:
+    """Thread-safe per-platform counts of how extraction replies were parsed, and how many failed"""
+
+    OUTCOMES = ("tool_use", "text", "repaired", "failed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, platform: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(platform, {name: 0 for name in self.OUTCOMES})
+            counts[outcome] += 1
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return per-platform counts with the fraction of replies that needed a repair or failed"""
+        with self._lock:
+            rows = []
+            for platform, counts in sorted(self._counts.items()):
+                responses = sum(counts.values())
+                row = {"platform": platform, "responses": responses, **counts}
+                row["repair_rate"] = round(counts["repaired"] / responses, 3) if responses else 0.0
+                row["failure_rate"] = round(counts["failed"] / responses, 3) if responses else 0.0
+                rows.append(row)
+            return rows
+
+    def format_summary(self) -> List[str]:
+        """Return one human-readable line per platform"""
+        return [
+            f"Parse {row['platform']}: {row['responses']} replies, {row['tool_use']} via tool use, "
+            f"{row['text']} from text, {row['repaired']} repaired, {row['failed']} failed "
+            f"({row['failure_rate']:.0%} failure rate)"
+            for row in self.summary()
+        ]
+
+    def log_summary(self) -> None:
+        for line in self.format_summary():
+            logger.info(line)
+
+
+# Shared by all extraction paths unless one is given its own
+DEFAULT_PARSE_STATS = ParseStats()
@@ -0,0 +1,345 @@
+"""
+Deterministic extraction of the posting fields job boards already publish as data:
+schema.org JobPosting JSON-LD, Ashby's embedded app state and the Greenhouse and Lever
+posting APIs. Fields found here are not asked of the LLM, which only fills in what needs
+reading the posting (skills, summaries, fit indicators).
+"""
+
+from typing import Dict, Any, Iterable, List, Optional
+import json
+import logging
+import re
+import threading
+
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# Record fields a board can state outright, in JOB_FIELDS order
+STRUCTURED_FIELDS = ("job_title", "company_name", "location", "employment_type", "department",
+                     "application_deadline", "compensation")
+
+# schema.org employmentType values and Ashby's enum, mapped to the record's wording
+EMPLOYMENT_TYPES = {
+    "fulltime": "Full-time",
+    "parttime": "Part-time",
+    "contract": "Contract",
+    "contractor": "Contract",
+    "temporary": "Temporary",
+    "intern": "Internship",
+    "internship": "Internship",
+    "perdiem": "Per diem",
+    "volunteer": "Volunteer",
+}
+
+# Ashby server-renders its app state as `window.__appData = {...};`
+_ASHBY_APP_DATA = re.compile(r"window\.__appData\s*=\s*")
+
+
+def _clean(value: Any) -> Optional[str]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    if not isinstance(value, str):
+        return None
+    value = " ".join(value.split())
+    return value or None
+
+
+def _compact(fields: Dict[str, Any]) -> Dict[str, str]:
+    return {name: fields[name] for name in STRUCTURED_FIELDS if fields.get(name)}
+
+
+def employment_type(value: Any) -> Optional[str]:
+    """Normalize FULL_TIME, FullTime, ['PART_TIME'] and the like; free text is kept as written"""
+    if isinstance(value, list):
+        types = [employment_type(item) for item in value]
+        return ", ".join(dict.fromkeys(kind for kind in types if kind)) or None
+    value = _clean(value)
+    if value is None:
+        return None
+    return EMPLOYMENT_TYPES.get(re.sub(r"[^a-z]", "", value.lower()), value)
+
+
+def _amount(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        try:
+            value = float(value.replace(",", ""))
+        except ValueError:
+            return _clean(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"{value:,.0f}"
+    return None
+
+
+def salary_range(currency: Any, low: Any, high: Any, unit: Any = None) -> Optional[str]:
+    """'USD 120,000-150,000 per year' from the parts of a posted salary"""
+    low, high = _amount(low), _amount(high)
+    if low and high and low != high:
+        amount = f"{low}-{high}"
+    else:
+        amount = low or high
+    if not amount:
+        return None
+    # schema.org says YEAR or HOUR, Lever per-year-salary or per-hour-wage
+    period = re.search(r"year|month|week|day|hour", unit.lower()) if isinstance(unit, str) else None
+    parts = [_clean(currency), amount, f"per {period.group(0)}" if period else None]
+    return " ".join(part for part in parts if part)
+
+
+def _remote(location: Optional[str]) -> str:
+    if not location:
+        return "Remote"
+    return location if "remote" in location.lower() else f"{location} (Remote)"
+
+
+def _place(place: Any) -> Optional[str]:
+    if isinstance(place, str):
+        return _clean(place)
+    if not isinstance(place, dict):
+        return None
+    address = place.get("address", place)
+    if isinstance(address, str):
+        return _clean(address)
+    if not isinstance(address, dict):
+        return _clean(place.get("name"))
+    country = address.get("addressCountry")
+    if isinstance(country, dict):
+        country = country.get("name")
+    parts = [_clean(address.get(key)) for key in ("addressLocality", "addressRegion")] + [_clean(country)]
+    return ", ".join(dict.fromkeys(part for part in parts if part)) or _clean(place.get("name"))
+
+
+def _job_postings(node: Any) -> Iterable[Dict[str, Any]]:
+    """JobPosting objects in a JSON-LD document, including ones nested in lists and @graph"""
+    if isinstance(node, list):
+        for item in node:
+            yield from _job_postings(item)
+    elif isinstance(node, dict):
+        kinds = node.get("@type")
+        if "JobPosting" in (kinds if isinstance(kinds, list) else [kinds]):
+            yield node
+        yield from _job_postings(node.get("@graph"))
+
+
+def fields_from_json_ld(documents: Iterable[Optional[str]]) -> Dict[str, str]:
+    """
+    Record fields from the first schema.org JobPosting in a page's application/ld+json scripts
+
+    Args:
+        documents: Text of each ld+json script; unparseable ones are skipped
+    """
+    for document in documents:
+        try:
+            data = json.loads(document or "")
+        except ValueError:
+            continue
+        for posting in _job_postings(data):
+            organization = posting.get("hiringOrganization")
+            places = posting.get("jobLocation")
+            locations = [_place(place) for place in (places if isinstance(places, list) else [places])]
+            locations = [location for location in dict.fromkeys(locations) if location]
+            if posting.get("jobLocationType") == "TELECOMMUTE" and "Remote" not in locations:
+                locations.append("Remote")
+
+            salary = posting.get("baseSalary")
+            compensation = None
+            if isinstance(salary, dict):
+                value = salary.get("value")
+                if isinstance(value, dict):
+                    compensation = salary_range(salary.get("currency"), value.get("minValue", value.get("value")),
+                                                value.get("maxValue"), value.get("unitText"))
+                else:
+                    compensation = salary_range(salary.get("currency"), value, None)
+
+            deadline = _clean(posting.get("validThrough"))
+            return _compact({
+                "job_title": _clean(posting.get("title")),
+                "company_name": _clean(organization.get("name") if isinstance(organization, dict) else organization),
+                "location": "; ".join(locations) or None,
+                "employment_type": employment_type(posting.get("employmentType")),
+                "department": _clean(posting.get("occupationalCategory")),
+                "application_deadline": deadline[:10] if deadline else None,
+                "compensation": compensation,
+            })
+    return {}
+
+
+def fields_from_ashby_app_data(app_data: Any) -> Dict[str, str]:
+    """Record fields from the posting and organization in Ashby's window.__appData"""
+    if not isinstance(app_data, dict) or not isinstance(app_data.get("posting"), dict):
+        return {}
+    posting = app_data["posting"]
+    organization = app_data.get("organization") or {}
+    location = _clean(posting.get("locationName"))
+    if posting.get("isRemote") or posting.get("workplaceType") == "Remote":
+        location = _remote(location)
+    return _compact({
+        "job_title": _clean(posting.get("title")),
+        "company_name": _clean(organization.get("name")) if isinstance(organization, dict) else None,
+        "location": location,
+        "employment_type": employment_type(posting.get("employmentType")),
+        "department": _clean(posting.get("departmentName")) or _clean(posting.get("teamName")),
+        "compensation": _clean(posting.get("compensationTierSummary")),
+    })
+
+
+def parse_ashby_app_data(script: str) -> Optional[Dict[str, Any]]:
+    """The object assigned to window.__appData in an inline script, or None if there is none"""
+    match = _ASHBY_APP_DATA.search(script or "")
+    if not match:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(script, match.end())
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def fields_from_greenhouse_api(posting: Dict[str, Any]) -> Dict[str, str]:
+    """Record fields from a Greenhouse job board API posting"""
+    departments = [_clean(department.get("name")) for department in posting.get("departments") or []
+                   if isinstance(department, dict)]
+    return _compact({
+        "job_title": _clean(posting.get("title")),
+        "company_name": _clean(posting.get("company_name")),
+        "location": _clean((posting.get("location") or {}).get("name")),
+        "department": ", ".join(department for department in departments if department) or None,
+    })
+
+
+def fields_from_lever_api(posting: Dict[str, Any]) -> Dict[str, str]:
+    """Record fields from a Lever postings API posting (it does not name the company)"""
+    categories = posting.get("categories") or {}
+    location = _clean(categories.get("location"))
+    if posting.get("workplaceType") == "remote":
+        location = _remote(location)
+    salary = posting.get("salaryRange")
+    compensation = None
+    if isinstance(salary, dict):
+        compensation = salary_range(salary.get("currency"), salary.get("min"), salary.get("max"),
+                                    salary.get("interval"))
+    return _compact({
+        "job_title": _clean(posting.get("text")),
+        "location": location,
+        "employment_type": employment_type(categories.get("commitment")),
+        "department": _clean(categories.get("department")) or _clean(categories.get("team")),
+        "compensation": compensation,
+    })
+
+
+def fields_from_html(soup) -> Dict[str, str]:
+    """
+    Record fields from the data scripts of a parsed posting page; call before scripts are
+    stripped from the soup. JSON-LD wins where both it and Ashby's app state give a field.
+    """
+    fields = {}
+    for script in soup.find_all("script"):
+        text = script.string or ""
+        if "window.__appData" in text:
+            fields = fields_from_ashby_app_data(parse_ashby_app_data(text))
+            break
+    ld_json = [script.string for script in soup.find_all("script", type="application/ld+json")]
+    return {**fields, **fields_from_json_ld(ld_json)}
+
+
+def fields_from_page_payload(payload: Dict[str, Any]) -> Dict[str, str]:
+    """Record fields from the ld_json and app_data POSTING_PAYLOAD_SCRIPT reads out of a live page"""
+    app_data = payload.get("app_data")
+    if isinstance(app_data, str):
+        try:
+            app_data = json.loads(app_data)
+        except ValueError:
+            app_data = None
+    return {**fields_from_ashby_app_data(app_data), **fields_from_json_ld(payload.get("ld_json") or [])}
+
+
+def known_fields(content: Dict[str, Any]) -> Dict[str, str]:
+    """Fields of a job_data dict that were read deterministically (none when STRUCTURED_FIELDS is off)"""
+    if not config.STRUCTURED_FIELDS:
+        return {}
+    structured = content.get("structured") or {}
+    return {name: structured[name] for name in STRUCTURED_FIELDS if structured.get(name)}
+
+
+class StructuredFieldStats:
+    """
+    Thread-safe per-platform counts of fields read from structured data, with the input and
+    output tokens the shorter prompt saved against asking the LLM for every field.
+
+    Latency saved is estimated from output tokens, which dominate generation time: the
+    seconds each extra output token costs are fitted from observed LLM calls (the slope of
+    call time against output tokens), falling back to LLM_SECONDS_PER_OUTPUT_TOKEN.
+    """
+
+    def __init__(self, seconds_per_output_token: float = config.LLM_SECONDS_PER_OUTPUT_TOKEN):
+        self.default_seconds_per_output_token = seconds_per_output_token
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, int]] = {}
+        # Running sums for a least-squares fit of seconds against output tokens
+        self._calls = 0
+        self._sum_tokens = 0.0
+        self._sum_seconds = 0.0
+        self._sum_tokens_squared = 0.0
+        self._sum_tokens_seconds = 0.0
+
+    def record(self, platform: str, fields_filled: int, input_tokens_saved: int, output_tokens_saved: int) -> None:
+        """Record one posting sent to the LLM, with how many fields it was spared"""
+        with self._lock:
+            totals = self._totals.setdefault(platform, {"postings": 0, "structured": 0, "fields_filled": 0,
+                                                        "input_tokens_saved": 0, "output_tokens_saved": 0})
+            totals["postings"] += 1
+            totals["structured"] += 1 if fields_filled else 0
+            totals["fields_filled"] += fields_filled
+            totals["input_tokens_saved"] += input_tokens_saved
+            totals["output_tokens_saved"] += output_tokens_saved
+
+    def observe(self, output_tokens: int, seconds: float) -> None:
+        """Record an LLM call's output tokens and duration, to estimate the time per output token"""
+        with self._lock:
+            self._calls += 1
+            self._sum_tokens += output_tokens
+            self._sum_seconds += seconds
+            self._sum_tokens_squared += output_tokens * output_tokens
+            self._sum_tokens_seconds += output_tokens * seconds
+
+    def seconds_per_output_token(self) -> float:
+        """Fitted seconds per output token, or the configured default until calls vary enough to fit"""
+        with self._lock:
+            spread = self._calls * self._sum_tokens_squared - self._sum_tokens ** 2
+            if self._calls < 2 or spread <= 0:
+                return self.default_seconds_per_output_token
+            slope = (self._calls * self._sum_tokens_seconds - self._sum_tokens * self._sum_seconds) / spread
+            return slope if slope > 0 else self.default_seconds_per_output_token
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return per-platform totals with per-posting token and estimated latency savings"""
+        seconds_per_token = self.seconds_per_output_token()
+        with self._lock:
+            rows = []
+            for platform, totals in sorted(self._totals.items()):
+                postings = totals["postings"]
+                row = {"platform": platform, **totals}
+                row["input_tokens_saved_per_posting"] = round(totals["input_tokens_saved"] / postings, 1)
+                row["output_tokens_saved_per_posting"] = round(totals["output_tokens_saved"] / postings, 1)
+                row["latency_saved_per_posting"] = round(
+                    totals["output_tokens_saved"] * seconds_per_token / postings, 3)
+                rows.append(row)
+            return rows
+
+    def format_summary(self) -> List[str]:
+        """Return one human-readable line per platform"""
+        return [
+            f"Structured {row['platform']}: {row['structured']}/{row['postings']} postings, "
+            f"{row['fields_filled']} fields filled without the LLM, "
+            f"~{row['input_tokens_saved_per_posting']:g} input and ~{row['output_tokens_saved_per_posting']:g} "
+            f"output tokens saved per posting (~{row['latency_saved_per_posting']:.2f}s)"
+            for row in self.summary()
+        ]
+
+    def log_summary(self) -> None:
+        for line in self.format_summary():
+            logger.info(line)
+
+
+# Shared by all extraction paths unless one is given its own
+DEFAULT_STRUCTURED_STATS = StructuredFieldStats()
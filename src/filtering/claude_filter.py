@@ -0,0 +1,361 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import threading
+
+import anthropic # type: ignore
+from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
+from sklearn.metrics.pairwise import linear_kernel # type: ignore
+
+from src.scrapers.job_store import GALLERY_SCHEMA, JobStore
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+FILTER_MAX_TOKENS = 200
+# Characters of posting text shown to Claude; the decision rarely needs the whole posting
+FILTER_TEXT_CHARS = 4000
+
+# Added to the TF-IDF similarity when the title or text matches the criteria
+TITLE_KEYWORD_BOOST = 0.2
+LOCATION_BOOST = 0.1
+
+TIERS = ("rules", "tfidf", "llm")
+
+# Fixed corpus of typical postings the TF-IDF vocabulary and weights are fitted on alongside the
+# profile, so a posting's score never depends on which other postings share its batch
+REFERENCE_POSTINGS = (
+    "Software engineer building backend services and APIs in Python, Go or Java",
+    "Frontend developer working with React, TypeScript and design systems",
+    "Data engineer maintaining data pipelines, warehouses and ETL jobs with SQL and Spark",
+    "Machine learning engineer training and deploying models to production",
+    "Data scientist running experiments, statistics and analytics for product teams",
+    "Site reliability engineer owning infrastructure, Kubernetes, cloud platforms and on-call",
+    "Distributed systems engineer working on storage, databases and streaming",
+    "Mobile engineer shipping iOS and Android apps",
+    "Security engineer handling application security, compliance and incident response",
+    "Product manager defining the roadmap with engineering and design",
+    "Product designer creating user research, prototypes and interfaces",
+    "Account executive closing new business and managing a sales pipeline",
+    "Recruiter sourcing candidates and running the hiring process",
+    "Marketing manager running campaigns, content and growth",
+    "Customer success manager onboarding and supporting enterprise customers",
+    "Operations manager handling finance, office and people operations",
+    "Hardware engineer designing electronics, firmware and embedded systems",
+    "Remote full-time role with competitive salary, equity and benefits",
+)
+
+
+@dataclass
+class FilterCriteria:
+    """What counts as a relevant posting"""
+
+    profile: str = config.FILTER_PROFILE
+    title_keywords: List[str] = field(default_factory=lambda: list(config.FILTER_TITLE_KEYWORDS))
+    exclude_title_keywords: List[str] = field(default_factory=lambda: list(config.FILTER_EXCLUDE_TITLE_KEYWORDS))
+    locations: List[str] = field(default_factory=lambda: list(config.FILTER_LOCATIONS))
+    exclude_locations: List[str] = field(default_factory=lambda: list(config.FILTER_EXCLUDE_LOCATIONS))
+
+    def describe(self) -> str:
+        """Criteria as plain text for the LLM prompt"""
+        lines = [f"Target profile: {self.profile}"]
+        if self.title_keywords:
+            lines.append(f"Preferred titles contain: {', '.join(self.title_keywords)}")
+        if self.exclude_title_keywords:
+            lines.append(f"Not interested in titles containing: {', '.join(self.exclude_title_keywords)}")
+        if self.locations:
+            lines.append(f"Preferred locations: {', '.join(self.locations)}")
+        if self.exclude_locations:
+            lines.append(f"Excluded locations: {', '.join(self.exclude_locations)}")
+        return "\n".join(lines)
+
+
+def _keyword_pattern(keywords: List[str]) -> Optional[re.Pattern]:
+    if not keywords:
+        return None
+    return re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b", re.IGNORECASE)
+
+
+def posting_title(posting: Dict[str, Any]) -> str:
+    """Title of a gallery row (title) or a scraped posting (job_title)"""
+    return posting.get("job_title") or posting.get("title") or ""
+
+
+def posting_text(posting: Dict[str, Any]) -> str:
+    """All text available for a posting: title, gallery company info and scraped full text"""
+    parts = [posting_title(posting), posting.get("company_info"), posting.get("full_text")]
+    return "\n".join(part for part in parts if part)
+
+
+class FilterStats:
+    """Thread-safe counts of how many postings each tier saw, accepted and rejected"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.evaluated = 0
+        self._tiers = {tier: {"seen": 0, "accepted": 0, "rejected": 0} for tier in TIERS}
+        self.llm_errors = 0
+
+    def record(self, tier: str, decision: Optional[str]) -> None:
+        """Record that a tier saw a posting and accepted, rejected or passed it on (None)"""
+        with self._lock:
+            if tier == TIERS[0]:
+                self.evaluated += 1
+            counts = self._tiers[tier]
+            counts["seen"] += 1
+            if decision == "accept":
+                counts["accepted"] += 1
+            elif decision == "reject":
+                counts["rejected"] += 1
+
+    def record_llm_error(self) -> None:
+        with self._lock:
+            self.llm_errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-tier counts and pass rates, plus the fraction of postings that never reached the LLM"""
+        with self._lock:
+            tiers = {}
+            for tier, counts in self._tiers.items():
+                passed = counts["seen"] - counts["rejected"]
+                tiers[tier] = {**counts, "pass_rate": round(passed / counts["seen"], 3) if counts["seen"] else 0.0}
+            llm_calls = self._tiers["llm"]["seen"]
+            return {
+                "evaluated": self.evaluated,
+                "tiers": tiers,
+                "llm_calls": llm_calls,
+                "llm_errors": self.llm_errors,
+                "llm_calls_avoided": round(1 - llm_calls / self.evaluated, 3) if self.evaluated else 0.0,
+            }
+
+    def format_summary(self) -> List[str]:
+        """Return one human-readable line per tier plus the LLM savings"""
+        summary = self.summary()
+        lines = [
+            f"Filter {tier}: saw {row['seen']}, accepted {row['accepted']}, rejected {row['rejected']} "
+            f"(pass rate {row['pass_rate']:.0%})"
+            for tier, row in summary["tiers"].items()
+        ]
+        lines.append(f"Filter: {summary['llm_calls']} of {summary['evaluated']} postings sent to the LLM "
+                     f"({summary['llm_calls_avoided']:.0%} of calls avoided, {summary['llm_errors']} errors)")
+        return lines
+
+    def log_summary(self) -> None:
+        for line in self.format_summary():
+            logger.info(line)
+
+
+class RelevanceFilter:
+    """
+    Two-tier relevance filter: local rules and TF-IDF similarity settle the clear cases,
+    and only postings scoring between reject_score and accept_score are sent to Claude.
+    """
+
+    def __init__(self, criteria: Optional[FilterCriteria] = None, client=None,
+                 accept_score: float = config.FILTER_ACCEPT_SCORE, reject_score: float = config.FILTER_REJECT_SCORE,
+                 model: str = config.FILTER_MODEL, stats: Optional[FilterStats] = None,
+                 reference: Iterable[str] = REFERENCE_POSTINGS):
+        """
+        Args:
+            criteria: Relevance criteria (defaults to the FILTER_* settings)
+            client: anthropic.Anthropic client for the ambiguous band; built from the
+                environment if omitted, and ambiguous postings are accepted when no key is set
+            accept_score: Local score at or above which a posting is accepted without the LLM
+            reject_score: Local score below which a posting is rejected without the LLM
+            model: Model used for ambiguous postings
+            stats: Where to record per-tier counts (a new FilterStats if omitted)
+            reference: Typical posting texts the TF-IDF weights are fitted on with the profile
+        """
+        if reject_score > accept_score:
+            raise ValueError(f"reject_score ({reject_score}) must not exceed accept_score ({accept_score})")
+        self.criteria = criteria or FilterCriteria()
+        self.accept_score = accept_score
+        self.reject_score = reject_score
+        self.model = model
+        self.stats = stats if stats is not None else FilterStats()
+        if client is None and config.ANTHROPIC_API_KEY:
+            client = anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY, base_url=config.ANTHROPIC_BASE_URL)
+        self.client = client
+
+        self._title_re = _keyword_pattern(self.criteria.title_keywords)
+        self._exclude_title_re = _keyword_pattern(self.criteria.exclude_title_keywords)
+        self._location_re = _keyword_pattern(self.criteria.locations)
+        self._exclude_location_re = _keyword_pattern(self.criteria.exclude_locations)
+
+        # Fitted once, so scoring a batch is a transform and the same posting always scores the same
+        self._vectorizer: Optional[TfidfVectorizer] = TfidfVectorizer(stop_words="english", sublinear_tf=True,
+                                                                      ngram_range=(1, 2))
+        try:
+            self._vectorizer.fit([self.criteria.profile, *reference])
+            self._profile_vector = self._vectorizer.transform([self.criteria.profile])
+        except ValueError:
+            # The profile and reference were empty or stop words only
+            self._vectorizer = None
+
+    def apply_rules(self, posting: Dict[str, Any]) -> Optional[str]:
+        """Return a rejection reason if a hard rule excludes the posting, else None"""
+        title = posting_title(posting)
+        if self._exclude_title_re and self._exclude_title_re.search(title):
+            return f"Title matches excluded keyword: {self._exclude_title_re.search(title).group(0)}"
+        if self._exclude_location_re:
+            text = posting_text(posting)
+            excluded = self._exclude_location_re.search(text)
+            if excluded and not (self._location_re and self._location_re.search(text)):
+                return f"Location excluded: {excluded.group(0)}"
+        return None
+
+    def score(self, postings: List[Dict[str, Any]]) -> List[float]:
+        """
+        Local relevance scores: TF-IDF cosine similarity of each posting to the target
+        profile, computed for the whole list in one sparse matrix product, plus boosts
+        for title keyword and location matches. The vectorizer is fitted once on the
+        profile and reference corpus, so each score is independent of the rest of the list
+        """
+        if not postings:
+            return []
+        texts = [posting_text(posting) for posting in postings]
+        if self._vectorizer is None:
+            similarities = [0.0] * len(postings)
+        else:
+            similarities = linear_kernel(self._vectorizer.transform(texts), self._profile_vector).ravel()
+
+        scores = []
+        for posting, text, similarity in zip(postings, texts, similarities):
+            score = float(similarity)
+            if self._title_re and self._title_re.search(posting_title(posting)):
+                score += TITLE_KEYWORD_BOOST
+            if self._location_re and self._location_re.search(text):
+                score += LOCATION_BOOST
+            scores.append(round(score, 4))
+        return scores
+
+    def classify_local(self, postings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run the local tiers only
+
+        Returns:
+            One decision dict per posting with url, decision ('accept', 'reject' or
+            'ambiguous'), tier, score and reason
+        """
+        decisions: List[Optional[Dict[str, Any]]] = [None] * len(postings)
+        remaining: List[Tuple[int, Dict[str, Any]]] = []
+        for i, posting in enumerate(postings):
+            reason = self.apply_rules(posting)
+            self.stats.record("rules", "reject" if reason else None)
+            if reason:
+                decisions[i] = {"url": posting.get("url"), "decision": "reject", "tier": "rules",
+                                "score": None, "reason": reason}
+            else:
+                remaining.append((i, posting))
+
+        scores = self.score([posting for _, posting in remaining])
+        for (i, posting), score in zip(remaining, scores):
+            if score >= self.accept_score:
+                decision = "accept"
+            elif score < self.reject_score:
+                decision = "reject"
+            else:
+                decision = "ambiguous"
+            self.stats.record("tfidf", None if decision == "ambiguous" else decision)
+            decisions[i] = {"url": posting.get("url"), "decision": decision, "tier": "tfidf",
+                            "score": score, "reason": f"Local relevance score {score:.2f}"}
+        return decisions
+
+    def build_prompt(self, posting: Dict[str, Any]) -> str:
+        """Build the relevance prompt for an ambiguous posting"""
+        return f"""
+        Decide whether this job posting is relevant to the candidate described below.
+
+        CANDIDATE CRITERIA:
+        {self.criteria.describe()}
+
+        JOB POSTING:
+        {posting_text(posting)[:FILTER_TEXT_CHARS]}
+
+        Reply with only a JSON object: {{"relevant": true or false, "reason": "one short sentence"}}
+        """
+
+    def classify_with_llm(self, posting: Dict[str, Any], score: Optional[float] = None) -> Dict[str, Any]:
+        """Ask Claude about one ambiguous posting; errors fail open so no posting is lost"""
+        decision = {"url": posting.get("url"), "tier": "llm", "score": score}
+        if not self.client:
+            self.stats.record_llm_error()
+            self.stats.record("llm", "accept")
+            return {**decision, "decision": "accept", "reason": "LLM client not configured; accepted by default"}
+
+        try:
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=FILTER_MAX_TOKENS,
+                temperature=0,
+                messages=[{"role": "user", "content": self.build_prompt(posting)}]
+            )
+            result_text = response.content[0].text
+            json_match = re.search(r"\{.*\}", result_text, re.DOTALL)
+            verdict = json.loads(json_match.group(0) if json_match else result_text)
+            relevant = bool(verdict.get("relevant"))
+            reason = verdict.get("reason") or ""
+        except Exception as e:
+            logger.error(f"Error filtering with LLM: {str(e)}")
+            self.stats.record_llm_error()
+            self.stats.record("llm", "accept")
+            return {**decision, "decision": "accept", "reason": f"LLM filter failed ({str(e)}); accepted by default"}
+
+        self.stats.record("llm", "accept" if relevant else "reject")
+        return {**decision, "decision": "accept" if relevant else "reject", "reason": reason}
+
+    def classify(self, postings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Classify postings, sending only the locally ambiguous ones to Claude"""
+        postings = list(postings)
+        decisions = self.classify_local(postings)
+        for i, decision in enumerate(decisions):
+            if decision["decision"] == "ambiguous":
+                decisions[i] = self.classify_with_llm(postings[i], decision["score"])
+        return decisions
+
+    def filter(self, postings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return only the relevant postings, in input order"""
+        postings = list(postings)
+        return [posting for posting, decision in zip(postings, self.classify(postings))
+                if decision["decision"] == "accept"]
+
+
+def main():
+    """Filter a startups.gallery CSV down to the relevant rows before detail scraping"""
+    parser = argparse.ArgumentParser(description="Filter scraped job rows for relevance")
+    parser.add_argument('input', type=str,
+                        help='CSV with url and title columns (e.g. startup_jobs.csv), or a gallery job store directory')
+    parser.add_argument('-o', '--output', type=str, default='relevant_jobs.csv',
+                        help='CSV of relevant rows (default: relevant_jobs.csv)')
+    args = parser.parse_args()
+
+    if os.path.isdir(args.input):
+        fieldnames = ["url", "title", "company_info"]
+        rows = JobStore(args.input, schema=GALLERY_SCHEMA).read(columns=fieldnames).to_pylist()
+    else:
+        with open(args.input, newline="") as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames or ["url", "title", "company_info"]
+            rows = list(reader)
+
+    relevance_filter = RelevanceFilter()
+    relevant = relevance_filter.filter(rows)
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(relevant)
+
+    print(f"Kept {len(relevant)} of {len(rows)} jobs")
+    for line in relevance_filter.stats.format_summary():
+        print(line)
+    print(f"Data saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
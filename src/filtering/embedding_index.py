@@ -0,0 +1,338 @@
+from typing import Dict, Any, List, Iterable, Iterator, Optional
+import argparse
+import json
+import logging
+import os
+import threading
+
+import numpy as np # type: ignore
+from scipy import sparse # type: ignore
+from sklearn.feature_extraction.text import HashingVectorizer # type: ignore
+from sklearn.random_projection import SparseRandomProjection # type: ignore
+
+from src.scrapers.job_store import JobStore
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# Fields of an extracted posting (process_with_llm output) that describe the work itself
+EMBEDDED_FIELDS = ("job_title", "required_skills", "responsibilities", "job_description")
+# Kept beside each vector so matches can be shown without reading the job store
+LABEL_FIELDS = ("job_title", "company_name", "location")
+
+META_FILE = "meta.json"
+VECTORS_FILE = "vectors.f32"
+LABELS_FILE = "labels.jsonl"
+# Rows reserved the first time the vector file is created; it doubles from there
+MIN_CAPACITY = 1024
+
+
+def posting_embedding_text(record: Dict[str, Any]) -> str:
+    """Title, skills, responsibilities and summary of an extracted posting, one per line"""
+    parts = []
+    for field in EMBEDDED_FIELDS:
+        value = record.get(field)
+        if isinstance(value, (list, tuple)):
+            value = "; ".join(str(item) for item in value if item)
+        if value and value != "Not found":
+            parts.append(str(value))
+    return "\n".join(parts)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so a dot product is a cosine similarity (zero rows stay zero)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class HashingEmbedder:
+    """
+    Model-free embedder: hashed word unigrams and bigrams, randomly projected down to dim
+    dimensions. Needs nothing beyond scikit-learn and no fitting, so vectors appended on
+    different days stay comparable; matches are lexical rather than semantic.
+    """
+
+    def __init__(self, dim: int = config.EMBEDDING_DIM, n_features: int = 2 ** 18, seed: int = 0):
+        self.dim = dim
+        self.name = f"hashing-{n_features}-{dim}-{seed}"
+        self._vectorizer = HashingVectorizer(n_features=n_features, ngram_range=(1, 2), stop_words="english",
+                                             alternate_sign=False, norm="l2")
+        self._projection = SparseRandomProjection(n_components=dim, dense_output=True, random_state=seed)
+        # The projection matrix depends only on the input width and the seed
+        self._projection.fit(sparse.csr_matrix((1, n_features)))
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        vectors = self._projection.transform(self._vectorizer.transform(texts))
+        return normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+
+class TransformerEmbedder:
+    """Sentence embeddings from a local Hugging Face model: attention-masked mean of the last hidden states"""
+
+    def __init__(self, model_name: str = config.EMBEDDING_MODEL, batch_size: int = config.EMBEDDING_BATCH_SIZE,
+                 max_length: int = 256):
+        # Imported here so the hashing backend works where torch is not installed
+        import torch # type: ignore
+        from transformers import AutoModel, AutoTokenizer # type: ignore
+
+        self._torch = torch
+        self._tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self._model = AutoModel.from_pretrained(model_name).eval()
+        self.name = model_name
+        self.dim = self._model.config.hidden_size
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        chunks = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = self._tokenizer(texts[start:start + self.batch_size], padding=True, truncation=True,
+                                    max_length=self.max_length, return_tensors="pt")
+            with self._torch.inference_mode():
+                hidden = self._model(**batch).last_hidden_state
+            mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            chunks.append(pooled.numpy())
+        if not chunks:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return normalize_rows(np.vstack(chunks).astype(np.float32))
+
+
+def get_embedder(backend: str = config.EMBEDDING_BACKEND):
+    """Embedder for a backend name: 'transformers' (EMBEDDING_MODEL) or 'hashing'"""
+    if backend == "transformers":
+        return TransformerEmbedder()
+    if backend == "hashing":
+        return HashingEmbedder()
+    raise ValueError(f"Unknown embedding backend {backend!r}; expected 'transformers' or 'hashing'")
+
+
+class EmbeddingIndex:
+    """
+    Unit-length posting embeddings in a memory-mapped float32 matrix, for matching postings
+    against a résumé or profile.
+
+    Rows are appended in place (the file doubles when full), so indexing new postings never
+    rewrites earlier vectors, and the matrix is paged in by the OS rather than loaded. A query
+    is one matrix-vector product plus a partial sort, which stays in milliseconds over 100k
+    postings (see src/benchmarks/match_bench.py). Re-adding a posting's URL overwrites its row.
+    The vector file is written before the labels and the row count in meta.json, so an
+    interrupted append leaves rows past the count that the next append reuses.
+    """
+
+    def __init__(self, path: Optional[str] = config.EMBEDDING_INDEX_PATH, embedder=None):
+        """
+        Args:
+            path: Index directory (None keeps the vectors in memory only)
+            embedder: Object with name, dim and embed(texts) -> unit-length float32 rows
+                (defaults to get_embedder() for EMBEDDING_BACKEND)
+        """
+        self.path = path
+        self.embedder = embedder if embedder is not None else get_embedder()
+        self.dim = self.embedder.dim
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._capacity = 0
+        self._count = 0
+        self._labels: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        if path:
+            self._open()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _open(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        params = {"model": self.embedder.name, "dim": self.dim}
+        meta = None
+        if os.path.exists(self._file(META_FILE)):
+            with open(self._file(META_FILE)) as f:
+                meta = json.load(f)
+            if {key: meta.get(key) for key in params} != params:
+                # Vectors from another model live in another space; they cannot be compared
+                logger.warning(f"Embedding index {self.path} was built with {meta.get('model')}, "
+                               f"rebuilding with {self.embedder.name}")
+                for name in (VECTORS_FILE, LABELS_FILE):
+                    if os.path.exists(self._file(name)):
+                        os.remove(self._file(name))
+                meta = None
+
+        self._count = meta["count"] if meta else 0
+        labels: List[Optional[Dict[str, Any]]] = [None] * self._count
+        uncommitted = False
+        if os.path.exists(self._file(LABELS_FILE)):
+            with open(self._file(LABELS_FILE)) as f:
+                for line in f:
+                    try:
+                        label = json.loads(line)
+                    except json.JSONDecodeError:
+                        uncommitted = True  # a line torn by an interrupted append
+                        continue
+                    row = label.pop("row")
+                    # Later lines are newer versions of a row; rows past the count were never committed
+                    if row < self._count:
+                        labels[row] = label
+                    else:
+                        uncommitted = True
+        self._labels = labels
+        self._rows = {label["url"]: row for row, label in enumerate(labels) if label is not None}
+        if uncommitted:
+            # Drop the interrupted append so the next one does not land on a torn line
+            tmp_path = self._file(LABELS_FILE + ".tmp")
+            with open(tmp_path, "w") as f:
+                for row, label in enumerate(labels):
+                    if label is not None:
+                        f.write(json.dumps({"row": row, **label}) + "\n")
+            os.replace(tmp_path, self._file(LABELS_FILE))
+
+        if os.path.exists(self._file(VECTORS_FILE)):
+            self._capacity = os.path.getsize(self._file(VECTORS_FILE)) // (self.dim * 4)
+            self._vectors = np.memmap(self._file(VECTORS_FILE), dtype=np.float32, mode="r+",
+                                      shape=(self._capacity, self.dim))
+
+    def _reserve(self, rows: int) -> None:
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, 2 * self._capacity, MIN_CAPACITY)
+        if not self.path:
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            if self._vectors is not None:
+                grown[:self._count] = self._vectors[:self._count]
+        else:
+            if self._vectors is not None:
+                self._vectors.flush()
+            with open(self._file(VECTORS_FILE), "ab") as f:
+                f.truncate(capacity * self.dim * 4)
+            grown = np.memmap(self._file(VECTORS_FILE), dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._vectors, self._capacity = grown, capacity
+
+    def add(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Embed and index extracted postings (error results and postings without a source_url
+        are skipped); returns the number of postings written
+        """
+        records = [record for record in records if record.get("source_url") and "error" not in record]
+        texts = [posting_embedding_text(record) for record in records]
+        kept = [(record, text) for record, text in zip(records, texts) if text]
+        if not kept:
+            return 0
+        vectors = self.embedder.embed([text for _, text in kept])
+        labels = [{"url": record["source_url"], **{field: record.get(field) for field in LABEL_FIELDS}}
+                  for record, _ in kept]
+        return self.add_vectors(vectors, labels)
+
+    def add_vectors(self, vectors: np.ndarray, labels: List[Dict[str, Any]]) -> int:
+        """Index precomputed embeddings, one label dict (with a 'url') per row"""
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(labels), -1))
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+        with self._lock:
+            count = self._count
+            rows = []
+            for label in labels:
+                row = self._rows.get(label["url"])
+                if row is None:
+                    row, count = count, count + 1
+                    self._rows[label["url"]] = row
+                    self._labels.append(label)
+                else:
+                    self._labels[row] = label
+                rows.append(row)
+            self._reserve(count)
+            self._vectors[rows] = vectors
+            if self.path:
+                self._vectors.flush()
+                with open(self._file(LABELS_FILE), "a") as f:
+                    for row, label in zip(rows, labels):
+                        f.write(json.dumps({"row": row, **label}) + "\n")
+                tmp_path = self._file(META_FILE + ".tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump({"model": self.embedder.name, "dim": self.dim, "count": count}, f)
+                os.replace(tmp_path, self._file(META_FILE))
+            self._count = count
+        return len(labels)
+
+    def query(self, profile: str, k: int = 10) -> List[Dict[str, Any]]:
+        """The k postings most similar to a résumé or profile text, best first, each label plus its score"""
+        return self.query_vector(self.embedder.embed([profile])[0], k)
+
+    def query_vector(self, vector: np.ndarray, k: int = 10) -> List[Dict[str, Any]]:
+        """Like query, for a precomputed embedding"""
+        vector = normalize_rows(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            if not self._count or k <= 0:
+                return []
+            scores = self._vectors[:self._count] @ vector
+            k = min(k, self._count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [{**self._labels[row], "score": round(float(scores[row]), 4)} for row in top]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
+
+    def close(self) -> None:
+        with self._lock:
+            if self._vectors is not None and self.path:
+                self._vectors.flush()
+            self._vectors = None
+            self._capacity = 0
+
+
+def read_postings(path: str) -> Iterator[Dict[str, Any]]:
+    """Extracted postings from a JSONL results file, or a job store directory (reading only the indexed columns)"""
+    if os.path.isdir(path):
+        columns = ["source_url"] + list(dict.fromkeys(EMBEDDED_FIELDS + LABEL_FIELDS))
+        yield from JobStore(path).iter_rows(columns=columns)
+        return
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    """Index extracted postings and list the best matches for a profile"""
+    parser = argparse.ArgumentParser(description="Match extracted job postings against a résumé or profile")
+    parser.add_argument('--add', type=str, default=None,
+                        help='JSONL results file or job store directory whose postings to index first')
+    parser.add_argument('--profile', type=str, default=None,
+                        help='Text file with a résumé or profile to match (default: FILTER_PROFILE)')
+    parser.add_argument('-k', '--top', type=int, default=10, help='Number of matches to list (default: 10)')
+    parser.add_argument('--index', type=str, default=config.EMBEDDING_INDEX_PATH,
+                        help=f'Index directory (default: {config.EMBEDDING_INDEX_PATH})')
+    parser.add_argument('--backend', choices=["transformers", "hashing"], default=config.EMBEDDING_BACKEND,
+                        help=f'Embedding backend (default: {config.EMBEDDING_BACKEND})')
+    args = parser.parse_args()
+
+    index = EmbeddingIndex(args.index, embedder=get_embedder(args.backend))
+    try:
+        if args.add:
+            added, batch = 0, []
+            for record in read_postings(args.add):
+                batch.append(record)
+                if len(batch) >= config.EMBEDDING_BATCH_SIZE * 8:
+                    added += index.add(batch)
+                    batch = []
+            added += index.add(batch)
+            print(f"Indexed {added} postings ({len(index)} in {args.index})")
+
+        if args.profile:
+            with open(args.profile) as f:
+                profile = f.read()
+        else:
+            profile = config.FILTER_PROFILE
+        for match in index.query(profile, args.top):
+            print(f"{match['score']:.3f}  {match.get('job_title') or '?'} at {match.get('company_name') or '?'}  "
+                  f"{match['url']}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
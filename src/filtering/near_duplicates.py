@@ -0,0 +1,232 @@
+from typing import Dict, Any, List, Optional, Set, Tuple
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+
+import numpy as np # type: ignore
+
+from src.extraction.llm_cache import normalize_text
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# Universal hashing modulo a Mersenne prime, as in the MinHash literature. The coefficients and
+# the shingle hashes are 32-bit, so a * x + b stays below 2**64 and never wraps in uint64
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Bumped whenever signatures computed by an older version are no longer comparable
+_HASH_SCHEME = 2
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = config.DEDUP_SHINGLE_SIZE) -> Set[int]:
+    """32-bit hashes of the overlapping size-word windows of text (lowercased, punctuation dropped)"""
+    words = _WORD.findall(normalize_text(text).lower())
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+def posting_fingerprint_text(job_data: Dict[str, Any]) -> str:
+    """Title, company and body of a fetched posting: the text two copies of one role share"""
+    parts = [job_data.get("job_title"), job_data.get("company_info"), job_data.get("full_text")]
+    return "\n".join(part for part in parts if part and part != "Not found")
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures with LSH banding, used to spot the same role posted under
+    different URLs (a gallery link, the Ashby page, the Greenhouse board...).
+
+    Each signature is split into bands; postings sharing any band land in the same
+    bucket and become candidates, and only candidates are compared. Lookups cost one
+    dict probe per band however large the corpus grows. A posting whose estimated
+    Jaccard similarity to an indexed one reaches the threshold joins that posting's
+    cluster, whose canonical URL is the first member seen. With a path, signatures
+    persist in SQLite so clusters span runs.
+    """
+
+    def __init__(self, path: Optional[str] = config.DEDUP_INDEX_PATH, threshold: float = config.DEDUP_THRESHOLD,
+                 num_perm: int = config.DEDUP_NUM_PERM, bands: int = config.DEDUP_BANDS,
+                 shingle_size: int = config.DEDUP_SHINGLE_SIZE, seed: int = 1):
+        """
+        Args:
+            path: SQLite database file (None or ':memory:' keeps the index in memory only)
+            threshold: Minimum estimated Jaccard similarity for two postings to be duplicates
+            num_perm: MinHash permutations per signature
+            bands: LSH bands; num_perm / bands rows each. More bands catch lower similarities
+                as candidates at the cost of more comparisons
+            shingle_size: Words per shingle
+            seed: Seed for the hash permutations (signatures are only comparable under one seed)
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MAX_HASH, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MAX_HASH, size=num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._canonical: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if path and path != ":memory:":
+            self._open(path, {"num_perm": num_perm, "bands": bands, "shingle_size": shingle_size, "seed": seed,
+                              "scheme": _HASH_SCHEME})
+
+    def _open(self, path: str, params: Dict[str, int]) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                url TEXT PRIMARY KEY,
+                canonical_url TEXT NOT NULL,
+                signature BLOB NOT NULL
+            ) WITHOUT ROWID
+        """)
+        stored = self._conn.execute("SELECT value FROM meta WHERE key = 'params'").fetchone()
+        if stored is not None and json.loads(stored[0]) != params:
+            # Signatures built with other parameters are not comparable; start over
+            logger.warning(f"Near-duplicate index {path} was built with {stored[0]}, rebuilding with {params}")
+            self._conn.execute("DELETE FROM signatures")
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('params', ?)", (json.dumps(params),))
+        self._conn.commit()
+
+        for url, canonical_url, blob in self._conn.execute("SELECT url, canonical_url, signature FROM signatures"):
+            self._insert(url, canonical_url, np.frombuffer(blob, dtype=np.uint64))
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of text, or None if it has no words"""
+        hashes = np.fromiter(shingles(text, self.shingle_size), dtype=np.uint64)
+        if not hashes.size:
+            return None
+        # One row per permutation: (a * x + b) mod p, truncated to 32 bits, minimized over shingles
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, url: str, canonical_url: str, signature: np.ndarray) -> None:
+        self._signatures[url] = signature
+        self._canonical[url] = canonical_url
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(url)
+
+    def _remove(self, url: str) -> None:
+        signature = self._signatures.pop(url)
+        self._canonical.pop(url)
+        for band, key in enumerate(self._band_keys(signature)):
+            members = self._buckets[band][key]
+            members.remove(url)
+            if not members:
+                del self._buckets[band][key]
+
+    def _matches(self, signature: np.ndarray, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        candidates.discard(exclude)
+        matches = []
+        for url in candidates:
+            similarity = float(np.mean(self._signatures[url] == signature))
+            if similarity >= self.threshold:
+                matches.append((url, similarity))
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def query(self, text: str) -> List[Tuple[str, float]]:
+        """Indexed postings similar to text, as (url, estimated Jaccard similarity), most similar first"""
+        signature = self.signature(text)
+        if signature is None:
+            return []
+        with self._lock:
+            return self._matches(signature)
+
+    def add(self, url: str, text: str) -> str:
+        """
+        Index a posting (replacing its earlier version) and return its cluster's canonical URL:
+        url itself if it is new, or the canonical URL of the most similar indexed posting
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return url
+        with self._lock:
+            if url in self._signatures:
+                self._remove(url)
+            matches = self._matches(signature, exclude=url)
+            canonical_url = self._canonical[matches[0][0]] if matches else url
+            self._insert(url, canonical_url, signature)
+            if self._conn is not None:
+                self._conn.execute("INSERT OR REPLACE INTO signatures (url, canonical_url, signature) VALUES (?, ?, ?)",
+                                   (url, canonical_url, signature.tobytes()))
+                self._conn.commit()
+        if canonical_url != url:
+            logger.info(f"{url} is a near-duplicate of {canonical_url} (similarity {matches[0][1]:.2f})")
+        return canonical_url
+
+    def remove(self, url: str) -> List[str]:
+        """
+        Drop a posting, e.g. one that expired or failed, so it stops standing in for its copies.
+        If it was its cluster's canonical URL, the earliest indexed remaining member takes over.
+
+        Returns:
+            The remaining members of its cluster, the new canonical URL first
+        """
+        with self._lock:
+            if url not in self._signatures:
+                return []
+            canonical_url = self._canonical[url]
+            self._remove(url)
+            members = [member for member, canonical in self._canonical.items() if canonical == canonical_url]
+            if canonical_url == url and members:
+                for member in members:
+                    self._canonical[member] = members[0]
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM signatures WHERE url = ?", (url,))
+                self._conn.execute("UPDATE signatures SET canonical_url = ? WHERE canonical_url = ?",
+                                   (members[0] if members else url, url))
+                self._conn.commit()
+        if canonical_url == url and members:
+            logger.info(f"{members[0]} replaces {url} as the canonical posting of its cluster")
+        return members
+
+    def canonical(self, url: str) -> Optional[str]:
+        """Canonical URL of an indexed posting's cluster, or None if it is not indexed"""
+        with self._lock:
+            return self._canonical.get(url)
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Canonical URL -> every indexed member of its cluster (canonical first), for clusters of two or more"""
+        with self._lock:
+            members: Dict[str, List[str]] = {}
+            for url, canonical_url in self._canonical.items():
+                members.setdefault(canonical_url, []).append(url)
+        return {canonical_url: sorted(urls, key=lambda url: url != canonical_url)
+                for canonical_url, urls in members.items() if len(urls) > 1}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._signatures)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            postings = len(self._canonical)
+            canonical = len(set(self._canonical.values()))
+        return {"postings": postings, "clusters": canonical, "duplicates": postings - canonical}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
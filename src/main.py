@@ -0,0 +1,611 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Deque, List, Iterable, Callable, Optional, Tuple, Union
+import argparse
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+
+from src.extraction.async_extractor import AsyncExtractor
+from src.extraction.compaction import CompactionStats, DEFAULT_COMPACTION_STATS, compact_job_data
+from src.extraction.llm_cache import CACHE_MODES, get_default_cache
+from src.extraction.schema import DEFAULT_PARSE_STATS
+from src.extraction.structured_data import DEFAULT_STRUCTURED_STATS
+from src.filtering.claude_filter import RelevanceFilter
+from src.filtering.embedding_index import EmbeddingIndex
+from src.filtering.near_duplicates import NearDuplicateIndex, posting_fingerprint_text
+from src.scrapers.batch_scraper import (DriverPool, fetch_one, read_urls, record_extraction, requeue_deferred,
+                                        result_outcome, result_url)
+from src.scrapers.crawl_store import SETTLED_STATUSES, CrawlStore
+from src.scrapers.host_limiter import DEFAULT_HOST_LIMITER
+from src.scrapers.job_store import JobStore
+from src.scrapers.startup_gall_scrape import GALLERY_SOURCE, StartupJobScraper
+from src.scrapers.waits import DEFAULT_WAIT_STATS
+from src.sheets_integration.sheets_manager import SheetsManager
+from src.utils import config
+from src.utils.tracing import DEFAULT_TRACER
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input; every worker re-queues it for its siblings
+_DONE = object()
+
+# URLs looked up in the crawl store per dedup query
+DEDUP_BATCH_SIZE = 100
+
+
+class Stage:
+    """
+    A pool of worker threads moving items from an inbox queue to an outbox queue.
+
+    Queues are bounded, so a slow stage blocks the stages feeding it instead of
+    letting work pile up in memory.
+    """
+
+    def __init__(self, name: str, process: Callable[[List[Any]], List[Any]], inbox: "queue.Queue[Any]",
+                 outbox: "queue.Queue[Any]", workers: int = 1, batch_size: int = 1,
+                 finish: Optional[Callable[[], List[Any]]] = None):
+        """
+        Args:
+            name: Stage name used in logs
+            process: Maps a batch of input items to zero or more output items
+            inbox: Queue to read items from, terminated by _DONE
+            outbox: Queue to write results to; _DONE is sent once every worker has finished
+            workers: Number of threads running process concurrently
+            batch_size: Maximum items handed to process at once (whatever is already queued)
+            finish: Run by the last worker once the inbox is done; its outputs are sent before _DONE
+        """
+        self.name = name
+        self.process = process
+        self.inbox = inbox
+        self.outbox = outbox
+        self.batch_size = batch_size
+        self.finish = finish
+        self._running = workers
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True) for i in range(workers)]
+
+    def start(self) -> "Stage":
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    def _take(self) -> Tuple[List[Any], bool]:
+        """Block for one item, then take up to batch_size - 1 more without waiting"""
+        item = self.inbox.get()
+        if item is _DONE:
+            self.inbox.put(_DONE)
+            return [], True
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                self.inbox.put(_DONE)
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch, done = self._take()
+                if batch:
+                    try:
+                        outputs = self.process(batch)
+                    except Exception as e:
+                        logger.error(f"Error in {self.name} stage: {str(e)}")
+                        outputs = [{"error": str(e), "url": item.get("url")} for item in batch]
+                    for output in outputs:
+                        self.outbox.put(output)
+                if done:
+                    return
+        finally:
+            with self._lock:
+                self._running -= 1
+                last = self._running == 0
+            if last:
+                try:
+                    for output in (self.finish() if self.finish else []):
+                        self.outbox.put(output)
+                except Exception as e:
+                    logger.error(f"Error finishing {self.name} stage: {str(e)}")
+                self.outbox.put(_DONE)
+
+
+class Pipeline:
+    """
+    Streaming job pipeline: discover -> dedup -> fetch -> compact -> near-dup -> filter -> extract -> export.
+
+    Each stage runs with its own concurrency and hands items on through bounded queues,
+    so gallery crawling, page fetches and LLM calls overlap while memory stays flat.
+    """
+
+    def __init__(self, output_path: str, fetch_workers: int = config.PIPELINE_FETCH_WORKERS,
+                 headless: bool = True, driver_factory: Optional[Callable[..., Any]] = None,
+                 extractor: Optional[AsyncExtractor] = None, relevance_filter: Optional[RelevanceFilter] = None,
+                 store: Optional[CrawlStore] = None, sheets: Optional[SheetsManager] = None,
+                 job_store: Optional[JobStore] = None, near_duplicates: Optional[NearDuplicateIndex] = None,
+                 queue_size: int = config.PIPELINE_QUEUE_SIZE,
+                 filter_batch_size: int = config.PIPELINE_FILTER_BATCH_SIZE,
+                 compact: bool = config.COMPACT_TEXT, compaction_stats: Optional[CompactionStats] = None,
+                 cache_mode: str = config.LLM_CACHE_MODE, embedding_index: Optional[EmbeddingIndex] = None):
+        """
+        Args:
+            output_path: JSONL file to append one result per line to
+            fetch_workers: Concurrent page fetches (browsers in the driver pool)
+            headless: Run browsers in headless mode
+            driver_factory: Callable returning a new webdriver (defaults to create_driver)
+            extractor: LLM extraction stage; its concurrency bounds in-flight API calls
+                (defaults to an AsyncExtractor built from config)
+            relevance_filter: Drops irrelevant postings before extraction (None keeps everything)
+            store: Crawl state used for dedup across runs and to skip unchanged postings
+            sheets: Tracking sheet to sync results to as they are exported
+            job_store: Parquet dataset to append successful results to, besides the JSONL output
+            near_duplicates: Index of fetched postings; one found to be a copy of an indexed
+                posting under another URL is dropped before filtering and extraction
+            queue_size: Capacity of each inter-stage queue
+            filter_batch_size: Postings scored together by the relevance filter
+            compact: Strip boilerplate from posting text before filtering and extraction
+            compaction_stats: Where to record before/after text sizes
+            cache_mode: LLM cache mode ('use', 'refresh' or 'bypass')
+            embedding_index: Job matching index that successful results are embedded into
+        """
+        self.output_path = output_path
+        self.fetch_workers = fetch_workers
+        self.pool = DriverPool(fetch_workers, headless=headless, driver_factory=driver_factory,
+                               cache_mode=cache_mode, compact=False)
+        if extractor is None:
+            extractor = AsyncExtractor(cache=None if cache_mode == "bypass" else get_default_cache(),
+                                       cache_mode=cache_mode)
+        self.extractor = extractor
+        self.relevance_filter = relevance_filter
+        self.store = store
+        self.sheets = sheets
+        self.job_store = job_store
+        self.near_duplicates = near_duplicates
+        self.embedding_index = embedding_index
+        self.queue_size = queue_size
+        self.filter_batch_size = filter_batch_size
+        self.compact = compact
+        self.compaction_stats = compaction_stats if compaction_stats is not None else DEFAULT_COMPACTION_STATS
+        self.counts = {"discovered": 0, "duplicates": 0, "unchanged": 0, "near_duplicates": 0, "filtered": 0,
+                       "succeeded": 0, "failed": 0, "expired": 0, "deferred": 0}
+        self._counts_lock = threading.Lock()
+        self._seen = set()
+        # (entry, deferred result) pairs for postings whose domain was parked when fetched
+        self._deferred: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        # Canonical URL of each near-duplicate cluster in flight -> copies waiting for its outcome
+        self._copies: Dict[str, List[str]] = {}
+        self._copies_lock = threading.Lock()
+        self._source_name: Optional[str] = None
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._counts_lock:
+            self.counts[key] += amount
+
+    def discover(self, source: Iterable[Union[str, Dict[str, Any]]], outbox: "queue.Queue[Any]") -> None:
+        """Feed discovered postings (URLs or gallery cards) into the pipeline"""
+        try:
+            for entry in source:
+                outbox.put({"url": entry} if isinstance(entry, str) else entry)
+                self._count("discovered")
+        except Exception as e:
+            logger.error(f"Error in discover stage: {str(e)}")
+        finally:
+            outbox.put(_DONE)
+
+    def dedup(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop postings already seen in this run, or already processed in earlier runs"""
+        fresh = []
+        for entry in batch:
+            if entry.get("url") and entry["url"] not in self._seen:
+                self._seen.add(entry["url"])
+                fresh.append(entry)
+        if self.store is not None and fresh:
+            self.store.add_urls(fresh, source=self._source_name)
+            due = set(self.store.due_urls([entry["url"] for entry in fresh]))
+            fresh = [entry for entry in fresh if entry["url"] in due]
+        self._count("duplicates", len(batch) - len(fresh))
+        return fresh
+
+    def fetch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fetch raw job_data on the driver pool (HTTP first where the platform allows); postings
+        on a parked domain are held back for refetch_deferred
+        """
+        results = []
+        for entry in batch:
+            job_data = fetch_one(self.pool, entry["url"], self.store)
+            if job_data is None:
+                self._count("unchanged")
+                continue
+            if job_data.get("deferred"):
+                with self._counts_lock:
+                    self._deferred.append((entry, job_data))
+                continue
+            if entry.get("company_info") and "error" not in job_data:
+                # Gallery cards name the company, which helps tell copies of a role from similar roles
+                job_data = {**job_data, "company_info": entry["company_info"]}
+            results.append(job_data)
+        return results
+
+    def refetch_deferred(self) -> List[Dict[str, Any]]:
+        """
+        Once every posting has been fetched, fetch those on parked domains again as their domains
+        reopen, for up to HOST_REQUEUE_MAX_WAIT; any still parked stay pending in the crawl store
+        """
+        deadline = time.time() + config.HOST_REQUEUE_MAX_WAIT
+        results: List[Dict[str, Any]] = []
+        deferred, self._deferred = self._deferred, []
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            while deferred:
+                entries = {job_data["url"]: entry for entry, job_data in deferred}
+                urls = requeue_deferred([job_data for _, job_data in deferred], deadline)
+                if not urls:
+                    break
+                for fetched in executor.map(lambda url: self.fetch([entries[url]]), urls):
+                    results.extend(fetched)
+                deferred, self._deferred = self._deferred, []
+        self._count("deferred", len(deferred))
+        return results
+
+    def compact_stage(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self.compact:
+            return batch
+        return [job_data if "error" in job_data else compact_job_data(job_data, stats=self.compaction_stats)
+                for job_data in batch]
+
+    def near_dup(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop postings whose title, company and text nearly match a posting indexed under another
+        URL. A copy is settled only once its canonical posting is: it waits for that posting's
+        outcome when it is in this run, and takes its place when it failed or expired
+        """
+        if self.near_duplicates is None:
+            return batch
+        kept = []
+        for job_data in batch:
+            if "error" in job_data:
+                kept.append(job_data)
+                continue
+            url, text = job_data["url"], posting_fingerprint_text(job_data)
+            with self._copies_lock:
+                canonical_url = self.near_duplicates.add(url, text)
+                while canonical_url != url and self._canonical_state(canonical_url) == "gone":
+                    self.near_duplicates.remove(canonical_url)
+                    canonical_url = self.near_duplicates.add(url, text)
+                if canonical_url == url:
+                    # In flight: copies found from now on wait for this posting's outcome
+                    self._copies.setdefault(url, [])
+                    kept.append(job_data)
+                    continue
+                self._count("near_duplicates")
+                state = self._canonical_state(canonical_url)
+                if state == "in_flight":
+                    self._copies[canonical_url].append(url)
+                elif state == "settled":
+                    # Settled like a filtered posting: looked at again only if its content changes
+                    self.store.mark_filtered(url, f"Near-duplicate of {canonical_url}")
+        return kept
+
+    def _canonical_state(self, canonical_url: str) -> Optional[str]:
+        """
+        Where a cluster's canonical posting stands: 'in_flight' in this run, 'settled' (extracted
+        or filtered), 'gone' (expired or failed, so a copy should replace it), or None when it is
+        still pending or there is no crawl store to ask; copies of a pending one are left pending
+        """
+        if canonical_url in self._copies:
+            return "in_flight"
+        state = self.store.get(canonical_url) if self.store is not None else None
+        if state is None:
+            return None
+        if state["fetch_status"] in ("expired", "failed") or state["extract_status"] == "failed":
+            return "gone"
+        return "settled" if state["extract_status"] in SETTLED_STATUSES else None
+
+    def _settle_copies(self, url: str, outcome: str) -> None:
+        """
+        Settle the copies held back for a canonical posting once its outcome is known: filtered
+        along with it when it succeeded or was filtered, otherwise left pending (and copies
+        settled in earlier runs reopened) with the earliest copy promoted to canonical
+        """
+        if self.near_duplicates is None:
+            return
+        with self._copies_lock:
+            copies = self._copies.pop(url, None)
+            if copies is None:
+                return
+            if outcome in ("succeeded", "filtered"):
+                if self.store is not None:
+                    for copy_url in copies:
+                        self.store.mark_filtered(copy_url, f"Near-duplicate of {url}")
+                return
+            members = self.near_duplicates.remove(url)
+            if self.store is not None:
+                self.store.reopen(members)
+
+    def filter(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep relevant postings; error dicts pass through to be reported"""
+        if self.relevance_filter is None:
+            return batch
+        postings = [job_data for job_data in batch if "error" not in job_data]
+        kept = [job_data for job_data in batch if "error" in job_data]
+        for job_data, decision in zip(postings, self.relevance_filter.classify(postings)):
+            if decision["decision"] == "accept":
+                kept.append(job_data)
+                continue
+            self._count("filtered")
+            if self.store is not None:
+                self.store.mark_filtered(job_data["url"], decision["reason"])
+            self._settle_copies(job_data["url"], "filtered")
+        return kept
+
+    def extract(self, inbox: "queue.Queue[Any]", outbox: "queue.Queue[Any]") -> None:
+        """
+        Run the async extractor over the inbox. One dedicated thread reads the inbox, so an
+        inbox read is never orphaned when the extractor stops. If the extractor fails, the
+        postings it had taken and those still queued are reported as failed, so upstream
+        stages are never left blocked on a full queue.
+        """
+        reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="extract-inbox")
+        read: List["Future[Any]"] = []
+        # Postings handed to the extractor without a result yet; results come back in this order
+        taken: Deque[Dict[str, Any]] = deque()
+        drained = False
+
+        async def run():
+            nonlocal drained
+            loop = asyncio.get_running_loop()
+
+            async def source():
+                nonlocal drained
+                while True:
+                    read.append(reader.submit(inbox.get))
+                    item = await asyncio.wrap_future(read[-1])
+                    read.pop()
+                    if item is _DONE:
+                        drained = True
+                        return
+                    taken.append(item)
+                    yield item
+
+            async for result in self.extractor.extract_stream(source(), ordered=True):
+                taken.popleft()
+                await loop.run_in_executor(None, outbox.put, result)
+
+        def failed(item: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+            if "error" in item:
+                return item
+            return {"error": f"Extract stage failed: {str(error)}", "url": item.get("url"),
+                    "platform": item.get("platform")}
+
+        try:
+            asyncio.run(run())
+        except Exception as e:
+            logger.error(f"Error in extract stage: {str(e)}")
+            leftovers = list(taken)
+            # A read still in progress when the extractor stopped is finished here, not dropped
+            pending = [future.result() for future in read]
+            leftovers.extend(item for item in pending if item is not _DONE)
+            drained = drained or _DONE in pending
+            for item in leftovers:
+                outbox.put(failed(item, e))
+            while not drained:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                outbox.put(failed(item, e))
+        finally:
+            reader.shutdown(wait=False)
+            outbox.put(_DONE)
+
+    def export(self, inbox: "queue.Queue[Any]") -> None:
+        """
+        Append results to the JSONL output (and job store), and embed them into the matching
+        index and sync them to the sheet in chunks
+        """
+        pending_sheet_rows: List[Dict[str, Any]] = []
+        pending_index_rows: List[Dict[str, Any]] = []
+        with open(self.output_path, "a") as out:
+            while True:
+                result = inbox.get()
+                if result is _DONE:
+                    break
+                record_extraction(self.store, result)
+                outcome = result_outcome(result)
+                self._count(outcome)
+                self._settle_copies(result_url(result), outcome)
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                if self.job_store is not None and "error" not in result:
+                    self._write_job_store(lambda: self.job_store.append(result))
+                if self.embedding_index is not None and "error" not in result:
+                    pending_index_rows.append(result)
+                    if len(pending_index_rows) >= config.EMBEDDING_BATCH_SIZE:
+                        self._index_results(pending_index_rows)
+                        pending_index_rows = []
+                if self.sheets is not None and "error" not in result:
+                    pending_sheet_rows.append(result)
+                    if len(pending_sheet_rows) >= self.sheets.max_rows_per_request:
+                        self._sync_sheet(pending_sheet_rows)
+                        pending_sheet_rows = []
+        if pending_index_rows:
+            self._index_results(pending_index_rows)
+        if pending_sheet_rows:
+            self._sync_sheet(pending_sheet_rows)
+        if self.job_store is not None:
+            self._write_job_store(self.job_store.flush)
+
+    def _write_job_store(self, write: Callable[[], Any]) -> None:
+        # Rows that fail to write stay buffered in the job store for its next flush
+        try:
+            write()
+        except Exception as e:
+            logger.error(f"Error writing results to the job store: {str(e)}")
+
+    def _index_results(self, results: List[Dict[str, Any]]) -> None:
+        try:
+            self.embedding_index.add(results)
+        except Exception as e:
+            logger.error(f"Error adding results to the matching index: {str(e)}")
+
+    def _sync_sheet(self, results: List[Dict[str, Any]]) -> None:
+        try:
+            self.sheets.sync(results)
+        except Exception as e:
+            logger.error(f"Error syncing results to the sheet: {str(e)}")
+
+    def run(self, source: Iterable[Union[str, Dict[str, Any]]], source_name: Optional[str] = None) -> Dict[str, int]:
+        """
+        Run every stage until the source is exhausted and all results are exported
+
+        Args:
+            source: Posting URLs or gallery cards (e.g. StartupJobScraper.iter_new_jobs)
+            source_name: Where the postings were discovered, recorded in the crawl store
+
+        Returns:
+            Counts of discovered, duplicate, unchanged, near-duplicate, filtered, succeeded, failed,
+            expired and deferred postings
+        """
+        self._source_name = source_name
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(7)]
+        discovered, deduped, fetched, compacted, distinct, relevant, extracted = queues
+
+        threads = [
+            threading.Thread(target=self.discover, args=(source, discovered), name="discover", daemon=True),
+            threading.Thread(target=self.extract, args=(relevant, extracted), name="extract", daemon=True),
+            threading.Thread(target=self.export, args=(extracted,), name="export", daemon=True),
+        ]
+        stages = [
+            Stage("dedup", self.dedup, discovered, deduped, batch_size=DEDUP_BATCH_SIZE),
+            Stage("fetch", self.fetch, deduped, fetched, workers=self.fetch_workers, finish=self.refetch_deferred),
+            Stage("compact", self.compact_stage, fetched, compacted),
+            Stage("near_dup", self.near_dup, compacted, distinct),
+            Stage("filter", self.filter, distinct, relevant, batch_size=self.filter_batch_size),
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for stage in stages:
+                stage.start()
+            for stage in stages:
+                stage.join()
+            for thread in threads:
+                thread.join()
+        finally:
+            self.pool.close()
+        return dict(self.counts)
+
+
+def gallery_source(num_clicks: int) -> Iterable[Dict[str, Any]]:
+    """Yield startups.gallery cards as they load, closing the gallery browser when done"""
+    scraper = StartupJobScraper()
+    try:
+        yield from scraper.iter_new_jobs(num_clicks)
+    finally:
+        scraper.cleanup()
+
+
+def main():
+    """Run the full discovery-to-sheet pipeline"""
+    parser = argparse.ArgumentParser(description="Discover, scrape, filter, extract and export jobs in one pipeline")
+    parser.add_argument('--input', type=str, default=None,
+                        help='Text file or CSV of job URLs; without it, jobs are discovered on startups.gallery')
+    parser.add_argument('-n', '--num_clicks', type=int, default=1,
+                        help='Gallery "Load More" clicks when discovering (default: 1)')
+    parser.add_argument('--output', type=str, default='job_data.jsonl',
+                        help='JSONL output file path (default: job_data.jsonl)')
+    parser.add_argument('--fetch-workers', type=int, default=config.PIPELINE_FETCH_WORKERS,
+                        help=f'Concurrent page fetches (default: {config.PIPELINE_FETCH_WORKERS})')
+    parser.add_argument('--llm-concurrency', type=int, default=config.LLM_CONCURRENCY,
+                        help=f'Concurrent LLM extraction calls (default: {config.LLM_CONCURRENCY})')
+    parser.add_argument('--queue-size', type=int, default=config.PIPELINE_QUEUE_SIZE,
+                        help=f'Capacity of each queue between stages (default: {config.PIPELINE_QUEUE_SIZE})')
+    parser.add_argument('--no-filter', action='store_true', help='Extract every posting without relevance filtering')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='Extract near-duplicate postings (the same role under another URL) too')
+    parser.add_argument('--sheets', action='store_true',
+                        help='Sync results to the tracking sheet (needs SHEETS_SPREADSHEET_ID)')
+    parser.add_argument('--state', type=str, default=config.CRAWL_STORE_PATH,
+                        help=f'Crawl state database (default: {config.CRAWL_STORE_PATH})')
+    parser.add_argument('--no-state', action='store_true',
+                        help='Process every posting without reading or writing crawl state')
+    parser.add_argument('--store', type=str, default=config.JOB_STORE_PATH,
+                        help='Also append results to this Parquet dataset, partitioned by scrape date and platform')
+    parser.add_argument('--match-index', type=str, default=None,
+                        help='Also embed results into this job matching index directory '
+                             '(query it with python -m src.filtering.embedding_index)')
+    parser.add_argument('--cache-mode', choices=CACHE_MODES, default=config.LLM_CACHE_MODE,
+                        help='LLM extraction cache: use, refresh (re-extract and overwrite) or bypass')
+    parser.add_argument('--headless', action='store_true', default=True,
+                        help='Run browsers in headless mode (default: True)')
+    parser.add_argument('--trace', type=str, default=config.TRACE_PATH,
+                        help='Append per-stage timing spans to this JSONL file (default: TRACE_PATH)')
+    args = parser.parse_args()
+    if args.trace:
+        DEFAULT_TRACER.open(args.trace)
+
+    store = None if args.no_state else CrawlStore(args.state)
+    relevance_filter = None if args.no_filter else RelevanceFilter()
+    near_duplicates = None
+    if config.DEDUP_NEAR_DUPLICATES and not args.no_dedup:
+        # Without crawl state, clusters only span this run
+        near_duplicates = NearDuplicateIndex(None if args.no_state else config.DEDUP_INDEX_PATH)
+    extractor = AsyncExtractor(concurrency=args.llm_concurrency,
+                               cache=None if args.cache_mode == "bypass" else get_default_cache(),
+                               cache_mode=args.cache_mode)
+    pipeline = Pipeline(args.output, fetch_workers=args.fetch_workers, headless=args.headless,
+                        extractor=extractor, relevance_filter=relevance_filter, store=store,
+                        sheets=SheetsManager() if args.sheets else None, queue_size=args.queue_size,
+                        job_store=JobStore(args.store) if args.store else None, near_duplicates=near_duplicates,
+                        cache_mode=args.cache_mode,
+                        embedding_index=EmbeddingIndex(args.match_index) if args.match_index else None)
+    if args.input:
+        source, source_name = read_urls(args.input), None
+    else:
+        source, source_name = gallery_source(args.num_clicks), GALLERY_SOURCE
+
+    try:
+        counts = pipeline.run(source, source_name)
+    finally:
+        if store is not None:
+            logger.info(f"Crawl state: {store.stats()}")
+            store.close()
+        if pipeline.job_store is not None:
+            pipeline.job_store.close()
+        if near_duplicates is not None:
+            logger.info(f"Near-duplicate index: {near_duplicates.stats()}")
+            near_duplicates.close()
+        if pipeline.embedding_index is not None:
+            logger.info(f"Matching index: {len(pipeline.embedding_index)} postings")
+            pipeline.embedding_index.close()
+
+    print(f"Discovered {counts['discovered']} postings: {counts['succeeded']} extracted, {counts['failed']} failed, "
+          f"{counts['expired']} expired, {counts['filtered']} filtered out, {counts['duplicates']} already processed, "
+          f"{counts['unchanged']} unchanged, {counts['near_duplicates']} near-duplicates, "
+          f"{counts['deferred']} deferred (domain parked)")
+    DEFAULT_HOST_LIMITER.log_summary()
+    DEFAULT_WAIT_STATS.log_summary()
+    DEFAULT_COMPACTION_STATS.log_summary()
+    DEFAULT_PARSE_STATS.log_summary()
+    DEFAULT_STRUCTURED_STATS.log_summary()
+    if relevance_filter is not None:
+        relevance_filter.stats.log_summary()
+    for line in DEFAULT_TRACER.format_summary():
+        print(line)
+    print(f"Data saved to {args.output}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
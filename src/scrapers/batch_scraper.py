@@ -0,0 +1,583 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, Any, List, Iterator, Callable, Optional, Type
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException # type: ignore
+
+from src.scrapers.crawl_store import CrawlStore
+from src.scrapers.driver_factory import create_driver, reset_driver
+from src.scrapers.host_limiter import DEFAULT_HOST_LIMITER, CircuitOpenError, is_timeout
+from src.scrapers.http_fetcher import EXPIRED, NOT_MODIFIED, HttpJobFetcher
+from src.scrapers.job_store import GALLERY_SCHEMA, JobStore
+from src.scrapers.waits import DEFAULT_WAIT_STATS
+from src.extraction.compaction import DEFAULT_COMPACTION_STATS, compact_job_data
+from src.extraction.schema import DEFAULT_PARSE_STATS
+from src.extraction.structured_data import DEFAULT_STRUCTURED_STATS
+from src.extraction.llm_cache import CACHE_MODES, get_default_cache
+from src.extraction.async_extractor import AsyncExtractor
+from src.extraction.batch_extractor import BatchExtractor
+from src.scrapers.job_app_scraper import JobScraper, deferred_result, expired_result, get_scraper_class
+from src.utils import config
+from src.utils.tracing import DEFAULT_TRACER
+
+logger = logging.getLogger(__name__)
+
+
+class DriverWorker:
+    """A long-lived webdriver slot plus the platform scrapers bound to it"""
+
+    def __init__(self, driver_factory: Callable[..., Any], headless: bool = True,
+                 http_fetcher: Optional[HttpJobFetcher] = None, cache_mode: str = config.LLM_CACHE_MODE,
+                 compact: bool = config.COMPACT_TEXT, client=None):
+        self.driver_factory = driver_factory
+        self.headless = headless
+        self.http_fetcher = http_fetcher
+        self.cache_mode = cache_mode
+        self.compact = compact
+        self.client = client
+        self.jobs_done = 0
+        self._driver = None
+        self._lock = threading.Lock()
+        self._scrapers: Dict[Type[JobScraper], JobScraper] = {}
+
+    @property
+    def driver(self):
+        """The worker's webdriver, launched on first use so HTTP-only jobs never start Chrome"""
+        with self._lock:
+            if self._driver is None:
+                with DEFAULT_TRACER.span("driver_start"):
+                    self._driver = self.driver_factory(headless=self.headless)
+            return self._driver
+
+    def prewarm(self) -> threading.Thread:
+        """Launch the webdriver in the background so the first job does not pay for Chrome startup"""
+        def launch():
+            try:
+                self.driver
+            except Exception as e:
+                logger.warning(f"Pre-warming webdriver failed, it will be launched on first use: {str(e)}")
+
+        thread = threading.Thread(target=launch, daemon=True)
+        thread.start()
+        return thread
+
+    def reset(self) -> None:
+        """Clear cookies, storage and extra tabs left by the last job; a browser that fails to reset is quit"""
+        if self._driver is None:
+            return
+        try:
+            reset_driver(self._driver)
+        except Exception as e:
+            logger.warning(f"Resetting webdriver failed, relaunching it on next use: {str(e)}")
+            self.quit()
+
+    def get_driver(self):
+        return self.driver
+
+    def scraper_for(self, scraper_class: Type[JobScraper]) -> JobScraper:
+        """Return a scraper of the given class that shares this worker's driver"""
+        if scraper_class not in self._scrapers:
+            # Compaction is left to fetch_one, which hashes the posting's full text first
+            self._scrapers[scraper_class] = scraper_class(driver_provider=self.get_driver,
+                                                          http_fetcher=self.http_fetcher,
+                                                          cache_mode=self.cache_mode,
+                                                          compact=False,
+                                                          client=self.client)
+        return self._scrapers[scraper_class]
+
+    def quit(self) -> None:
+        """Quit the underlying webdriver if it was launched"""
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting webdriver: {str(e)}")
+        finally:
+            self._driver = None
+
+
+class DriverPool:
+    """Fixed-size pool of reusable webdrivers shared by batch workers"""
+
+    def __init__(self, size: int, headless: bool = True,
+                 driver_factory: Optional[Callable[..., Any]] = None,
+                 recycle_after: int = config.DRIVER_RECYCLE_AFTER, cache_mode: str = config.LLM_CACHE_MODE,
+                 compact: bool = config.COMPACT_TEXT, client=None, prewarm: bool = config.DRIVER_PREWARM,
+                 reset_between_jobs: bool = config.DRIVER_RESET_BETWEEN_JOBS):
+        """
+        Args:
+            size: Maximum number of concurrently running browsers
+            headless: Run browsers in headless mode
+            driver_factory: Callable returning a new webdriver (defaults to create_driver)
+            recycle_after: Relaunch a browser after this many jobs to bound memory growth (0 disables)
+            cache_mode: LLM cache mode passed to every scraper ('use', 'refresh' or 'bypass')
+            compact: Whether fetch_one compacts posting text (off when compaction is a separate stage)
+            client: Anthropic client shared by every scraper (each builds its own from config if omitted)
+            prewarm: Launch every browser in the background now rather than on first use
+            reset_between_jobs: Clear cookies, storage and tabs after each job instead of relaunching
+        """
+        self.size = size
+        self.recycle_after = recycle_after
+        self.reset_between_jobs = reset_between_jobs
+        http_fetcher = HttpJobFetcher(pool_size=size)
+        self._workers = [DriverWorker(driver_factory or create_driver, headless, http_fetcher, cache_mode, compact,
+                                      client)
+                         for _ in range(size)]
+        # LIFO order hands out warm browsers before cold slots
+        self._idle: "queue.LifoQueue[DriverWorker]" = queue.LifoQueue()
+        for worker in reversed(self._workers):
+            self._idle.put(worker)
+        if prewarm:
+            for worker in self._workers:
+                worker.prewarm()
+
+    @contextmanager
+    def acquire(self) -> Iterator[DriverWorker]:
+        """Borrow a worker, blocking until one is free"""
+        worker = self._idle.get()
+        try:
+            yield worker
+        finally:
+            worker.jobs_done += 1
+            if self.recycle_after and worker.jobs_done >= self.recycle_after:
+                logger.info(f"Recycling webdriver after {worker.jobs_done} jobs")
+                worker.quit()
+                worker.jobs_done = 0
+            elif self.reset_between_jobs:
+                worker.reset()
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        """Quit every browser in the pool"""
+        for worker in self._workers:
+            worker.quit()
+
+
+def read_urls(path: str) -> List[str]:
+    """
+    Read job URLs from a text file (one per line), a CSV with a 'url' column,
+    such as the one written by StartupJobScraper.save_to_csv, or a gallery job
+    store directory (only its url column is read)
+
+    Args:
+        path: Path to the URL file or dataset
+
+    Returns:
+        De-duplicated list of URLs in file order
+    """
+    urls = []
+    if os.path.isdir(path):
+        urls = JobStore(path, schema=GALLERY_SCHEMA).read(columns=["url"]).column("url").to_pylist()
+        return list(dict.fromkeys(url for url in urls if url))
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                urls.append((row.get("url") or "").strip())
+        else:
+            for line in f:
+                urls.append(line.strip())
+
+    seen = set()
+    unique_urls = []
+    for url in urls:
+        if url and not url.startswith("#") and url not in seen:
+            seen.add(url)
+            unique_urls.append(url)
+    return unique_urls
+
+
+def scrape_one(pool: DriverPool, url: str, store: Optional[CrawlStore] = None) -> Optional[Dict[str, Any]]:
+    """
+    Route a URL to its platform scraper, fetch it on a pooled driver and extract it
+
+    With a crawl store, fetch and extraction outcomes are recorded and None is
+    returned instead of re-extracting a posting whose content has not changed.
+    """
+    job_data = fetch_one(pool, url, store)
+    if job_data is None or "error" in job_data:
+        return job_data
+
+    scraper_class = get_scraper_class(url)
+    with pool.acquire() as worker:
+        result = worker.scraper_for(scraper_class).process_with_llm(job_data, scraper_class.platform)
+    if store is not None:
+        store.mark_extracted(url, error=result.get("error"))
+    return result
+
+
+def fetch_one(pool: DriverPool, url: str, store: Optional[CrawlStore] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the raw job_data for a URL on a pooled driver, without LLM extraction
+
+    With a crawl store, settled postings are re-fetched conditionally (ETag /
+    Last-Modified) and the fetch is recorded; None is returned when the server
+    answers 304 or the posting was already extracted and its content hash is
+    unchanged. The hash covers the full fetched text; compaction, when the pool has it
+    on, happens afterwards. A posting whose page is gone comes back as an expired_result, and one on
+    a domain the host limiter has parked as a deferred_result, left pending in the store.
+    """
+    scraper_class = get_scraper_class(url)
+    if scraper_class is None:
+        if store is not None:
+            store.mark_fetch_failed(url, "Unsupported job platform")
+        return {"error": "Unsupported job platform", "url": url}
+
+    validators = store.validators(url) if store is not None else None
+    with pool.acquire() as worker:
+        compact = worker.compact
+        try:
+            job_data = worker.scraper_for(scraper_class).fetch_job_data(url, validators=validators)
+        except CircuitOpenError as e:
+            logger.warning(f"Deferring {url}: {str(e)}")
+            return deferred_result(url, scraper_class.platform, e)
+        except Exception as e:
+            logger.error(f"Error scraping {scraper_class.platform} job: {str(e)}")
+            if isinstance(e, WebDriverException) and not is_timeout(e):
+                # The browser itself failed: reset it now, relaunching it if it no longer responds
+                worker.reset()
+            if store is not None:
+                store.mark_fetch_failed(url, str(e))
+            return {"error": str(e), "url": url, "platform": scraper_class.platform}
+
+    status = job_data.get("status")
+    if status == EXPIRED:
+        logger.info(f"Posting {url} has expired")
+        if store is not None:
+            store.mark_expired(url)
+        return expired_result(url, scraper_class.platform)
+    if status == NOT_MODIFIED:
+        logger.info(f"Skipping unchanged posting {url} (not modified)")
+        store.mark_not_modified(url)
+        return None
+    if store is not None and not store.mark_fetched(url, job_data.get("full_text", ""), scraper_class.platform,
+                                                    job_data.get("http_validators")):
+        logger.info(f"Skipping unchanged posting {url}")
+        return None
+    if compact:
+        with DEFAULT_TRACER.span("compact"):
+            job_data = compact_job_data(job_data, stats=DEFAULT_COMPACTION_STATS)
+    return job_data
+
+
+def result_url(result: Dict[str, Any]) -> Optional[str]:
+    """URL of the posting a result is for: source_url on success, the fetched URL on errors"""
+    if "error" not in result:
+        return result.get("source_url")
+    return result.get("url") or (result.get("raw_data") or {}).get("url")
+
+
+def record_extraction(store: Optional[CrawlStore], result: Dict[str, Any]) -> None:
+    """Record an extraction-stage result in the crawl store (fetch errors were recorded by fetch_one)"""
+    if store is None:
+        return
+    if "error" in result:
+        if "raw_data" in result:
+            store.mark_extracted(result["raw_data"].get("url"), error=result["error"])
+        return
+    store.mark_extracted(result.get("source_url"))
+
+
+def result_outcome(result: Dict[str, Any]) -> str:
+    """Counter a finished result falls under: 'succeeded', 'failed', 'expired' or 'deferred'"""
+    if "error" not in result:
+        return "succeeded"
+    if result.get("deferred"):
+        return "deferred"
+    return "expired" if result.get("expired") else "failed"
+
+
+def requeue_deferred(deferred: List[Dict[str, Any]], deadline: float) -> List[str]:
+    """
+    Wait until the first parked domain among deferred results reopens and return their URLs to
+    retry (those still parked are deferred again at no cost), or [] if none reopens before deadline
+    """
+    if not deferred:
+        return []
+    reopens_at = min(result["retry_at"] for result in deferred)
+    if reopens_at > deadline:
+        logger.warning(f"Leaving {len(deferred)} postings on parked domains for the next run")
+        return []
+    wait = max(reopens_at - time.time(), 0)
+    logger.info(f"Requeueing {len(deferred)} postings on parked domains in {wait:.0f}s")
+    time.sleep(wait)
+    return [result["url"] for result in deferred]
+
+
+def plan_urls(urls: List[str], store: Optional[CrawlStore], counts: Dict[str, int]) -> List[str]:
+    """Drop URLs the crawl store says are already done, adding skipped/unchanged counters"""
+    if store is None:
+        return urls
+    due = store.due_urls(urls)
+    counts.update(skipped=len(urls) - len(due), unchanged=0)
+    logger.info(f"Resuming: {counts['skipped']} postings already processed, {len(due)} to go")
+    return due
+
+
+async def run_batch_async(urls: List[str], output_path: str, workers: int = config.BATCH_WORKERS,
+                          headless: bool = True, driver_factory: Optional[Callable[..., Any]] = None,
+                          extractor: Optional[AsyncExtractor] = None, ordered: bool = False,
+                          cache_mode: str = config.LLM_CACHE_MODE,
+                          store: Optional[CrawlStore] = None) -> Dict[str, int]:
+    """
+    Like run_batch, but page fetches run on the driver pool while a separate async
+    stage performs LLM extraction, so browser time and API time overlap
+
+    Args:
+        urls: Job posting URLs to scrape
+        output_path: JSONL file to append one result per line to
+        workers: Number of concurrent browsers
+        headless: Run browsers in headless mode
+        driver_factory: Callable returning a new webdriver (defaults to create_driver)
+        extractor: Extraction stage (defaults to an AsyncExtractor built from config)
+        ordered: Write results in input order instead of completion order
+        cache_mode: LLM cache mode ('use', 'refresh' or 'bypass')
+        store: Crawl state; already-processed and unchanged postings are skipped
+
+    Returns:
+        Counts of successful, failed, expired and deferred jobs, plus skipped and unchanged ones with a store
+    """
+    if extractor is None:
+        extractor = AsyncExtractor(cache=None if cache_mode == "bypass" else get_default_cache(),
+                                   cache_mode=cache_mode)
+    counts = {"succeeded": 0, "failed": 0, "expired": 0, "deferred": 0}
+    urls = plan_urls(urls, store, counts)
+    pool = DriverPool(workers, headless=headless, driver_factory=driver_factory, cache_mode=cache_mode)
+    loop = asyncio.get_running_loop()
+
+    async def scraped():
+        remaining, deadline = urls, None
+        while remaining:
+            deferred = []
+            pending = [loop.run_in_executor(executor, fetch_one, pool, url, store) for url in remaining]
+            for future in (pending if ordered else asyncio.as_completed(pending)):
+                job_data = await future
+                if job_data is None:
+                    counts["unchanged"] += 1
+                    continue
+                if job_data.get("deferred"):
+                    deferred.append(job_data)
+                    continue
+                yield job_data
+
+            # Postings on parked domains go round again once their domain reopens
+            counts["deferred"] = len(deferred)
+            if deferred and deadline is None:
+                deadline = time.time() + config.HOST_REQUEUE_MAX_WAIT
+            remaining = await loop.run_in_executor(None, requeue_deferred, deferred, deadline)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor, open(output_path, "a") as out:
+            async for result in extractor.extract_stream(scraped(), ordered=ordered):
+                record_extraction(store, result)
+                counts[result_outcome(result)] += 1
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        pool.close()
+
+    return counts
+
+
+def run_batch_backfill(urls: List[str], output_path: str, workers: int = config.BATCH_WORKERS,
+                       headless: bool = True, driver_factory: Optional[Callable[..., Any]] = None,
+                       extractor: Optional[BatchExtractor] = None,
+                       cache_mode: str = config.LLM_CACHE_MODE,
+                       store: Optional[CrawlStore] = None) -> Dict[str, int]:
+    """
+    Scrape postings on the driver pool, then extract them through the Message Batches API.
+    URLs already submitted in a checkpointed batch are not re-scraped; their pending
+    batches are polled and collected instead.
+
+    Args:
+        urls: Job posting URLs to scrape
+        output_path: JSONL file to append results to as each batch is collected
+        workers: Number of concurrent browsers
+        headless: Run browsers in headless mode
+        driver_factory: Callable returning a new webdriver (defaults to create_driver)
+        extractor: Batch extraction backend (defaults to a BatchExtractor built from config)
+        cache_mode: LLM cache mode ('use', 'refresh' or 'bypass')
+        store: Crawl state; already-processed and unchanged postings are skipped
+
+    Returns:
+        Counts of successful, failed, expired and deferred jobs, plus skipped and unchanged ones with a store
+    """
+    if extractor is None:
+        extractor = BatchExtractor(cache=None if cache_mode == "bypass" else get_default_cache(),
+                                   cache_mode=cache_mode)
+    counts = {"succeeded": 0, "failed": 0, "expired": 0, "deferred": 0}
+    known = extractor.known_urls()
+    to_scrape = plan_urls([url for url in urls if url not in known], store, counts)
+    logger.info(f"{len(urls) - len(to_scrape)} postings already submitted or processed, scraping {len(to_scrape)}")
+
+    pool = DriverPool(workers, headless=headless, driver_factory=driver_factory, cache_mode=cache_mode)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor, open(output_path, "a") as out:
+            contents, deadline = [], None
+            while to_scrape:
+                deferred = []
+                for job_data in executor.map(lambda url: fetch_one(pool, url, store), to_scrape):
+                    if job_data is None:
+                        counts["unchanged"] += 1
+                    elif job_data.get("deferred"):
+                        deferred.append(job_data)
+                    else:
+                        contents.append(job_data)
+
+                # Postings on parked domains go round again once their domain reopens
+                counts["deferred"] = len(deferred)
+                if deferred and deadline is None:
+                    deadline = time.time() + config.HOST_REQUEUE_MAX_WAIT
+                to_scrape = requeue_deferred(deferred, deadline)
+            pool.close()
+
+            def write(results: Dict[str, Dict[str, Any]]) -> None:
+                for result in results.values():
+                    record_extraction(store, result)
+                    counts[result_outcome(result)] += 1
+                    out.write(json.dumps(result) + "\n")
+                out.flush()
+
+            extractor.run(contents, on_results=write)
+    finally:
+        pool.close()
+
+    return counts
+
+
+def run_batch(urls: List[str], output_path: str, workers: int = config.BATCH_WORKERS,
+              headless: bool = True, driver_factory: Optional[Callable[..., Any]] = None,
+              cache_mode: str = config.LLM_CACHE_MODE, store: Optional[CrawlStore] = None,
+              client=None) -> Dict[str, int]:
+    """
+    Scrape many job URLs across a pool of long-lived drivers, streaming results to JSONL
+
+    Args:
+        urls: Job posting URLs to scrape
+        output_path: JSONL file to append one result per line to, as results finish
+        workers: Number of concurrent browsers
+        headless: Run browsers in headless mode
+        driver_factory: Callable returning a new webdriver (defaults to create_driver)
+        cache_mode: LLM cache mode ('use', 'refresh' or 'bypass')
+        store: Crawl state; already-processed and unchanged postings are skipped, so an
+            interrupted run resumes where it stopped
+        client: Anthropic client for extraction (each scraper builds its own from config if omitted)
+
+    Returns:
+        Counts of successful, failed, expired and deferred jobs, plus skipped and unchanged ones with a store
+    """
+    counts = {"succeeded": 0, "failed": 0, "expired": 0, "deferred": 0}
+    urls = plan_urls(urls, store, counts)
+    pool = DriverPool(workers, headless=headless, driver_factory=driver_factory, cache_mode=cache_mode,
+                      client=client)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor, open(output_path, "a") as out:
+            deadline = None
+            while urls:
+                deferred = []
+                futures = {executor.submit(scrape_one, pool, url, store): url for url in urls}
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Error scraping {url}: {str(e)}")
+                        result = {"error": str(e), "url": url}
+
+                    if result is None:
+                        counts["unchanged"] += 1
+                        continue
+                    if result.get("deferred"):
+                        deferred.append(result)
+                        continue
+                    counts[result_outcome(result)] += 1
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+
+                # Postings on parked domains go round again once their domain reopens
+                counts["deferred"] = len(deferred)
+                if deferred and deadline is None:
+                    deadline = time.time() + config.HOST_REQUEUE_MAX_WAIT
+                urls = requeue_deferred(deferred, deadline)
+    finally:
+        pool.close()
+
+    return counts
+
+
+def main():
+    """Run batch scraping over a file of job URLs"""
+    parser = argparse.ArgumentParser(description="Batch scrape job postings from Ashby, Lever and Greenhouse")
+    parser.add_argument('input', type=str, help='Text file with one URL per line, or a CSV with a url column')
+    parser.add_argument('--workers', type=int, default=config.BATCH_WORKERS,
+                        help=f'Number of concurrent browsers (default: {config.BATCH_WORKERS})')
+    parser.add_argument('--output', type=str, default='job_data.jsonl',
+                        help='JSONL output file path (default: job_data.jsonl)')
+    parser.add_argument('--headless', action='store_true', default=True,
+                        help='Run browsers in headless mode (default: True)')
+    parser.add_argument('--cache-mode', choices=CACHE_MODES, default=config.LLM_CACHE_MODE,
+                        help='LLM extraction cache: use, refresh (re-extract and overwrite) or bypass')
+    parser.add_argument('--async-llm', action='store_true',
+                        help='Run LLM extraction as a separate rate-limited async stage overlapping page fetches')
+    parser.add_argument('--ordered', action='store_true',
+                        help='With --async-llm, write results in input order')
+    parser.add_argument('--batch-api', action='store_true',
+                        help='Extract through the Message Batches API (cheaper, resumable, not real-time)')
+    parser.add_argument('--state', type=str, default=config.CRAWL_STORE_PATH,
+                        help=f'Crawl state database used to resume and skip unchanged postings '
+                             f'(default: {config.CRAWL_STORE_PATH})')
+    parser.add_argument('--no-state', action='store_true',
+                        help='Process every URL without reading or writing crawl state')
+    parser.add_argument('--trace', type=str, default=config.TRACE_PATH,
+                        help='Append per-stage timing spans to this JSONL file (default: TRACE_PATH)')
+    args = parser.parse_args()
+    if args.trace:
+        DEFAULT_TRACER.open(args.trace)
+
+    urls = read_urls(args.input)
+    store = None if args.no_state else CrawlStore(args.state)
+    print(f"Scraping {len(urls)} job postings with {args.workers} workers...")
+
+    try:
+        if args.batch_api:
+            counts = run_batch_backfill(urls, args.output, workers=args.workers, headless=args.headless,
+                                        cache_mode=args.cache_mode, store=store)
+        elif args.async_llm:
+            counts = asyncio.run(run_batch_async(urls, args.output, workers=args.workers, headless=args.headless,
+                                                 ordered=args.ordered, cache_mode=args.cache_mode, store=store))
+        else:
+            counts = run_batch(urls, args.output, workers=args.workers, headless=args.headless,
+                               cache_mode=args.cache_mode, store=store)
+    finally:
+        if store is not None:
+            logger.info(f"Crawl state: {store.stats()}")
+            store.close()
+    print(f"Scraped {counts['succeeded']} jobs successfully, {counts['failed']} failed, {counts['expired']} expired, "
+          f"{counts['deferred']} deferred (domain parked)")
+    if store is not None:
+        print(f"Skipped {counts['skipped']} already processed and {counts['unchanged']} unchanged postings")
+    DEFAULT_HOST_LIMITER.log_summary()
+    DEFAULT_WAIT_STATS.log_summary()
+    DEFAULT_COMPACTION_STATS.log_summary()
+    DEFAULT_PARSE_STATS.log_summary()
+    DEFAULT_STRUCTURED_STATS.log_summary()
+    for line in DEFAULT_TRACER.format_summary():
+        print(line)
+    if args.cache_mode != "bypass":
+        logger.info(f"LLM cache: {get_default_cache().stats()}")
+    print(f"Data saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+from typing import Dict, Any, List, Optional, Iterable, Union
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from src.extraction.llm_cache import normalize_text
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# 'expired' postings answered 404/410: closed or removed, and never fetched again
+FETCH_STATUSES = ("pending", "fetched", "failed", "expired")
+# 'filtered' postings were fetched but judged irrelevant, so they were never extracted
+EXTRACT_STATUSES = ("pending", "done", "failed", "filtered")
+SETTLED_STATUSES = ("done", "filtered")
+
+# SQLite's default limit on bound parameters is 999
+_CHUNK_SIZE = 900
+
+# Columns added after the first release, created on open for older databases
+_ADDED_COLUMNS = {"etag": "TEXT", "last_modified": "TEXT"}
+
+# Counters boards render into the page that change daily without the posting changing
+VOLATILE_TEXT = re.compile(
+    r"\b(?:posted|updated)\s+(?:on\s+)?(?:\d+\+?\s+\w+\s+ago|today|yesterday)"
+    r"|\b\d[\d,]*\+?\s+(?:applicants|applications|views)\b",
+    re.IGNORECASE,
+)
+
+
+def content_hash(full_text: str) -> str:
+    """
+    Fingerprint of posting text, insensitive to cosmetic whitespace/unicode differences
+    and to volatile counters such as 'Posted 3 days ago' or '120 applicants'. Callers pass
+    the fetched text before any compaction, so an edit anywhere in the posting changes it
+    """
+    text = VOLATILE_TEXT.sub("", normalize_text(full_text))
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def _chunks(items: List[Any], size: int = _CHUNK_SIZE) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class CrawlStore:
+    """
+    Persistent crawl state: every discovered posting URL with its fetch and extraction
+    status, last-seen time and content hash.
+
+    Batch runs consult it to skip postings that were already extracted and re-extract
+    only postings whose content changed; the gallery crawl uses it to tell new cards
+    from ones seen in earlier runs. All lookups go through the url primary key or the
+    status indexes, so they stay fast at hundreds of thousands of rows.
+    """
+
+    def __init__(self, path: str = config.CRAWL_STORE_PATH, refresh_after_days: float = config.CRAWL_REFRESH_DAYS,
+                 max_attempts: int = config.CRAWL_MAX_ATTEMPTS):
+        """
+        Args:
+            path: SQLite database file (':memory:' for a throwaway store)
+            refresh_after_days: Re-fetch extracted postings older than this to detect changes (0 never re-fetches)
+            max_attempts: Stop retrying a posting after this many consecutive failures
+        """
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.refresh_seconds = refresh_after_days * 86400
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                url TEXT PRIMARY KEY,
+                source TEXT,
+                platform TEXT,
+                title TEXT,
+                company_info TEXT,
+                discovered_at REAL NOT NULL,
+                last_seen_at REAL NOT NULL,
+                fetch_status TEXT NOT NULL DEFAULT 'pending',
+                fetched_at REAL,
+                content_hash TEXT,
+                extract_status TEXT NOT NULL DEFAULT 'pending',
+                extracted_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                etag TEXT,
+                last_modified TEXT
+            ) WITHOUT ROWID
+        """)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(postings)")}
+        for column, kind in _ADDED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE postings ADD COLUMN {column} {kind}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_postings_fetch ON postings(fetch_status)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_postings_extract ON postings(extract_status, fetched_at)")
+        self._conn.commit()
+
+    def add_urls(self, entries: Iterable[Union[str, Dict[str, Any]]], source: Optional[str] = None) -> List[str]:
+        """
+        Record discovered postings, refreshing last_seen_at for ones already known
+
+        Args:
+            entries: URLs, or dicts with a url key and optional title/company_info
+                (such as the cards yielded by StartupJobScraper.iter_new_jobs)
+            source: Where the URLs were discovered, e.g. 'startups.gallery'
+
+        Returns:
+            URLs that were not in the store before, in input order
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            entry = {"url": entry} if isinstance(entry, str) else entry
+            if entry.get("url") and entry["url"] not in rows:
+                rows[entry["url"]] = entry
+
+        now = time.time()
+        with self._lock:
+            known = set()
+            for chunk in _chunks(list(rows)):
+                placeholders = ",".join("?" * len(chunk))
+                known.update(row[0] for row in self._conn.execute(
+                    f"SELECT url FROM postings WHERE url IN ({placeholders})", chunk))
+
+            new_urls = [url for url in rows if url not in known]
+            self._conn.executemany(
+                "INSERT INTO postings (url, source, title, company_info, discovered_at, last_seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(url, source, rows[url].get("title"), rows[url].get("company_info"), now, now) for url in new_urls]
+            )
+            self._conn.executemany("UPDATE postings SET last_seen_at = ? WHERE url = ?",
+                                   [(now, url) for url in known])
+            self._conn.commit()
+        return new_urls
+
+    def due_urls(self, urls: Iterable[str]) -> List[str]:
+        """
+        Filter URLs down to the ones a batch run still has to process: never fetched,
+        interrupted, failed fewer than max_attempts times, or extracted longer ago
+        than refresh_after_days. Expired postings are never due. Unknown URLs are
+        added to the store.
+
+        Returns:
+            URLs to process, in input order
+        """
+        urls = list(dict.fromkeys(urls))
+        self.add_urls(urls)
+        refresh_before = time.time() - self.refresh_seconds
+
+        done = set()
+        with self._lock:
+            for chunk in _chunks(urls):
+                placeholders = ",".join("?" * len(chunk))
+                for url, fetch_status, extract_status, fetched_at, attempts in self._conn.execute(
+                        "SELECT url, fetch_status, extract_status, fetched_at, attempts FROM postings "
+                        f"WHERE url IN ({placeholders})", chunk):
+                    failed = fetch_status == "failed" or extract_status == "failed"
+                    if fetch_status == "expired":
+                        done.add(url)
+                    elif failed and attempts >= self.max_attempts:
+                        done.add(url)
+                    elif extract_status in SETTLED_STATUSES:
+                        if not (self.refresh_seconds and fetched_at < refresh_before):
+                            done.add(url)
+        return [url for url in urls if url not in done]
+
+    def frontier(self, limit: Optional[int] = None) -> List[str]:
+        """URLs discovered but not yet fetched, or failed and still retryable, oldest first"""
+        query = ("SELECT url FROM postings WHERE fetch_status = 'pending' OR extract_status = 'pending' "
+                 "OR ((fetch_status = 'failed' OR extract_status = 'failed') AND attempts < ?) "
+                 "ORDER BY discovered_at")
+        params: List[Any] = [self.max_attempts]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, params)]
+
+    def validators(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        HTTP validators (etag, last_modified) saved from the last fetch of a settled posting,
+        for a conditional re-fetch; None if there are none or the posting still needs work
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM postings WHERE url = ? AND fetch_status = 'fetched' "
+                f"AND extract_status IN ({','.join('?' * len(SETTLED_STATUSES))})",
+                (url, *SETTLED_STATUSES)).fetchone()
+        if row is None or not (row[0] or row[1]):
+            return None
+        return {key: value for key, value in zip(("etag", "last_modified"), row) if value}
+
+    def mark_fetched(self, url: str, full_text: str, platform: Optional[str] = None,
+                     validators: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Record a successful fetch
+
+        Args:
+            url: Posting URL
+            full_text: Fetched posting text, fingerprinted with content_hash
+            platform: Job board of the posting
+            validators: etag/last_modified of the response, sent back on the next fetch
+
+        Returns:
+            True if the posting needs extraction: its content hash changed or it was
+            never successfully extracted (or filtered out)
+        """
+        digest = content_hash(full_text)
+        validators = validators or {}
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content_hash, extract_status FROM postings WHERE url = ?",
+                                     (url,)).fetchone()
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO postings (url, discovered_at, last_seen_at) VALUES (?, ?, ?)", (url, now, now))
+            changed = row is None or row[0] != digest or row[1] not in SETTLED_STATUSES
+            self._conn.execute(
+                "UPDATE postings SET fetch_status = 'fetched', fetched_at = ?, last_seen_at = ?, content_hash = ?, "
+                "platform = COALESCE(?, platform), extract_status = CASE WHEN ? THEN 'pending' ELSE extract_status END, "
+                "attempts = 0, last_error = NULL, etag = ?, last_modified = ? WHERE url = ?",
+                (now, now, digest, platform, changed, validators.get("etag"), validators.get("last_modified"), url)
+            )
+            self._conn.commit()
+        return changed
+
+    def mark_not_modified(self, url: str) -> None:
+        """Record a conditional re-fetch the server answered with 304: the posting stays settled"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE postings SET fetched_at = ?, last_seen_at = ?, attempts = 0, last_error = NULL "
+                               "WHERE url = ?", (now, now, url))
+            self._conn.commit()
+
+    def mark_expired(self, url: str, reason: str = "Posting expired") -> None:
+        """Record that a posting's page is gone (404/410); it is not fetched again"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO postings (url, discovered_at, last_seen_at) VALUES (?, ?, ?)", (url, now, now))
+            self._conn.execute("UPDATE postings SET fetch_status = 'expired', fetched_at = ?, last_error = ? "
+                               "WHERE url = ?", (now, reason, url))
+            self._conn.commit()
+
+    def mark_fetch_failed(self, url: str, error: str) -> None:
+        """Record a failed fetch; the posting is retried until it has failed max_attempts times"""
+        self._mark_failed(url, "fetch_status", error)
+
+    def mark_extracted(self, url: str, error: Optional[str] = None) -> None:
+        """Record the outcome of LLM extraction for a fetched posting"""
+        if error is not None:
+            self._mark_failed(url, "extract_status", error)
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE postings SET extract_status = 'done', extracted_at = ?, attempts = 0, last_error = NULL "
+                "WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def mark_filtered(self, url: str, reason: Optional[str] = None) -> None:
+        """Record that a fetched posting was judged irrelevant; it is re-filtered only if its content changes"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE postings SET extract_status = 'filtered', extracted_at = ?, last_error = ? WHERE url = ?",
+                (time.time(), reason, url))
+            self._conn.commit()
+
+    def reopen(self, urls: Iterable[str]) -> None:
+        """Return filtered postings to pending, so the next run fetches and extracts them again"""
+        urls = list(urls)
+        with self._lock:
+            for chunk in _chunks(urls):
+                placeholders = ",".join("?" * len(chunk))
+                self._conn.execute("UPDATE postings SET extract_status = 'pending', last_error = NULL "
+                                   f"WHERE extract_status = 'filtered' AND url IN ({placeholders})", chunk)
+            self._conn.commit()
+
+    def _mark_failed(self, url: str, column: str, error: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO postings (url, discovered_at, last_seen_at) VALUES (?, ?, ?)", (url, now, now))
+            self._conn.execute(
+                f"UPDATE postings SET {column} = 'failed', attempts = attempts + 1, last_error = ? WHERE url = ?",
+                (error, url))
+            self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored state of a posting, or None if it was never seen"""
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM postings WHERE url = ?", (url,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], row))
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM postings WHERE url = ?", (url,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return posting counts by fetch and extraction status"""
+        with self._lock:
+            fetch = dict(self._conn.execute("SELECT fetch_status, COUNT(*) FROM postings GROUP BY fetch_status"))
+            extract = dict(self._conn.execute("SELECT extract_status, COUNT(*) FROM postings GROUP BY extract_status"))
+        return {
+            "postings": sum(fetch.values()),
+            "fetch": {status: fetch.get(status, 0) for status in FETCH_STATUSES},
+            "extract": {status: extract.get(status, 0) for status in EXTRACT_STATUSES},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,56 @@
+"""
+JavaScript snippets that pull a scraper's whole payload in one execute_script call.
+
+Each element lookup, .text or get_attribute through Selenium is a separate WebDriver
+HTTP round trip; these scripts read everything in the page and return plain JSON.
+"""
+
+# Job cards from index offset onwards: {total, cards: [{url, title, company_info}]}.
+# Company Name divs come in (position, company info) pairs under the outermost
+# framer container around the first card.
+GALLERY_CARDS_SCRIPT = """
+const selector = arguments[0], offset = arguments[1];
+const links = document.querySelectorAll(selector);
+if (!links.length) return {total: 0, cards: []};
+let container = null;
+for (let node = links[0].parentElement; node; node = node.parentElement) {
+    if (node.tagName === 'DIV' && node.className && String(node.className).includes('framer-')) container = node;
+}
+const texts = Array.from((container || document).querySelectorAll("div[data-framer-name='Company Name']"),
+                         div => div.innerText);
+const cards = [];
+for (let i = offset; i < links.length; i++) {
+    cards.push({url: links[i].href, title: texts[2 * i] || null, company_info: texts[2 * i + 1] || null});
+}
+return {total: links.length, cards: cards};
+"""
+
+# Posting title and text: {title, document_title, text, main_content_matched, ld_json, app_data}.
+# arguments[0] is a title selector (or null), arguments[1] a list of main content
+# selectors tried in order before falling back to the body. ld_json holds the text of
+# each application/ld+json script and app_data Ashby's window.__appData (posting and
+# organization only), for structured_data to read fields from.
+POSTING_PAYLOAD_SCRIPT = """
+const titleSelector = arguments[0], contentSelectors = arguments[1] || [];
+const titleElement = titleSelector ? document.querySelector(titleSelector) : null;
+let text = null, matched = false;
+for (const selector of contentSelectors) {
+    const element = document.querySelector(selector);
+    if (element && element.innerText.trim()) {
+        text = element.innerText;
+        matched = true;
+        break;
+    }
+}
+if (text === null) text = document.body ? document.body.innerText : '';
+const appData = window.__appData;
+return {
+    title: titleElement ? titleElement.innerText : null,
+    document_title: document.title,
+    text: text,
+    main_content_matched: matched,
+    ld_json: Array.from(document.querySelectorAll('script[type="application/ld+json"]'), s => s.textContent),
+    app_data: appData && appData.posting
+        ? JSON.stringify({posting: appData.posting, organization: appData.organization || null}) : null
+};
+"""
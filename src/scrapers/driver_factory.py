@@ -0,0 +1,183 @@
+from selenium import webdriver # type: ignore
+from selenium.webdriver.chrome.service import Service # type: ignore
+from webdriver_manager.chrome import ChromeDriverManager # type: ignore
+from typing import List, Optional
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Requests a lean browser never makes: images, media, fonts and third-party trackers.
+# Scrapers only read text, and none of the supported job boards needs these to render it.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.wav",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+    "*segment.io*", "*cdn.segment.com*", "*hotjar.com*", "*fullstory.com*", "*intercom.io*",
+    "*heapanalytics.com*", "*mixpanel.com*", "*amplitude.com*", "*clarity.ms*", "*linkedin.com/px*",
+]
+
+# Chrome features that cost startup time or memory and never matter for scraping
+LEAN_DISABLED_FEATURES = [
+    "Translate", "MediaRouter", "OptimizationHints", "AutofillServerCommunication", "InterestFeedContentSuggestions",
+    "CalculateNativeWinOcclusion", "BackForwardCache", "HeavyAdIntervention",
+]
+
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--disable-renderer-backgrounding",
+    "--mute-audio",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false",
+    f"--disable-features={','.join(LEAN_DISABLED_FEATURES)}",
+]
+
+
+def build_chrome_options(headless: bool = True, user_agent: Optional[str] = DEFAULT_USER_AGENT,
+                         lean: bool = config.LEAN_BROWSER,
+                         renderer_memory_mb: int = config.RENDERER_MEMORY_MB) -> webdriver.ChromeOptions:
+    """
+    Build the Chrome options shared by all scrapers
+
+    Args:
+        headless: Run without a window
+        user_agent: User agent override (None keeps Chrome's own)
+        lean: Skip images, disable unneeded features and return from get() once the DOM is
+            ready instead of after every subresource has loaded
+        renderer_memory_mb: In lean mode, V8 heap cap per renderer (0 leaves it unbounded)
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    if user_agent:
+        options.add_argument(f"--user-agent={user_agent}")
+    if lean:
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        if renderer_memory_mb:
+            options.add_argument(f"--js-flags=--max-old-space-size={renderer_memory_mb}")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        # Waits in PageWaiter decide when content is ready, so get() need not wait for the load event
+        options.page_load_strategy = "eager"
+    return options
+
+
+def block_resources(driver, patterns: Optional[List[str]] = None) -> None:
+    """Drop matching requests in the browser's network layer through the DevTools protocol"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS if patterns is None else patterns})
+
+
+_chromedriver_lock = threading.Lock()
+_chromedriver_path: Optional[str] = None
+
+
+def _read_cached_path(cache_path: Optional[str], max_age_days: float) -> Optional[str]:
+    if not cache_path or not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(cached.get("path", "")):
+        return None
+    if max_age_days and time.time() - cached.get("resolved_at", 0) > max_age_days * 86400:
+        return None
+    return cached["path"]
+
+
+def _write_cached_path(cache_path: Optional[str], path: str) -> None:
+    if not cache_path:
+        return
+    if os.path.dirname(cache_path):
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"path": path, "resolved_at": time.time()}, f)
+    os.replace(tmp_path, cache_path)
+
+
+def resolve_chromedriver(cache_path: Optional[str] = config.CHROMEDRIVER_CACHE_PATH,
+                         max_age_days: float = config.CHROMEDRIVER_CACHE_DAYS,
+                         offline: bool = config.OFFLINE) -> str:
+    """
+    Locate the chromedriver binary without a network round trip on every launch
+
+    Resolution order: CHROMEDRIVER_PATH, the path already resolved by this process, the
+    on-disk cache (re-checked after max_age_days), then ChromeDriverManager, whose
+    result is cached. Offline, or when ChromeDriverManager cannot reach the network,
+    a stale cached path or a chromedriver on PATH is used instead.
+
+    Raises:
+        RuntimeError: If no chromedriver can be found
+    """
+    global _chromedriver_path
+    if config.CHROMEDRIVER_PATH:
+        return config.CHROMEDRIVER_PATH
+    with _chromedriver_lock:
+        if _chromedriver_path and os.path.exists(_chromedriver_path):
+            return _chromedriver_path
+
+        path = _read_cached_path(cache_path, max_age_days)
+        if path is None and not offline:
+            try:
+                path = ChromeDriverManager().install()
+                _write_cached_path(cache_path, path)
+                logger.info(f"Resolved chromedriver at {path}")
+            except Exception as e:
+                logger.warning(f"ChromeDriverManager failed, falling back to a local chromedriver: {str(e)}")
+        if path is None:
+            path = _read_cached_path(cache_path, 0) or shutil.which("chromedriver")
+        if path is None:
+            raise RuntimeError("No chromedriver found: set CHROMEDRIVER_PATH or run once online to cache it")
+
+        _chromedriver_path = path
+        return path
+
+
+def reset_driver(driver) -> None:
+    """
+    Return a reused browser to a clean state between jobs instead of relaunching it:
+    extra tabs closed, cookies and the last site's storage cleared, blank page loaded
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    origin = driver.execute_script("return window.location.origin")
+    if origin and origin.startswith("http"):
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.get("about:blank")
+
+
+def create_driver(headless: bool = True, user_agent: Optional[str] = DEFAULT_USER_AGENT,
+                  lean: bool = config.LEAN_BROWSER) -> webdriver.Chrome:
+    """Launch a new Chrome webdriver (see build_chrome_options for lean mode)"""
+    options = build_chrome_options(headless=headless, user_agent=user_agent, lean=lean)
+    service = Service(resolve_chromedriver())
+    logger.info(f"Launching {'lean ' if lean else ''}Chrome webdriver")
+    driver = webdriver.Chrome(service=service, options=options)
+    if lean:
+        block_resources(driver)
+    return driver
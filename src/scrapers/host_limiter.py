@@ -0,0 +1,313 @@
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, List, Iterator, Optional
+from urllib.parse import urlparse
+import logging
+import threading
+import time
+
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# Boards answer these when they want a client to slow down
+THROTTLE_STATUS_CODES = {403, 429}
+
+# Weights of the newest latency sample in the recent and baseline moving averages
+_RECENT_WEIGHT = 0.3
+_BASELINE_WEIGHT = 0.05
+
+
+def host_key(url: str) -> str:
+    """The domain a URL's requests are paced under: boards.greenhouse.io and boards-api.greenhouse.io share one"""
+    host = (urlparse(url).hostname or "").lower()
+    if host.replace(".", "").isdigit():
+        return host
+    return ".".join(host.split(".")[-2:])
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header in its delta-seconds form (HTTP dates are ignored)"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Whether an exception is a timeout (requests, urllib3 and Selenium name theirs *Timeout*)"""
+    return isinstance(error, TimeoutError) or "Timeout" in type(error).__name__
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a domain the circuit breaker has parked"""
+
+    def __init__(self, host: str, retry_at: float):
+        super().__init__(f"{host} is parked until {time.strftime('%H:%M:%S', time.localtime(retry_at))}")
+        self.host = host
+        self.retry_at = retry_at
+
+
+class _DomainState:
+    __slots__ = ("rate", "tokens", "updated", "recent_latency", "baseline_latency", "failures", "backoff",
+                 "trips", "open_until", "probing", "requests", "throttled", "errors")
+
+    def __init__(self, rate: float, tokens: float):
+        self.rate = rate
+        self.tokens = tokens
+        self.updated = time.monotonic()
+        self.recent_latency: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self.failures = 0
+        self.backoff = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+
+class HostLimiter:
+    """
+    Thread-safe per-domain token buckets whose rates adapt to how each job board responds,
+    with a circuit breaker in front of every domain.
+
+    Each domain starts at one request per SCRAPING_DELAY seconds. Healthy responses raise its
+    rate step by step up to max_rate; 403/429 responses and timeouts halve it (honouring
+    Retry-After, and parking the domain outright when the server asks for a long pause), and
+    rising latency trims it, so a busy board is eased off before it starts refusing. After failure_threshold consecutive failures the domain is parked for a cooldown:
+    requests to it raise CircuitOpenError so callers can requeue them, and once the cooldown is
+    over a single probe request decides whether it reopens or is parked for twice as long.
+    """
+
+    def __init__(self, delay: float = config.SCRAPING_DELAY, max_rate: float = config.HOST_MAX_RATE,
+                 min_rate: float = config.HOST_MIN_RATE, step: float = config.HOST_RATE_STEP,
+                 burst: float = config.HOST_BURST, latency_factor: float = config.HOST_LATENCY_FACTOR,
+                 failure_threshold: int = config.HOST_BREAKER_FAILURES,
+                 cooldown: float = config.HOST_BREAKER_COOLDOWN,
+                 max_cooldown: float = config.HOST_BREAKER_MAX_COOLDOWN,
+                 retry_after_park: float = config.HOST_RETRY_AFTER_PARK,
+                 unlimited_hosts: Iterable[str] = ()):
+        """
+        Args:
+            delay: Starting seconds between requests to one domain (0 starts at max_rate)
+            max_rate: Requests per second a healthy domain can ramp up to
+            min_rate: Requests per second a throttling domain is never slowed below
+            step: Requests per second added after each healthy response
+            burst: Requests a domain can take back to back after being idle
+            latency_factor: Slow down once recent latency exceeds the domain's baseline by this factor
+            failure_threshold: Consecutive failures (throttling, timeouts, 5xx, connection errors)
+                that park a domain
+            cooldown: Seconds a domain stays parked the first time
+            max_cooldown: Cap on the cooldown, which doubles each time a probe fails
+            retry_after_park: Park the domain instead of pacing it when Retry-After asks for longer
+                than this many seconds, so workers move on rather than sleep through the pause
+            unlimited_hosts: Domains (as host_key names them) that are never paced or parked
+        """
+        self.initial_rate = min(1.0 / delay, max_rate) if delay > 0 else max_rate
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, self.initial_rate)
+        self.step = step
+        self.burst = max(burst, 1.0)
+        self.latency_factor = latency_factor
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.retry_after_park = retry_after_park
+        self.unlimited_hosts = set(unlimited_hosts)
+        self._domains: Dict[str, _DomainState] = {}
+        self._condition = threading.Condition()
+
+    def _state(self, host: str) -> _DomainState:
+        state = self._domains.get(host)
+        if state is None:
+            state = self._domains[host] = _DomainState(self.initial_rate, self.burst)
+        return state
+
+    def _refill(self, state: _DomainState) -> None:
+        now = time.monotonic()
+        state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+        state.updated = now
+
+    def acquire(self, url: str) -> None:
+        """
+        Wait for the URL's domain to allow another request, then take it
+
+        Raises:
+            CircuitOpenError: The domain is parked; retry_at says when it takes requests again
+        """
+        host = host_key(url)
+        if host in self.unlimited_hosts:
+            return
+        with self._condition:
+            while True:
+                state = self._state(host)
+                now = time.monotonic()
+                if state.open_until:
+                    if now < state.open_until:
+                        raise CircuitOpenError(host, time.time() + state.open_until - now)
+                    if not state.probing:
+                        # Cooldown over: this request is the probe, the others wait for its outcome
+                        state.probing = True
+                        state.requests += 1
+                        return
+                    self._condition.wait(1.0)
+                    continue
+                self._refill(state)
+                if state.tokens >= 1:
+                    state.tokens -= 1
+                    state.requests += 1
+                    return
+                self._condition.wait((1 - state.tokens) / state.rate)
+
+    def record(self, url: str, status_code: Optional[int] = None, latency: Optional[float] = None,
+               error: Optional[BaseException] = None, retry_after: Optional[float] = None) -> None:
+        """
+        Adapt the URL's domain to the outcome of a request taken with acquire
+
+        Args:
+            url: The requested URL
+            status_code: HTTP status, if a response arrived (browser loads have none)
+            latency: Seconds the request took
+            error: Exception the request raised, if any
+            retry_after: Seconds the server asked to wait (Retry-After)
+        """
+        host = host_key(url)
+        if host in self.unlimited_hosts:
+            return
+        throttled = status_code in THROTTLE_STATUS_CODES or (error is not None and is_timeout(error))
+        failed = throttled or error is not None or (status_code is not None and status_code >= 500)
+        with self._condition:
+            state = self._state(host)
+            self._refill(state)
+            if latency is not None and not failed:
+                state.recent_latency = latency if state.recent_latency is None else \
+                    _RECENT_WEIGHT * latency + (1 - _RECENT_WEIGHT) * state.recent_latency
+                state.baseline_latency = latency if state.baseline_latency is None else \
+                    _BASELINE_WEIGHT * latency + (1 - _BASELINE_WEIGHT) * state.baseline_latency
+
+            slowing = state.recent_latency is not None and \
+                state.recent_latency > self.latency_factor * state.baseline_latency
+            if throttled:
+                state.throttled += 1
+                state.rate = max(self.min_rate, state.rate / 2)
+                if retry_after is not None and retry_after > self.retry_after_park:
+                    # A long pause parks the domain, so callers requeue its URLs instead of waiting
+                    state.trips += 1
+                    state.open_until, state.probing, state.failures = time.monotonic() + retry_after, False, 0
+                    logger.warning(f"Parking {host} for {retry_after:.0f}s as asked by Retry-After")
+                    self._condition.notify_all()
+                    return
+                # Negative tokens hold the domain back until the server's Retry-After has passed
+                state.tokens = min(state.tokens, 0.0) - (retry_after or 0.0) * state.rate
+            elif failed:
+                state.errors += 1
+                state.rate = max(self.min_rate, state.rate * 0.8)
+            elif slowing:
+                state.rate = max(self.min_rate, state.rate * 0.8)
+            else:
+                state.rate = min(self.max_rate, state.rate + self.step)
+
+            if not failed:
+                state.failures = 0
+                if state.probing:
+                    logger.info(f"{host} is healthy again, resuming requests")
+                    state.open_until, state.probing, state.backoff = 0.0, False, 0
+            else:
+                state.failures += 1
+                if state.probing or state.failures >= self.failure_threshold:
+                    cooldown = min(self.max_cooldown, self.cooldown * 2 ** state.backoff)
+                    state.backoff += 1
+                    state.trips += 1
+                    state.open_until, state.probing, state.failures = time.monotonic() + cooldown, False, 0
+                    logger.warning(f"Parking {host} for {cooldown:.0f}s after repeated failures "
+                                   f"(rate now {state.rate:.2f} requests/s)")
+            self._condition.notify_all()
+
+    def release(self, url: str) -> None:
+        """
+        Give up a request taken with acquire without recording an outcome, for failures that
+        say nothing about the domain; a probe is handed to the next request
+        """
+        host = host_key(url)
+        if host in self.unlimited_hosts:
+            return
+        with self._condition:
+            self._state(host).probing = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def request(self, url: str,
+                blame: Optional[Callable[[BaseException], bool]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        acquire, then record the outcome when the block exits; set 'status_code' and
+        'retry_after' on the yielded dict once a response arrives. An exception raised in
+        the block is recorded as a failed request and re-raised.
+
+        Args:
+            url: The requested URL
+            blame: Whether an exception raised in the block is the domain's fault (all are if
+                omitted); the others are re-raised without being recorded
+        """
+        self.acquire(url)
+        outcome: Dict[str, Any] = {}
+        started = time.monotonic()
+        try:
+            yield outcome
+        except Exception as e:
+            if blame is None or blame(e):
+                self.record(url, latency=time.monotonic() - started, error=e)
+            else:
+                self.release(url)
+            raise
+        self.record(url, outcome.get("status_code"), time.monotonic() - started,
+                    retry_after=outcome.get("retry_after"))
+
+    def retry_at(self, url: str) -> Optional[float]:
+        """Unix time a parked domain takes requests again, or None if it is not parked"""
+        with self._condition:
+            state = self._domains.get(host_key(url))
+            now = time.monotonic()
+            if state is None or state.open_until <= now:
+                return None
+            return time.time() + state.open_until - now
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return per-domain request, throttle and error counts, current rate and breaker state"""
+        with self._condition:
+            now = time.monotonic()
+            rows = []
+            for host, state in sorted(self._domains.items()):
+                if not state.open_until:
+                    breaker = "closed"
+                else:
+                    breaker = "open" if now < state.open_until else "half-open"
+                rows.append({
+                    "host": host,
+                    "requests": state.requests,
+                    "throttled": state.throttled,
+                    "errors": state.errors,
+                    "trips": state.trips,
+                    "rate": round(state.rate, 3),
+                    "latency_seconds": round(state.recent_latency, 3) if state.recent_latency is not None else None,
+                    "breaker": breaker,
+                })
+            return rows
+
+    def format_summary(self) -> List[str]:
+        """Return one human-readable line per domain"""
+        return [
+            f"Host {row['host']}: {row['requests']} requests, {row['throttled']} throttled, "
+            f"{row['errors']} errors, {row['trips']} trips, {row['rate']} requests/s, breaker {row['breaker']}"
+            for row in self.summary()
+        ]
+
+    def log_summary(self) -> None:
+        for line in self.format_summary():
+            logger.info(line)
+
+
+# Shared by every fetcher and scraper in the process, so concurrent workers pace each domain together
+DEFAULT_HOST_LIMITER = HostLimiter()
@@ -0,0 +1,262 @@
+from bs4 import BeautifulSoup # type: ignore
+from requests.adapters import HTTPAdapter # type: ignore
+from urllib3.util.retry import Retry # type: ignore
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, Any, Optional, Tuple
+import html
+import logging
+import re
+import requests # type: ignore
+
+from src.extraction.compaction import select_main_content
+from src.extraction.structured_data import fields_from_greenhouse_api, fields_from_html, fields_from_lever_api
+from src.scrapers.host_limiter import DEFAULT_HOST_LIMITER, HostLimiter, parse_retry_after
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+GREENHOUSE_API_URL = "https://boards-api.greenhouse.io/v1/boards/{board}/jobs/{job_id}"
+LEVER_API_URL = "https://api.lever.co/v0/postings/{company}/{posting_id}"
+
+# job_data["status"] markers returned instead of posting text
+NOT_MODIFIED = "not_modified"
+EXPIRED = "expired"
+# Posting pages answer these once a job is closed; the board APIs also 404 for unknown boards, so only pages count
+EXPIRED_STATUS_CODES = {404, 410}
+
+
+def html_to_text(markup: str) -> str:
+    """Convert an HTML fragment to newline-separated visible text"""
+    soup = BeautifulSoup(markup, "html.parser")
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    return soup.get_text("\n", strip=True)
+
+
+def parse_greenhouse_url(url: str) -> Optional[Tuple[str, str]]:
+    """Return (board, job_id) for a Greenhouse posting URL, or None if it cannot be parsed"""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    if "for" in query and "token" in query:
+        return query["for"][0], query["token"][0]
+
+    match = re.search(r"^/([^/]+)/jobs/(\d+)", parsed.path)
+    if match:
+        return match.group(1), match.group(2)
+    return None
+
+
+def parse_lever_url(url: str) -> Optional[Tuple[str, str]]:
+    """Return (company, posting_id) for a Lever posting URL, or None if it cannot be parsed"""
+    match = re.search(r"^/([^/]+)/([0-9a-fA-F-]{36})", urlparse(url).path)
+    if match:
+        return match.group(1), match.group(2)
+    return None
+
+
+class HttpJobFetcher:
+    """Fetches server-rendered job postings over plain HTTP, without a browser"""
+
+    def __init__(self, session: Optional[requests.Session] = None, timeout: float = config.HTTP_TIMEOUT,
+                 min_text_length: int = config.MIN_STATIC_TEXT_LENGTH, pool_size: int = 10,
+                 host_limiter: Optional[HostLimiter] = None):
+        """
+        Args:
+            session: Session to use; a pooled session with retries is created if omitted
+            timeout: Per-request timeout in seconds
+            min_text_length: Minimum characters of posting text for a fetch to count as usable
+            pool_size: Maximum keep-alive connections per host
+            host_limiter: Per-domain pacing and circuit breaker (defaults to DEFAULT_HOST_LIMITER);
+                requests to a parked domain raise host_limiter.CircuitOpenError
+        """
+        self.timeout = timeout
+        self.min_text_length = min_text_length
+        self.session = session or self._build_session(pool_size)
+        self.host_limiter = host_limiter if host_limiter is not None else DEFAULT_HOST_LIMITER
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504],
+                        allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"User-Agent": config.USER_AGENT})
+        return session
+
+    def _get(self, url: str, validators: Optional[Dict[str, str]] = None,
+             accept: Tuple[int, ...] = (200,)) -> Optional[requests.Response]:
+        """GET url, conditionally when validators are given; None unless the status is 200, 304 or in accept"""
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        try:
+            with self.host_limiter.request(url) as outcome:
+                response = self.session.get(url, timeout=self.timeout, headers=headers or None)
+                retry_after = (getattr(response, "headers", None) or {}).get("Retry-After")
+                outcome.update(status_code=response.status_code, retry_after=parse_retry_after(retry_after))
+        except requests.RequestException as e:
+            logger.warning(f"HTTP fetch failed for {url}: {str(e)}")
+            return None
+        if response.status_code == 304 and validators:
+            return response
+        if response.status_code not in accept:
+            logger.info(f"HTTP fetch for {url} returned status {response.status_code}")
+            return None
+        return response
+
+    @staticmethod
+    def _marker(url: str, platform: str, response: requests.Response) -> Optional[Dict[str, Any]]:
+        """job_data standing in for the posting when the server says it is unchanged or gone"""
+        if response.status_code == 304:
+            return {"url": url, "platform": platform, "status": NOT_MODIFIED}
+        if response.status_code in EXPIRED_STATUS_CODES:
+            return {"url": url, "platform": platform, "status": EXPIRED}
+        return None
+
+    @staticmethod
+    def _validators(response: requests.Response) -> Dict[str, str]:
+        """ETag and Last-Modified of a response, to send back on the next fetch of the posting"""
+        headers = getattr(response, "headers", None) or {}
+        validators = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        return {key: value for key, value in validators.items() if isinstance(value, str)}
+
+    def fetch(self, url: str, platform: str, validators: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a posting without a browser
+
+        Args:
+            url: Job posting URL
+            platform: 'Greenhouse' or 'Lever'
+            validators: etag/last_modified from the previous fetch; sent as conditional
+                request headers so an unchanged posting costs a 304 instead of a download
+
+        Returns:
+            job_data dict with url, job_title, full_text, platform, the fields its
+            structured data gave (structured) and the response's http_validators; a
+            dict with only url, platform and status NOT_MODIFIED or EXPIRED when the
+            server answered 304 or the page is gone; or None when the static fetch did
+            not yield usable text
+        """
+        if platform == "Greenhouse":
+            job_data = self.fetch_greenhouse_api(url, validators) or self.fetch_html(url, platform, validators)
+        elif platform == "Lever":
+            job_data = self.fetch_lever_api(url, validators) or self.fetch_html(url, platform, validators)
+        else:
+            job_data = self.fetch_html(url, platform, validators)
+
+        if job_data and job_data.get("status"):
+            return job_data
+        if not job_data or len(job_data["full_text"].strip()) < self.min_text_length:
+            return None
+        return job_data
+
+    def fetch_greenhouse_api(self, url: str, validators: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a posting from the public Greenhouse job board API"""
+        ids = parse_greenhouse_url(url)
+        if not ids:
+            return None
+        response = self._get(GREENHOUSE_API_URL.format(board=ids[0], job_id=ids[1]), validators)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            return self._marker(url, "Greenhouse", response)
+
+        try:
+            posting = response.json()
+        except ValueError:
+            return None
+
+        title = posting.get("title") or "Not found"
+        parts = [title]
+        location = (posting.get("location") or {}).get("name")
+        if location:
+            parts.append(location)
+        # The API returns the description HTML entity-escaped
+        parts.append(html_to_text(html.unescape(posting.get("content") or "")))
+
+        return {
+            "url": url,
+            "job_title": title,
+            "full_text": "\n".join(parts),
+            "platform": "Greenhouse",
+            "structured": fields_from_greenhouse_api(posting),
+            "http_validators": self._validators(response)
+        }
+
+    def fetch_lever_api(self, url: str, validators: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a posting from the public Lever postings API"""
+        ids = parse_lever_url(url)
+        if not ids:
+            return None
+        response = self._get(LEVER_API_URL.format(company=ids[0], posting_id=ids[1]), validators)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            return self._marker(url, "Lever", response)
+
+        try:
+            posting = response.json()
+        except ValueError:
+            return None
+
+        title = posting.get("text") or "Not found"
+        parts = [title]
+        categories = posting.get("categories") or {}
+        for key in ("location", "team", "department", "commitment"):
+            if categories.get(key):
+                parts.append(categories[key])
+        if posting.get("descriptionPlain"):
+            parts.append(posting["descriptionPlain"])
+        for section in posting.get("lists") or []:
+            parts.append(section.get("text", ""))
+            parts.append(html_to_text(section.get("content", "")))
+        if posting.get("additionalPlain"):
+            parts.append(posting["additionalPlain"])
+
+        return {
+            "url": url,
+            "job_title": title,
+            "full_text": "\n".join(part for part in parts if part),
+            "platform": "Lever",
+            "structured": fields_from_lever_api(posting),
+            "http_validators": self._validators(response)
+        }
+
+    def fetch_html(self, url: str, platform: str, validators: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch the posting page itself and read its server-rendered text"""
+        response = self._get(url, validators, accept=(200, *sorted(EXPIRED_STATUS_CODES)))
+        if response is None:
+            return None
+        marker = self._marker(url, platform, response)
+        if marker is not None:
+            return marker
+
+        soup = BeautifulSoup(response.text, "html.parser")
+        # JSON-LD and embedded app state live in scripts, so read them before scripts are stripped
+        structured = fields_from_html(soup)
+        for tag in soup(["script", "style", "noscript", "template"]):
+            tag.decompose()
+
+        job_title = "Not found"
+        headline = soup.select_one(".posting-headline h2")
+        if headline:
+            job_title = headline.get_text(strip=True)
+        elif soup.title and " | " in soup.title.get_text():
+            job_title = soup.title.get_text().split(" | ")[0].strip()
+        elif soup.find("h1"):
+            job_title = soup.find("h1").get_text(strip=True)
+
+        content, _ = select_main_content(soup, platform)
+        return {
+            "url": url,
+            "job_title": job_title,
+            "full_text": content.get_text("\n", strip=True),
+            "platform": platform,
+            "structured": structured,
+            "http_validators": self._validators(response)
+        }
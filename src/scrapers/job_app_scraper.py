@@ -1,18 +1,27 @@
-from selenium import webdriver # type: ignore
-from selenium.webdriver.chrome.service import Service # type: ignore
 from selenium.webdriver.common.by import By # type: ignore
-from selenium.webdriver.support.ui import WebDriverWait # type: ignore
-from selenium.webdriver.support import expected_conditions as EC # type: ignore
-from webdriver_manager.chrome import ChromeDriverManager # type: ignore
-from typing import Dict, Any, List, Optional
-import time
+from typing import Dict, Any, List, Optional, Type, Callable
 import json
 import os
-import re
+import time
 import anthropic # type: ignore
 import logging
 import argparse
 from dotenv import load_dotenv # type: ignore
+from src.scrapers.driver_factory import create_driver
+from src.scrapers.host_limiter import DEFAULT_HOST_LIMITER, CircuitOpenError, HostLimiter, is_timeout
+from src.scrapers.http_fetcher import EXPIRED, HttpJobFetcher
+from src.scrapers.job_store import JobStore
+from src.scrapers.waits import PageWaiter, WaitStats, DEFAULT_WAIT_STATS
+from src.scrapers.dom_scripts import POSTING_PAYLOAD_SCRIPT
+from src.extraction.prompts import (PROMPT_VERSION, content_request, repair_request, requested_fields,
+                                    structured_savings)
+from src.extraction.schema import ParseStats, DEFAULT_PARSE_STATS, message_output, parse_extraction_message
+from src.extraction.llm_cache import LLMCache, CACHE_MODES, cache_key, get_default_cache
+from src.extraction.structured_data import StructuredFieldStats, DEFAULT_STRUCTURED_STATS, fields_from_page_payload
+from src.extraction.compaction import (CompactionStats, DEFAULT_COMPACTION_STATS, MAIN_CONTENT_SELECTORS,
+                                       compact_job_data)
+from src.utils import config
+from src.utils.tracing import Tracer, DEFAULT_TRACER
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -21,85 +30,151 @@ load_dotenv()
 class JobScraper:
     """Base class for job scrapers with common functionality"""
     
-    def __init__(self, headless: bool = True):
-        """Initialize the job scraper with webdriver setup"""
-        options = webdriver.ChromeOptions()
-        if headless:
-            options.add_argument("--headless=new")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    platform = "Unknown"
+    # Whether postings on this platform can be read without a browser
+    supports_static_fetch = False
+    # CSS selector of the element holding the job title, if the page has one
+    title_selector: Optional[str] = None
+    
+    def __init__(self, headless: bool = True, driver=None, driver_provider: Optional[Callable[[], Any]] = None,
+                 use_http: bool = True, http_fetcher: Optional[HttpJobFetcher] = None,
+                 wait_stats: Optional[WaitStats] = None, cache: Optional[LLMCache] = None,
+                 cache_mode: str = config.LLM_CACHE_MODE, compact: bool = config.COMPACT_TEXT,
+                 compaction_stats: Optional[CompactionStats] = None, tracer: Optional[Tracer] = None,
+                 client=None, parse_stats: Optional[ParseStats] = None,
+                 host_limiter: Optional[HostLimiter] = None,
+                 structured_stats: Optional[StructuredFieldStats] = None):
+        """
+        Initialize the job scraper; the webdriver is launched lazily on first use
         
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
+        Args:
+            headless: Run a newly launched browser in headless mode
+            driver: Existing webdriver to reuse; the scraper will not quit it on close
+            driver_provider: Callable returning a shared webdriver; the scraper will not quit it on close
+            use_http: Try a plain HTTP fetch before the browser on platforms that support it
+            http_fetcher: Shared HTTP fetcher (a new pooled one is created if omitted)
+            wait_stats: Where to record page wait timings (defaults to the shared DEFAULT_WAIT_STATS)
+            cache: LLM extraction cache (defaults to the shared cache at config.LLM_CACHE_PATH)
+            cache_mode: 'use' reads and writes the cache, 'refresh' skips reads but stores
+                new results, 'bypass' ignores the cache entirely
+            compact: Strip boilerplate and cap posting text before it reaches the LLM
+            compaction_stats: Where to record before/after text sizes (defaults to DEFAULT_COMPACTION_STATS)
+            tracer: Where to record timing spans (defaults to DEFAULT_TRACER)
+            client: Anthropic client, or a stub with the same messages.create interface
+                (built from ANTHROPIC_API_KEY if omitted)
+            parse_stats: Where to record how LLM replies parsed (defaults to DEFAULT_PARSE_STATS)
+            host_limiter: Per-domain pacing and circuit breaker for page loads and HTTP fetches
+                (defaults to DEFAULT_HOST_LIMITER)
+            structured_stats: Where to record fields read from structured data and the prompt
+                tokens that saved (defaults to DEFAULT_STRUCTURED_STATS)
+        """
+        self.headless = headless
+        self._driver = driver
+        self._driver_provider = driver_provider
+        self._owns_driver = driver is None and driver_provider is None
+        self.use_http = use_http
+        self.http_fetcher = http_fetcher
+        self.host_limiter = host_limiter if host_limiter is not None else DEFAULT_HOST_LIMITER
+        if self.supports_static_fetch and use_http and http_fetcher is None:
+            self.http_fetcher = HttpJobFetcher(host_limiter=self.host_limiter)
+        self.wait_stats = wait_stats if wait_stats is not None else DEFAULT_WAIT_STATS
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}, got {cache_mode!r}")
+        self.cache_mode = cache_mode
+        self._cache = cache
+        self.compact = compact
+        self.compaction_stats = compaction_stats if compaction_stats is not None else DEFAULT_COMPACTION_STATS
+        self.tracer = tracer if tracer is not None else DEFAULT_TRACER
+        self.parse_stats = parse_stats if parse_stats is not None else DEFAULT_PARSE_STATS
+        self.structured_stats = structured_stats if structured_stats is not None else DEFAULT_STRUCTURED_STATS
+        self.repair_attempts = config.LLM_REPAIR_ATTEMPTS
         
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            logger.warning("ANTHROPIC_API_KEY not found in environment variables!")
-        self.client = anthropic.Anthropic(api_key=api_key) if api_key else None
+        if client is None:
+            api_key = os.environ.get("ANTHROPIC_API_KEY")
+            if not api_key:
+                logger.warning("ANTHROPIC_API_KEY not found in environment variables!")
+            client = anthropic.Anthropic(api_key=api_key) if api_key else None
+        self.client = client
+
+    @property
+    def driver(self):
+        """The webdriver, launched on first access"""
+        if self._driver is None:
+            if self._driver_provider is not None:
+                return self._driver_provider()
+            with self.tracer.span("driver_start", platform=self.platform):
+                self._driver = create_driver(headless=self.headless)
+        return self._driver
+
+    @property
+    def cache(self) -> Optional[LLMCache]:
+        """The LLM extraction cache, or None when bypassed"""
+        if self.cache_mode == "bypass":
+            return None
+        if self._cache is None:
+            self._cache = get_default_cache()
+        return self._cache
+
+    def waiter(self) -> PageWaiter:
+        """Return a readiness waiter bound to this platform's latency budget"""
+        return PageWaiter(self.driver, self.platform, self.wait_stats, tracer=self.tracer)
+
+    def load_page(self, url: str) -> None:
+        """
+        Navigate the webdriver to url, timed as a page_load span and paced per domain. Only
+        timeouts count against the domain; other driver errors (a crashed or disconnected
+        browser) are the browser's fault and are left to the driver reset
+
+        Raises:
+            CircuitOpenError: The URL's domain is parked after repeated failures
+        """
+        # Launch the browser first, so a failed or slow start is not blamed on the job board's domain
+        driver = self.driver
+        with self.tracer.span("page_load"), self.host_limiter.request(url, blame=is_timeout):
+            driver.get(url)
+
+    def extract_page_payload(self) -> Dict[str, Any]:
+        """
+        Read the title and posting text in a single injected script instead of one
+        WebDriver round trip per element
+        
+        Returns:
+            Dict with title (None if title_selector did not match), document_title,
+            text (main content region, or the whole body), main_content_matched, and the
+            page's ld_json scripts and Ashby app_data for structured_data
+        """
+        with self.tracer.span("dom_extract"):
+            return self.driver.execute_script(POSTING_PAYLOAD_SCRIPT, self.title_selector,
+                                              MAIN_CONTENT_SELECTORS.get(self.platform, []))
 
     def get_page_text(self) -> str:
-        """Extract all visible text from the page"""
-        return self.driver.find_element(By.TAG_NAME, "body").text
+        """Extract visible text from the posting's main content region, or the whole page"""
+        return self.extract_page_payload()["text"]
     
     def process_with_llm(self, content: Dict[str, Any], platform: str) -> Dict[str, Any]:
         """Process job content with Claude to extract structured data"""
+        cache = self.cache
+        key = cache_key(content.get('full_text', ''), platform)
+        if cache is not None and self.cache_mode == "use":
+            with self.tracer.span("llm_cache_lookup", url=content.get('url'), platform=platform) as span:
+                cached = cache.get(key)
+                span.set(hit=cached is not None)
+            if cached is not None:
+                logger.info(f"LLM cache hit for {content.get('url')}")
+                cached['source_url'] = content.get('url')
+                return cached
+        
         if not self.client:
             logger.error("Anthropic API key not configured")
             return {"error": "LLM client not configured", "raw_data": content}
         
-        prompt = f"""
-        Extract structured information from this {platform} job posting.
-        
-        JOB POSTING CONTENT:
-        {content.get('full_text', '')}
-        
-        Return a JSON object with these fields:
-        - job_title: The exact title of the position
-        - company_name: Name of the hiring company
-        - location: Where the job is located (include if remote)
-        - employment_type: Full-time, Part-time, Contract, etc.
-        - department: Which department the role belongs to
-        - application_deadline: The deadline to apply if specified
-        - compensation: Salary range and compensation details
-        - required_skills: List of required skills
-        - experience_level: Junior, Mid, Senior, Lead, etc.
-        - job_description: A 2-3 sentence summary of the role
-        - responsibilities: List of key responsibilities
-        - qualifications: List of required qualifications
-        - benefits: List of benefits mentioned
-        - good_fit_indicators: List of traits that make someone a good fit
-        - poor_fit_indicators: List of traits that would make someone a poor fit
-        - application_instructions: How to apply
-        - source_url: {content.get('url', 'Not provided')}
-        - platform: {platform}
-        
-        Only include fields where information is explicitly provided. Use null for missing information.
-        """
-        
         try:
-            response = self.client.messages.create(
-                model="claude-3-7-sonnet-20250219",
-                max_tokens=2000,
-                temperature=0,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            result_text = response.content[0].text
-            json_match = re.search(r'```json\n(.*?)\n```', result_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                json_str = result_text
-            
-            # Clean up and parse JSON
-            json_str = json_str.strip()
-            structured_data = json.loads(json_str)
+            response = self._create("llm", content, platform, content_request(content, platform))
+            self.structured_stats.record(platform, *structured_savings(content, platform))
+            structured_data = self.parse_with_repair(response, content, platform)
             
-            # Add source URL if not included
-            if 'source_url' not in structured_data:
-                structured_data['source_url'] = content.get('url')
-            if 'platform' not in structured_data:
-                structured_data['platform'] = platform
+            if cache is not None:
+                cache.put(key, structured_data, platform=platform, prompt_version=PROMPT_VERSION)
                 
             return structured_data
             
@@ -107,110 +182,203 @@ class JobScraper:
             logger.error(f"Error processing with LLM: {str(e)}")
             return {"error": str(e), "raw_data": content}
     
-    def close(self):
-        """Close the webdriver"""
-        if hasattr(self, 'driver') and self.driver:
-            self.driver.quit()
+    def _create(self, stage: str, content: Dict[str, Any], platform: str, request: Dict[str, Any]):
+        started = time.monotonic()
+        with self.tracer.span(stage, url=content.get('url'), platform=platform) as span:
+            response = self.client.messages.create(**request)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                span.set(input_tokens=usage.input_tokens, output_tokens=usage.output_tokens)
+        if usage is not None and stage == "llm":
+            self.structured_stats.observe(usage.output_tokens, time.monotonic() - started)
+        return response
+    
+    def parse_with_repair(self, response, content: Dict[str, Any], platform: str) -> Dict[str, Any]:
+        """
+        Parse an extraction reply into a validated record; an unusable reply is sent back
+        alone to the cheap repair model instead of re-extracting the whole posting
+        
+        Raises:
+            ValueError: If the reply is still unusable after the repair attempts
+        """
+        for attempt in range(self.repair_attempts + 1):
+            try:
+                with self.tracer.span("json_parse", url=content.get('url'), platform=platform):
+                    structured_data, method = parse_extraction_message(response, content, platform)
+                self.parse_stats.record(platform, "repaired" if attempt else method)
+                return structured_data
+            except ValueError as e:
+                if attempt >= self.repair_attempts:
+                    self.parse_stats.record(platform, "failed")
+                    raise
+                logger.warning(f"Unusable extraction for {content.get('url')}, asking for a repair: {str(e)}")
+                tool_input, text = message_output(response)
+                raw_output = json.dumps(tool_input) if tool_input is not None else text
+                response = self._create("llm_repair", content, platform,
+                                        repair_request(raw_output, str(e), requested_fields(content)))
+    
+    def fetch_with_browser(self, url: str) -> Dict[str, Any]:
+        """Load the posting in the webdriver and return the raw job_data dict"""
+        raise NotImplementedError
+    
+    def fetch_job_data(self, url: str, validators: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Fetch the job_data dict (url, job_title, full_text, platform) for a posting,
+        using plain HTTP where possible and the browser otherwise, with full_text
+        compacted for the LLM when compaction is enabled
 
-class AshbyJobScraper(JobScraper):
-    """Scraper specific to Ashby job postings"""
+        Args:
+            url: Job posting URL
+            validators: etag/last_modified from the previous fetch, for a conditional HTTP request;
+                if the server reports the posting unchanged or gone, the returned dict carries a
+                status (http_fetcher.NOT_MODIFIED or EXPIRED) instead of full_text
+        """
+        with self.tracer.context(url=url, platform=self.platform), self.tracer.span("fetch"):
+            job_data = None
+            if self.supports_static_fetch and self.use_http and self.http_fetcher is not None:
+                with self.tracer.span("http_fetch") as span:
+                    job_data = self.http_fetcher.fetch(url, self.platform, validators)
+                    span.set(usable=bool(job_data))
+                    if job_data and job_data.get("status"):
+                        span.set(status=job_data["status"])
+                if job_data and job_data.get("status"):
+                    return job_data
+                if not job_data:
+                    logger.info(f"Static fetch yielded no usable text for {url}, falling back to browser")
+            if not job_data:
+                with self.tracer.span("browser_fetch"):
+                    job_data = self.fetch_with_browser(url)
+            if self.compact:
+                with self.tracer.span("compact"):
+                    job_data = compact_job_data(job_data, stats=self.compaction_stats)
+            return job_data
     
     def scrape_job(self, url: str) -> Dict[str, Any]:
-        """Scrape an Ashby job posting and extract structured data"""
-        logger.info(f"Scraping Ashby job: {url}")
+        """Scrape a job posting and extract structured data"""
+        logger.info(f"Scraping {self.platform} job: {url}")
         
         try:
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[class*='ashby-job-posting-right-pane']"))
-            )
-            time.sleep(2)  
-            
-            job_title_element = self.driver.find_element(By.CSS_SELECTOR, "div[class*='_titles_']")
-            job_title = job_title_element.text if job_title_element else "Not found"
-            
-            full_text = self.get_page_text()
-            
-            # Captured data
-            job_data = {
-                "url": url,
-                "job_title": job_title,
-                "full_text": full_text,
-                "platform": "Ashby"
-            }
-            
-            structured_data = self.process_with_llm(job_data, "Ashby")
+            job_data = self.fetch_job_data(url)
+            if job_data.get("status") == EXPIRED:
+                return expired_result(url, self.platform)
+            structured_data = self.process_with_llm(job_data, self.platform)
             return structured_data
             
+        except CircuitOpenError as e:
+            logger.warning(f"Deferring {url}: {str(e)}")
+            return deferred_result(url, self.platform, e)
         except Exception as e:
-            logger.error(f"Error scraping Ashby job: {str(e)}")
-            return {"error": str(e), "url": url, "platform": "Ashby"}
+            logger.error(f"Error scraping {self.platform} job: {str(e)}")
+            return {"error": str(e), "url": url, "platform": self.platform}
+    
+    def close(self):
+        """Close the webdriver if this scraper launched it"""
+        if self._driver is not None and self._owns_driver:
+            self._driver.quit()
+            self._driver = None
+
+class AshbyJobScraper(JobScraper):
+    """Scraper specific to Ashby job postings"""
+    
+    platform = "Ashby"
+    title_selector = "div[class*='_titles_']"
+    
+    def fetch_with_browser(self, url: str) -> Dict[str, Any]:
+        """Load an Ashby job posting and capture its title and text"""
+        self.load_page(url)
+        waiter = self.waiter()
+        waiter.element_present((By.CSS_SELECTOR, "[class*='ashby-job-posting-right-pane']"), "posting_pane")
+        # The title renders with the posting body, so it is the signal that content is ready
+        waiter.element_present((By.CSS_SELECTOR, self.title_selector), "posting_title")
+        
+        payload = self.extract_page_payload()
+        
+        # Captured data
+        return {
+            "url": url,
+            "job_title": payload["title"] or "Not found",
+            "full_text": payload["text"],
+            "platform": "Ashby",
+            "structured": fields_from_page_payload(payload)
+        }
         
 
 class GreenhouseJobScraper(JobScraper):
     """Scraper specific to Greenhouse job postings"""
     
-    def scrape_job(self, url: str) -> Dict[str, Any]:
-        """Scrape an Greenhouse job posting and extract structured data"""
-        logger.info(f"Scraping Greenhouse job: {url}")
+    platform = "Greenhouse"
+    supports_static_fetch = True
+    
+    def fetch_with_browser(self, url: str) -> Dict[str, Any]:
+        """Load a Greenhouse job posting and capture its title and text"""
+        self.load_page(url)
+        # Board pages hydrate client-side; wait for requests to settle before reading text
+        self.waiter().network_idle()
         
-        try:
-            self.driver.get(url)
-            
-            job_title = self.driver.title.split(' | ')[0] if ' | ' in self.driver.title else "Not found"
-            
-            # Get all text from the body element
-            full_text = self.driver.find_element(By.TAG_NAME, "body").text
-            
-            # Captured data
-            job_data = {
-                "url": url,
-                "job_title": job_title,
-                "full_text": full_text,
-                "platform": "Greenhouse"
-            }
-            
-            structured_data = self.process_with_llm(job_data, "Greenhouse")
-            return structured_data
-            
-        except Exception as e:
-            logger.error(f"Error scraping Greenhouse job: {str(e)}")
-            return {"error": str(e), "url": url, "platform": "Greenhouse"}
+        payload = self.extract_page_payload()
+        document_title = payload["document_title"] or ""
+        job_title = document_title.split(' | ')[0] if ' | ' in document_title else "Not found"
+        
+        # Captured data
+        return {
+            "url": url,
+            "job_title": job_title,
+            "full_text": payload["text"],
+            "platform": "Greenhouse",
+            "structured": fields_from_page_payload(payload)
+        }
         
 class LeverJobScraper(JobScraper):
     """Scraper specific to Lever job postings"""
     
-    def scrape_job(self, url: str) -> Dict[str, Any]:
-        """Scrape a Lever job posting and extract structured data"""
-        logger.info(f"Scraping Lever job: {url}")
+    platform = "Lever"
+    supports_static_fetch = True
+    title_selector = ".posting-headline h2"
+    
+    def fetch_with_browser(self, url: str) -> Dict[str, Any]:
+        """Load a Lever job posting and capture its title and text"""
+        self.load_page(url)
         
-        try:
-            self.driver.get(url)
-            
-            time.sleep(2)  # Allow dynamic content to load
-            
-            # Extract basic job information
-            job_title_element = self.driver.find_element(By.CLASS_NAME, "posting-headline")
-            job_title = job_title_element.find_element(By.TAG_NAME, "h2").text if job_title_element else "Not found"
-            
-            # Get full text content for LLM processing
-            full_text = self.get_page_text()
-            
-            # Prepare data for LLM processing
-            job_data = {
-                "url": url,
-                "job_title": job_title,
-                "full_text": full_text,
-                "platform": "Lever"
-            }
-            
-            # Process with LLM
-            structured_data = self.process_with_llm(job_data, "Lever")
-            return structured_data
-            
-        except Exception as e:
-            logger.error(f"Error scraping Lever job: {str(e)}")
-            return {"error": str(e), "url": url, "platform": "Lever"}
+        # Wait for the posting headline rather than a fixed delay
+        self.waiter().element_present((By.CLASS_NAME, "posting-headline"), "posting_headline")
+        
+        # Title and full text content for LLM processing in one round trip
+        payload = self.extract_page_payload()
+        
+        # Prepare data for LLM processing
+        return {
+            "url": url,
+            "job_title": payload["title"] or "Not found",
+            "full_text": payload["text"],
+            "platform": "Lever",
+            "structured": fields_from_page_payload(payload)
+        }
+
+
+def expired_result(url: str, platform: str) -> Dict[str, Any]:
+    """Result reported for a posting whose page is gone (closed or removed)"""
+    return {"error": "Posting expired", "expired": True, "url": url, "platform": platform}
+
+
+def deferred_result(url: str, platform: str, error: CircuitOpenError) -> Dict[str, Any]:
+    """Result reported for a posting not fetched because its domain is parked; retry it after retry_at"""
+    return {"error": str(error), "deferred": True, "retry_at": error.retry_at, "url": url, "platform": platform}
+
+
+SCRAPER_CLASSES: Dict[str, Type[JobScraper]] = {
+    "ashbyhq.com": AshbyJobScraper,
+    "lever.co": LeverJobScraper,
+    "greenhouse.io": GreenhouseJobScraper,
+}
+
+
+def get_scraper_class(url: str) -> Optional[Type[JobScraper]]:
+    """Return the scraper class that handles the given job URL, or None if unsupported"""
+    for domain, scraper_class in SCRAPER_CLASSES.items():
+        if domain in url:
+            return scraper_class
+    return None
+
 
 
 if __name__ == "__main__":
@@ -220,38 +388,65 @@ if __name__ == "__main__":
                         help='Run browser in headless mode (default: True)')
     parser.add_argument('--output', type=str, default='job_data.json',
                         help='Output file path (default: job_data.json)')
+    parser.add_argument('--browser-only', action='store_true',
+                        help='Skip the plain HTTP fetch and always load the page in Chrome')
+    parser.add_argument('--cache-mode', choices=CACHE_MODES, default=config.LLM_CACHE_MODE,
+                        help='LLM extraction cache: use, refresh (re-extract and overwrite) or bypass')
+    parser.add_argument('--store', type=str, default=config.JOB_STORE_PATH,
+                        help='Append the result to this Parquet job dataset instead of writing --output')
+    parser.add_argument('--trace', type=str, default=config.TRACE_PATH,
+                        help='Append per-stage timing spans to this JSONL file (default: TRACE_PATH)')
     args = parser.parse_args()
+    if args.trace:
+        DEFAULT_TRACER.open(args.trace)
     
     url = args.url
-    if 'ashbyhq.com' in url:
-        scraper = AshbyJobScraper(headless=args.headless)
-        scraper_name = 'Ashby'
-    elif 'lever.co' in url:
-        # When you implement the Lever scraper
-        scraper = LeverJobScraper(headless=args.headless)  # Placeholder
-        scraper_name = 'Lever'
-    elif 'greenhouse.io' in url:
-        scraper = GreenhouseJobScraper(headless=args.headless)  #
-        scraper_name = 'Greenhouse'
-    else:
+    scraper_class = get_scraper_class(url)
+    if scraper_class is None:
         logger.error(f"Unsupported job platform for URL: {url}")
         print(f"Error: Unsupported job platform for URL: {url}")
         print("Supported platforms: Ashby (ashbyhq.com), Lever (lever.co), Greenhouse (greenhouse.io)")
         exit(1)
     
+    scraper = scraper_class(headless=args.headless, use_http=not args.browser_only,
+                            cache_mode=args.cache_mode)
+    scraper_name = scraper_class.platform
+    
     try:
         logger.info(f"Scraping {scraper_name} job posting: {url}")
         job_data = scraper.scrape_job(url)
+        scraper.wait_stats.log_summary()
+        scraper.compaction_stats.log_summary()
+        scraper.parse_stats.log_summary()
+        scraper.structured_stats.log_summary()
+        scraper.tracer.log_summary()
         
-        with open(args.output, "w") as f:
-            json.dump(job_data, indent=2, fp=f)
-        logger.info(f"Job data saved to {args.output}")
+        if args.store:
+            # The dataset holds postings only; a failed scrape is reported below instead
+            if "error" not in job_data:
+                with JobStore(args.store) as job_store:
+                    job_store.append(job_data)
+            destination = args.store
+        else:
+            with open(args.output, "w") as f:
+                json.dump(job_data, indent=2, fp=f)
+            destination = args.output
         
+        if "error" in job_data:
+            outcome = "expired" if job_data.get("expired") else "deferred" if job_data.get("deferred") else "failed"
+            logger.error(f"Scraping {url} {outcome}: {job_data['error']}")
+            print(f"Failed to scrape {scraper_name} job posting ({outcome}): {job_data['error']}")
+            if not args.store:
+                print(f"Error details saved to {destination}")
+            exit(1)
+        
+        logger.info(f"Job data saved to {destination}")
         print(f"Successfully scraped {scraper_name} job posting")
-        print(f"Data saved to {args.output}")
+        print(f"Data saved to {destination}")
         
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         print(f"Error: {str(e)}")
+        exit(1)
     finally:
         scraper.close()
\ No newline at end of file
@@ -1,21 +1,17 @@
-from selenium import webdriver # type: ignore
-from selenium.webdriver.chrome.service import Service # type: ignore
 from selenium.webdriver.common.by import By # type: ignore
 from selenium.webdriver.support.ui import WebDriverWait # type: ignore
 from selenium.webdriver.support import expected_conditions as EC # type: ignore
-from webdriver_manager.chrome import ChromeDriverManager # type: ignore
-import time
 import pandas as pd # type: ignore
 from typing import List, Tuple, Dict, Any
 import argparse
 
-options = webdriver.ChromeOptions()
-service = Service(ChromeDriverManager().install())
-options.add_argument("--headless=new")
-driver = webdriver.Chrome(service=service, options=options)
+from src.scrapers.driver_factory import create_driver
+from src.scrapers.waits import PageWaiter
+
+driver = create_driver(headless=True, user_agent=None)
 
 driver.get("https://jobs.lever.co/cardless/4af33618-2c94-420c-9337-a1ea2ae92801/")
-time.sleep(3)  # Initial page load wait
+PageWaiter(driver, "Lever").element_present((By.CLASS_NAME, "posting-headline"))
 
 try:
     bodyyy = driver.find_element(By.TAG_NAME, "body").text
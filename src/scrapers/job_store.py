@@ -0,0 +1,210 @@
+from dataclasses import dataclass, asdict, is_dataclass
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+
+import pyarrow as pa # type: ignore
+import pyarrow.dataset as ds # type: ignore
+import pyarrow.parquet as pq # type: ignore
+
+from src.extraction.schema import JOB_FIELDS
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# Hive-style directories: <path>/scrape_date=2024-05-01/platform=Lever/part-....parquet
+PARTITION_SCHEMA = pa.schema([("scrape_date", pa.string()), ("platform", pa.string())])
+
+# Partition columns live in the directory names, not in the files
+GALLERY_SCHEMA = pa.schema([
+    ("url", pa.string()),
+    ("title", pa.string()),
+    ("company_info", pa.string()),
+    ("scraped_at", pa.timestamp("ms", tz="UTC")),
+])
+POSTING_SCHEMA = pa.schema(
+    [(name, pa.list_(pa.string()) if kind == "array" else pa.string())
+     for name, kind, _ in JOB_FIELDS if name != "platform"]
+    + [("scraped_at", pa.timestamp("ms", tz="UTC"))]
+)
+
+
+@dataclass
+class GalleryJob:
+    """One startups.gallery card; slotted so hundreds of thousands of them stay small"""
+
+    __slots__ = ("url", "title", "company_info")
+
+    url: str
+    title: str
+    company_info: str
+
+
+def _partition_value(value: Optional[str]) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", value) if value else "unknown"
+
+
+class JobStore:
+    """
+    Appendable Parquet dataset of scraped jobs, partitioned by scrape date and platform.
+
+    Rows are buffered per partition and written as one new file per partition on each
+    flush, so appends never rewrite earlier data. Reads go through pyarrow.dataset:
+    only the requested columns are decoded, and date/platform filters skip whole
+    directories.
+    """
+
+    def __init__(self, path: str, schema: pa.Schema = POSTING_SCHEMA,
+                 flush_rows: int = config.JOB_STORE_FLUSH_ROWS):
+        """
+        Args:
+            path: Dataset root directory
+            schema: Columns stored in each file (POSTING_SCHEMA or GALLERY_SCHEMA)
+            flush_rows: Write buffered rows once this many are pending
+        """
+        self.path = path
+        self.schema = schema
+        self.flush_rows = flush_rows
+        self.rows_written = 0
+        self.files_written = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._pending_rows = 0
+
+    def __enter__(self) -> "JobStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, row: Any, platform: Optional[str] = None, scraped_at: Optional[float] = None) -> None:
+        """
+        Buffer one row (a dict or dataclass record); keys outside the schema are ignored
+
+        Args:
+            row: Job record
+            platform: Partition value (defaults to the row's platform field)
+            scraped_at: Unix time of the scrape (defaults to now); also decides the date partition
+        """
+        row = asdict(row) if is_dataclass(row) else dict(row)
+        stamp = datetime.fromtimestamp(scraped_at if scraped_at is not None else time.time(), tz=timezone.utc)
+        row["scraped_at"] = stamp
+        key = (stamp.strftime("%Y-%m-%d"), _partition_value(platform or row.get("platform")))
+        with self._lock:
+            self._pending.setdefault(key, []).append(row)
+            self._pending_rows += 1
+            full = self._pending_rows >= self.flush_rows
+        if full:
+            self.flush()
+
+    def extend(self, rows: Iterable[Any], platform: Optional[str] = None) -> None:
+        for row in rows:
+            self.append(row, platform=platform)
+
+    def flush(self) -> int:
+        """
+        Write every buffered row, one file per partition; returns the number of rows written.
+        Rows leave the buffer only once their file is in place, so when a write fails the
+        error is raised with the unwritten rows still buffered for the next flush
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending = {key: list(rows) for key, rows in self._pending.items()}
+            written = files = 0
+            try:
+                for key, rows in pending.items():
+                    self._write_partition(key, rows)
+                    with self._lock:
+                        # Rows appended while the file was written stay buffered
+                        del self._pending[key][:len(rows)]
+                        if not self._pending[key]:
+                            del self._pending[key]
+                        self._pending_rows -= len(rows)
+                    written += len(rows)
+                    files += 1
+            finally:
+                with self._lock:
+                    self.rows_written += written
+                    self.files_written += files
+        return written
+
+    def _write_partition(self, key: Tuple[str, str], rows: List[Dict[str, Any]]) -> None:
+        scrape_date, platform = key
+        directory = os.path.join(self.path, f"scrape_date={scrape_date}", f"platform={platform}")
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+        # Dot-prefixed files are skipped by dataset discovery, so readers never see a partial file
+        tmp_path = os.path.join(directory, "." + name)
+        try:
+            pq.write_table(pa.Table.from_pylist(rows, schema=self.schema), tmp_path, compression="zstd")
+            os.replace(tmp_path, os.path.join(directory, name))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def close(self) -> None:
+        written = self.flush()
+        if written:
+            logger.info(f"Wrote {written} rows to {self.path}")
+
+    def dataset(self) -> Optional[ds.Dataset]:
+        """The files written so far as one pyarrow dataset, or None if nothing was written yet"""
+        if not os.path.isdir(self.path):
+            return None
+        return ds.dataset(self.path, format="parquet", schema=pa.unify_schemas([self.schema, PARTITION_SCHEMA]),
+                          partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"))
+
+    @staticmethod
+    def _filter(platforms: Optional[Iterable[str]], since: Optional[str], until: Optional[str]):
+        conditions = []
+        if platforms is not None:
+            conditions.append(ds.field("platform").isin([_partition_value(p) for p in platforms]))
+        if since is not None:
+            conditions.append(ds.field("scrape_date") >= since)
+        if until is not None:
+            conditions.append(ds.field("scrape_date") <= until)
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def read(self, columns: Optional[List[str]] = None, platforms: Optional[Iterable[str]] = None,
+             since: Optional[str] = None, until: Optional[str] = None) -> pa.Table:
+        """
+        Read stored rows, decoding only the requested columns (buffered rows are flushed first)
+
+        Args:
+            columns: Columns to load, partition columns included (None loads all)
+            platforms: Only these platforms
+            since: Only scrape dates on or after this YYYY-MM-DD date
+            until: Only scrape dates on or before this YYYY-MM-DD date
+        """
+        self.flush()
+        dataset = self.dataset()
+        if dataset is None:
+            schema = pa.unify_schemas([self.schema, PARTITION_SCHEMA])
+            return schema.empty_table().select(columns) if columns else schema.empty_table()
+        return dataset.to_table(columns=columns, filter=self._filter(platforms, since, until))
+
+    def iter_rows(self, columns: Optional[List[str]] = None, platforms: Optional[Iterable[str]] = None,
+                  since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Like read, but yields dicts one record batch at a time instead of loading everything"""
+        self.flush()
+        dataset = self.dataset()
+        if dataset is None:
+            return
+        for batch in dataset.to_batches(columns=columns, filter=self._filter(platforms, since, until)):
+            yield from batch.to_pylist()
+
+    def count(self, platforms: Optional[Iterable[str]] = None, since: Optional[str] = None,
+              until: Optional[str] = None) -> int:
+        self.flush()
+        dataset = self.dataset()
+        return dataset.count_rows(filter=self._filter(platforms, since, until)) if dataset is not None else 0
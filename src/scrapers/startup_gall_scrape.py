@@ -1,27 +1,59 @@
-from selenium import webdriver # type: ignore
-from selenium.webdriver.chrome.service import Service # type: ignore
 from selenium.webdriver.common.by import By # type: ignore
 from selenium.webdriver.support.ui import WebDriverWait # type: ignore
 from selenium.webdriver.support import expected_conditions as EC # type: ignore
-from webdriver_manager.chrome import ChromeDriverManager # type: ignore
-import time
-import pandas as pd # type: ignore
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional, Iterator, Callable
 import argparse
+import csv
+
+from src.scrapers.waits import PageWaiter, WaitStats, DEFAULT_WAIT_STATS
+from src.scrapers.dom_scripts import GALLERY_CARDS_SCRIPT
+from src.scrapers.crawl_store import CrawlStore
+from src.scrapers.driver_factory import create_driver
+from src.scrapers.job_app_scraper import get_scraper_class
+from src.scrapers.job_store import GALLERY_SCHEMA, GalleryJob, JobStore
+from src.utils import config
+from src.utils.tracing import Tracer, DEFAULT_TRACER
+
+JOB_CARD_SELECTOR = "a[class*='framer-1fxtycr'][class*='framer-1s7tguz']"
+LOAD_MORE_XPATH = "//p[contains(text(), 'Load More')]"
+GALLERY_SOURCE = "startups.gallery"
+GALLERY_URL = "https://startups.gallery/jobs/"
+CSV_COLUMNS = ["url", "title", "company_info"]
+
+
+def gallery_platform(url: str) -> str:
+    """Job board a gallery link points to, used as the store partition ('other' if unsupported)"""
+    scraper_class = get_scraper_class(url)
+    return scraper_class.platform if scraper_class is not None else "other"
 
 
 class StartupJobScraper:
-    def __init__(self):
-        """Initialize the job scraper with an empty job dictionary"""
-        self.organized_jobs = {}
+    def __init__(self, wait_stats: Optional[WaitStats] = None, store: Optional[CrawlStore] = None,
+                 tracer: Optional[Tracer] = None, gallery_url: str = GALLERY_URL,
+                 driver_factory: Optional[Callable[..., Any]] = None):
+        """
+        Initialize the job scraper with an empty job dictionary
+        
+        Args:
+            wait_stats: Where to record page wait timings (defaults to the shared DEFAULT_WAIT_STATS)
+            store: Crawl state; when given, iter_new_jobs records every card and yields
+                only the ones not discovered in earlier runs
+            tracer: Where to record timing spans (defaults to DEFAULT_TRACER)
+            gallery_url: Job listing page to crawl (a local copy in benchmarks)
+            driver_factory: Callable returning a new webdriver (defaults to create_driver)
+        """
+        self.organized_jobs: Dict[str, GalleryJob] = {}
+        self.gallery_url = gallery_url
+        self.driver_factory = driver_factory or create_driver
+        self.wait_stats = wait_stats if wait_stats is not None else DEFAULT_WAIT_STATS
+        self.store = store
+        self.tracer = tracer if tracer is not None else DEFAULT_TRACER
         self.setup_driver()
         
     def setup_driver(self):
         """Set up the Selenium webdriver"""
-        options = webdriver.ChromeOptions()
-        service = Service(ChromeDriverManager().install())
-        options.add_argument("--headless=new")
-        self.driver = webdriver.Chrome(service=service, options=options)
+        with self.tracer.span("driver_start", platform="StartupsGallery"):
+            self.driver = self.driver_factory(headless=True, user_agent=None)
         
     def load_more_jobs(self, num_clicks: int) -> None:
         """
@@ -32,14 +64,18 @@ class StartupJobScraper:
         """
         try:
         # Navigate to the initial page
-            self.driver.get("https://startups.gallery/jobs/")
-            time.sleep(3)  # Initial page load wait
+            with self.tracer.span("page_load", platform="StartupsGallery"):
+                self.driver.get(self.gallery_url)
+            waiter = PageWaiter(self.driver, "StartupsGallery", self.wait_stats, tracer=self.tracer)
+            waiter.element_present((By.CSS_SELECTOR, JOB_CARD_SELECTOR), "first_job_card")
             
             for i in range(num_clicks):
                 try:
-                    load_more_button = self.driver.find_element(By.XPATH, "//p[contains(text(), 'Load More')]")
+                    card_count = len(self.driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR))
+                    load_more_button = waiter.element_present((By.XPATH, LOAD_MORE_XPATH), "load_more_button")
                     load_more_button.click()
-                    time.sleep(5)
+                    # Wait until the appended cards are in the DOM instead of a fixed delay
+                    waiter.count_increased((By.CSS_SELECTOR, JOB_CARD_SELECTOR), card_count, "job_cards_appended")
 
                     positions, company_info, job_app_links = self.pull_data()
                     self.organize_data(positions, company_info, job_app_links)
@@ -53,6 +89,86 @@ class StartupJobScraper:
             print(f"Error loading initial page: {e}")
             raise
     
+    def pull_new_cards(self, offset: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Extract only the job cards appended after the first offset cards
+        
+        Args:
+            offset: Number of cards already extracted
+            
+        Returns:
+            Total card count on the page and the new cards as url/title/company_info dicts
+        """
+        with self.tracer.span("dom_extract", platform="StartupsGallery") as span:
+            payload = self.driver.execute_script(GALLERY_CARDS_SCRIPT, JOB_CARD_SELECTOR, offset)
+            span.set(cards=len(payload["cards"]))
+        return payload["total"], payload["cards"]
+    
+    def iter_new_jobs(self, num_clicks: int) -> Iterator[Dict[str, Any]]:
+        """
+        Crawl the gallery incrementally, yielding each job once as its card appears
+        
+        Unlike load_more_jobs, each click only transfers the newly appended cards, so
+        the crawl is linear in the number of cards rather than quadratic.
+        
+        Args:
+            num_clicks: Number of times to click the 'Load More' button
+            
+        Yields:
+            Dicts with url, title and company_info (only never-seen ones when a store is set)
+        """
+        with self.tracer.span("page_load", platform="StartupsGallery"):
+            self.driver.get(self.gallery_url)
+        waiter = PageWaiter(self.driver, "StartupsGallery", self.wait_stats, tracer=self.tracer)
+        waiter.element_present((By.CSS_SELECTOR, JOB_CARD_SELECTOR), "first_job_card")
+        
+        seen_urls = set()
+        offset = 0
+        for i in range(num_clicks + 1):
+            if i > 0:
+                try:
+                    load_more_button = waiter.element_present((By.XPATH, LOAD_MORE_XPATH), "load_more_button")
+                    load_more_button.click()
+                    waiter.count_increased((By.CSS_SELECTOR, JOB_CARD_SELECTOR), offset, "job_cards_appended")
+                except Exception as e:
+                    print(f"Error clicking 'Load More' button on iteration {i}: {e}")
+                    return
+            
+            offset, cards = self.pull_new_cards(offset)
+            cards = [card for card in cards if card["url"] and card["url"] not in seen_urls]
+            seen_urls.update(card["url"] for card in cards)
+            if self.store is not None:
+                new_urls = set(self.store.add_urls(cards, source=GALLERY_SOURCE))
+                cards = [card for card in cards if card["url"] in new_urls]
+            for card in cards:
+                yield card
+    
+    def stream_to_csv(self, num_clicks: int, filename: str = "startup_jobs.csv",
+                      job_store: Optional[JobStore] = None) -> int:
+        """
+        Crawl incrementally and write each job to CSV as soon as it is found
+        
+        Args:
+            num_clicks: Number of times to click the 'Load More' button
+            filename: Name of output CSV file (same columns as save_to_csv)
+            job_store: Also append each job to this gallery dataset
+            
+        Returns:
+            Number of jobs written
+        """
+        count = 0
+        with open(filename, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            for job in self.iter_new_jobs(num_clicks):
+                writer.writerow(job)
+                f.flush()
+                if job_store is not None:
+                    job_store.append(job, platform=gallery_platform(job["url"]))
+                count += 1
+        print(f"Data saved to {filename}")
+        return count
+    
     def pull_data(self) -> Tuple[List[str], List[str], List[str]]:
         """
         Extract job information from the current page
@@ -61,31 +177,16 @@ class StartupJobScraper:
             Tuple containing lists of job titles, company info, and application links
         """
         try:
-            job_elements = self.driver.find_elements(By.CSS_SELECTOR, "a[class*='framer-1fxtycr'][class*='framer-1s7tguz']")
+            # One injected script instead of a WebDriver round trip per link and per div
+            _, cards = self.pull_new_cards(0)
             
-            if not job_elements:
+            if not cards:
                 print("No job elements found")
                 return [], [], []
-
-            parent_container = job_elements[0].find_element(By.XPATH, "./ancestor::div[contains(@class, 'framer-')]")
-            company_divs = parent_container.find_elements(By.CSS_SELECTOR, "div[data-framer-name='Company Name']")
-            company_texts = [div.text for div in company_divs]
-            job_app_links = []
-
-            print(f'Length of company_texts: {len(company_texts)}')
-            print(f'Company_texts: {company_texts}')
             
-            for link in job_elements:
-                job_url = link.get_attribute("href")
-                job_app_links.append(job_url)
-            
-            positions, company_info = [], []
-            
-            for i, data in enumerate(company_texts):
-                if i % 2 == 0:
-                    positions.append(data)
-                else:
-                    company_info.append(data)
+            positions = [card["title"] for card in cards]
+            company_info = [card["company_info"] for card in cards]
+            job_app_links = [card["url"] for card in cards]
             
             return positions, company_info, job_app_links
         
@@ -104,13 +205,9 @@ class StartupJobScraper:
         """
         assert len(jobs) == len(company_info) == len(job_app_links), "Lists must have equal length"
 
-        for i in range(len(jobs)):
-            if job_app_links[i] not in self.organized_jobs:
-                url_key = job_app_links[i]
-                self.organized_jobs[url_key] = {
-                    "title": jobs[i],
-                    "company_info": company_info[i]
-                }
+        for title, info, url in zip(jobs, company_info, job_app_links):
+            if url not in self.organized_jobs:
+                self.organized_jobs[url] = GalleryJob(url, title, info)
 
     def save_to_csv(self, filename: str = "startup_jobs.csv") -> None:
         """
@@ -119,17 +216,18 @@ class StartupJobScraper:
         Args:
             filename: Name of output CSV file
         """
-        # Create a list of dictionaries with URL included as a column
-        rows = []
-        for url, data in self.organized_jobs.items():
-            row = {"url": url}
-            row.update(data)
-            rows.append(row)
-        
-        df = pd.DataFrame(rows)
-        
-        df.to_csv(filename, index=False)
+        # Rows are streamed straight from the records instead of building a DataFrame copy
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows((job.url, job.title, job.company_info) for job in self.organized_jobs.values())
         print(f"Data saved to {filename}")
+
+    def save_to_store(self, job_store: JobStore) -> None:
+        """Append the organized jobs to a gallery dataset partitioned by scrape date and platform"""
+        for job in self.organized_jobs.values():
+            job_store.append(job, platform=gallery_platform(job.url))
+        job_store.flush()
     
     def cleanup(self):
         """Close the webdriver"""
@@ -141,19 +239,45 @@ def main():
     parser = argparse.ArgumentParser(description="Scrape startup jobs from startups.gallery")
     parser.add_argument('-n', '--num_clicks', type=int, default=1,
                         help='Number of times to click "Load More" button (default: 1)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Extract only newly loaded cards per click and write them to CSV as they are found')
+    parser.add_argument('-o', '--output', type=str, default='startup_jobs.csv',
+                        help='Output CSV file (default: startup_jobs.csv)')
+    parser.add_argument('--state', type=str, default=None,
+                        help='With --stream, crawl state database; only jobs not seen in earlier runs are written')
+    parser.add_argument('--store', type=str, default=None,
+                        help='Also append jobs to this Parquet dataset, partitioned by scrape date and platform')
+    parser.add_argument('--trace', type=str, default=config.TRACE_PATH,
+                        help='Append per-stage timing spans to this JSONL file (default: TRACE_PATH)')
     args = parser.parse_args()
+    if args.trace:
+        DEFAULT_TRACER.open(args.trace)
     
     print(f"Starting job scraping with {args.num_clicks} Load More clicks...")
     
-    scraper = StartupJobScraper()
+    store = CrawlStore(args.state) if args.state else None
+    job_store = JobStore(args.store, schema=GALLERY_SCHEMA) if args.store else None
+    scraper = StartupJobScraper(store=store)
     
     try:
-        scraper.load_more_jobs(args.num_clicks)
-        scraper.save_to_csv()
+        if args.stream:
+            job_count = scraper.stream_to_csv(args.num_clicks, args.output, job_store=job_store)
+        else:
+            scraper.load_more_jobs(args.num_clicks)
+            scraper.save_to_csv(args.output)
+            if job_store is not None:
+                scraper.save_to_store(job_store)
+            job_count = len(scraper.organized_jobs)
         
-        print(f"Scraped {len(scraper.organized_jobs)} jobs successfully!")
+        print(f"Scraped {job_count} jobs successfully!")
+        for line in scraper.wait_stats.format_summary() + scraper.tracer.format_summary():
+            print(line)
     finally:
         scraper.cleanup()
+        if store is not None:
+            store.close()
+        if job_store is not None:
+            job_store.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+from selenium.common.exceptions import TimeoutException # type: ignore
+from selenium.webdriver.support.ui import WebDriverWait # type: ignore
+from selenium.webdriver.support import expected_conditions as EC # type: ignore
+from typing import Dict, Any, List, Optional, Tuple, Callable
+import logging
+import threading
+import time
+
+from src.utils import config
+from src.utils.tracing import Tracer, DEFAULT_TRACER
+
+logger = logging.getLogger(__name__)
+
+Locator = Tuple[str, str]
+
+NETWORK_STATE_SCRIPT = """
+return [document.readyState, performance.getEntriesByType('resource').length];
+"""
+
+
+class WaitStats:
+    """Thread-safe record of how long each readiness wait actually took"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations: Dict[Tuple[str, str], List[float]] = {}
+        self._timeouts: Dict[Tuple[str, str], int] = {}
+
+    def record(self, platform: str, condition: str, seconds: float, timed_out: bool = False) -> None:
+        key = (platform, condition)
+        with self._lock:
+            self._durations.setdefault(key, []).append(seconds)
+            if timed_out:
+                self._timeouts[key] = self._timeouts.get(key, 0) + 1
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return per (platform, condition) counts, mean/max seconds and timeouts"""
+        with self._lock:
+            rows = []
+            for (platform, condition), durations in sorted(self._durations.items()):
+                rows.append({
+                    "platform": platform,
+                    "condition": condition,
+                    "count": len(durations),
+                    "mean_seconds": round(sum(durations) / len(durations), 3),
+                    "max_seconds": round(max(durations), 3),
+                    "total_seconds": round(sum(durations), 3),
+                    "timeouts": self._timeouts.get((platform, condition), 0),
+                })
+            return rows
+
+    def format_summary(self) -> List[str]:
+        """Return one human-readable line per (platform, condition)"""
+        return [
+            f"Wait {row['platform']}/{row['condition']}: {row['count']} waits, "
+            f"mean {row['mean_seconds']}s, max {row['max_seconds']}s, "
+            f"total {row['total_seconds']}s, {row['timeouts']} timeouts"
+            for row in self.summary()
+        ]
+
+    def log_summary(self) -> None:
+        for line in self.format_summary():
+            logger.info(line)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._timeouts.clear()
+
+
+# Shared by all scrapers unless a scraper is given its own
+DEFAULT_WAIT_STATS = WaitStats()
+
+
+class PageWaiter:
+    """Waits on concrete page conditions within a per-platform latency budget"""
+
+    def __init__(self, driver, platform: str, stats: Optional[WaitStats] = None,
+                 timeout: Optional[float] = None, poll_interval: float = config.WAIT_POLL_INTERVAL,
+                 tracer: Optional[Tracer] = None):
+        """
+        Args:
+            driver: Selenium webdriver
+            platform: Platform name used to look up the timeout and label stats
+            stats: Where to record wait timings (defaults to DEFAULT_WAIT_STATS)
+            timeout: Override the configured per-platform timeout in seconds
+            poll_interval: Seconds between condition checks
+            tracer: Where to record wait spans (defaults to DEFAULT_TRACER)
+        """
+        self.driver = driver
+        self.platform = platform
+        self.stats = stats if stats is not None else DEFAULT_WAIT_STATS
+        self.timeout = timeout if timeout is not None else config.WAIT_TIMEOUTS.get(platform, config.DEFAULT_WAIT_TIMEOUT)
+        self.poll_interval = poll_interval
+        self.tracer = tracer if tracer is not None else DEFAULT_TRACER
+
+    def _wait(self, condition_name: str, condition: Callable[[Any], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, self.timeout, poll_frequency=self.poll_interval).until(condition)
+        except TimeoutException:
+            seconds = time.perf_counter() - start
+            self.stats.record(self.platform, condition_name, seconds, timed_out=True)
+            self.tracer.record("wait", seconds, platform=self.platform, condition=condition_name,
+                               error="TimeoutException")
+            raise
+        seconds = time.perf_counter() - start
+        self.stats.record(self.platform, condition_name, seconds)
+        self.tracer.record("wait", seconds, platform=self.platform, condition=condition_name)
+        return result
+
+    def element_present(self, locator: Locator, name: str = "element_present"):
+        """Wait until an element matching locator is in the DOM and return it"""
+        return self._wait(name, EC.presence_of_element_located(locator))
+
+    def count_increased(self, locator: Locator, previous_count: int, name: str = "count_increased") -> int:
+        """Wait until more elements match locator than previous_count and return the new count"""
+        def condition(driver):
+            count = len(driver.find_elements(*locator))
+            return count if count > previous_count else False
+        return self._wait(name, condition)
+
+    def network_idle(self, idle_ms: int = config.NETWORK_IDLE_MS, name: str = "network_idle") -> bool:
+        """
+        Wait until the document has loaded and no new resources were requested for idle_ms.
+        Returns False instead of raising if the page never settles within the budget.
+        """
+        state = {"count": -1, "since": time.perf_counter()}
+
+        def condition(driver):
+            ready_state, resource_count = driver.execute_script(NETWORK_STATE_SCRIPT)
+            now = time.perf_counter()
+            if resource_count != state["count"]:
+                state["count"], state["since"] = resource_count, now
+                return False
+            return ready_state == "complete" and (now - state["since"]) * 1000 >= idle_ms
+
+        try:
+            return self._wait(name, condition)
+        except TimeoutException:
+            logger.warning(f"{self.platform} page did not reach network idle within {self.timeout}s")
+            return False
@@ -0,0 +1,295 @@
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import time
+
+from src.scrapers.job_store import JobStore
+from src.utils import config
+
+logger = logging.getLogger(__name__)
+
+SHEETS_SCOPE = "https://www.googleapis.com/auth/spreadsheets"
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# One column per extracted field; source_url is the row key
+SHEET_COLUMNS = [
+    "source_url", "job_title", "company_name", "location", "employment_type", "department",
+    "application_deadline", "compensation", "required_skills", "experience_level", "job_description",
+    "responsibilities", "qualifications", "benefits", "good_fit_indicators", "poor_fit_indicators",
+    "application_instructions", "platform",
+]
+
+
+def column_letter(index: int) -> str:
+    """Spreadsheet column letter for a zero-based column index (0 -> A, 26 -> AA)"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def cell_value(value: Any) -> str:
+    """Render an extracted field the way it is stored in the sheet"""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "; ".join(cell_value(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True)
+    return str(value)
+
+
+def build_sheets_service(credentials_path: Optional[str] = config.GOOGLE_CREDENTIALS_PATH):
+    """Build a Sheets v4 service from a service account key file"""
+    # Imported here so the diff logic can be used and tested without the Google client installed
+    from google.oauth2 import service_account # type: ignore
+    from googleapiclient.discovery import build # type: ignore
+
+    if not credentials_path:
+        raise ValueError("GOOGLE_CREDENTIALS_PATH is not set")
+    credentials = service_account.Credentials.from_service_account_file(credentials_path, scopes=[SHEETS_SCOPE])
+    return build("sheets", "v4", credentials=credentials, cache_discovery=False)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a Sheets API error is a quota or transient server error"""
+    status = getattr(getattr(error, "resp", None), "status", None)
+    try:
+        return int(status) in RETRYABLE_STATUS_CODES
+    except (TypeError, ValueError):
+        return False
+
+
+class SheetsManager:
+    """
+    Pushes extraction results to a tracking sheet keyed by source_url.
+
+    A local snapshot of the sheet (row number and cell values per URL) is kept on disk,
+    so each sync sends only new rows (appended) and changed rows (one batchUpdate),
+    chunked to stay within the Sheets write quota.
+    """
+
+    def __init__(self, spreadsheet_id: Optional[str] = config.SHEETS_SPREADSHEET_ID,
+                 sheet_name: str = config.SHEETS_SHEET_NAME, service=None,
+                 snapshot_path: Optional[str] = config.SHEETS_SNAPSHOT_PATH,
+                 columns: Optional[List[str]] = None,
+                 max_rows_per_request: int = config.SHEETS_MAX_ROWS_PER_REQUEST,
+                 requests_per_minute: int = config.SHEETS_REQUESTS_PER_MINUTE,
+                 max_retries: int = config.SHEETS_MAX_RETRIES, base_delay: float = 1.0, max_delay: float = 64.0):
+        """
+        Args:
+            spreadsheet_id: Target spreadsheet
+            sheet_name: Tab holding the tracking table (header in row 1)
+            service: Sheets v4 service, or a fake with the same interface (built from
+                GOOGLE_CREDENTIALS_PATH if omitted)
+            snapshot_path: JSON file caching the sheet contents between runs (None keeps it in memory)
+            columns: Result fields to write, key column first (defaults to SHEET_COLUMNS)
+            max_rows_per_request: Rows per append or batchUpdate request
+            requests_per_minute: Write requests allowed per minute
+            max_retries: Retries on 429/5xx before giving up
+            base_delay: Initial backoff in seconds; doubles per attempt with full jitter
+            max_delay: Upper bound on a single backoff
+        """
+        if not spreadsheet_id:
+            raise ValueError("spreadsheet_id is required (set SHEETS_SPREADSHEET_ID)")
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self.service = service if service is not None else build_sheets_service()
+        self.snapshot_path = snapshot_path
+        self.columns = columns or list(SHEET_COLUMNS)
+        self.max_rows_per_request = max_rows_per_request
+        self.min_interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.requests = 0
+        self.retries = 0
+        self._last_request = 0.0
+        self.snapshot: Optional[Dict[str, Dict[str, Any]]] = self._load_snapshot()
+        self.next_row = 2 + len(self.snapshot) if self.snapshot is not None else 2
+
+    @property
+    def last_column(self) -> str:
+        return column_letter(len(self.columns) - 1)
+
+    def _load_snapshot(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path) as f:
+            data = json.load(f)
+        if data.get("spreadsheet_id") != self.spreadsheet_id or data.get("columns") != self.columns:
+            logger.info("Sheet snapshot is for a different sheet or layout, re-reading the sheet")
+            return None
+        return data["rows"]
+
+    def _save_snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        if os.path.dirname(self.snapshot_path):
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"spreadsheet_id": self.spreadsheet_id, "columns": self.columns, "rows": self.snapshot}, f)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _execute(self, request) -> Dict[str, Any]:
+        """Execute a Sheets request, pacing to the quota and backing off on 429/5xx"""
+        for attempt in range(self.max_retries + 1):
+            wait = self._last_request + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.monotonic()
+            self.requests += 1
+            try:
+                return request.execute()
+            except Exception as e:
+                if attempt < self.max_retries and is_retryable(e):
+                    delay = min(random.uniform(0, self.base_delay * (2 ** attempt)), self.max_delay)
+                    self.retries += 1
+                    logger.warning(f"Sheets API error (attempt {attempt + 1}), retrying in {delay:.1f}s: {str(e)}")
+                    time.sleep(delay)
+                    continue
+                raise
+
+    def refresh_snapshot(self) -> None:
+        """Re-read the whole sheet in one request, writing the header if the sheet is empty"""
+        values = self.service.spreadsheets().values()
+        response = self._execute(values.get(spreadsheetId=self.spreadsheet_id,
+                                            range=f"{self.sheet_name}!A:{self.last_column}"))
+        rows = response.get("values", [])
+        if not rows:
+            self._execute(values.update(spreadsheetId=self.spreadsheet_id, range=f"{self.sheet_name}!A1",
+                                        valueInputOption="RAW", body={"values": [self.columns]}))
+
+        self.snapshot = {}
+        for row_number, row in enumerate(rows[1:], start=2):
+            # The API trims trailing empty cells
+            row = (list(row) + [""] * len(self.columns))[:len(self.columns)]
+            if row[0]:
+                self.snapshot[row[0]] = {"row": row_number, "values": row}
+        self.next_row = max(2, len(rows) + 1)
+        self._save_snapshot()
+
+    def to_row(self, result: Dict[str, Any]) -> List[str]:
+        return [cell_value(result.get(column)) for column in self.columns]
+
+    def diff(self, results: Iterable[Dict[str, Any]]) -> Tuple[List[Tuple[int, List[str]]], List[List[str]], int]:
+        """
+        Compare results against the snapshot
+
+        Returns:
+            (updates as (row number, values), new rows to append, number of unchanged rows).
+            Error results and results without a source_url are ignored; a URL seen
+            twice keeps its last result.
+        """
+        if self.snapshot is None:
+            self.refresh_snapshot()
+
+        latest: Dict[str, List[str]] = {}
+        for result in results:
+            if "error" in result or not result.get(self.columns[0]):
+                continue
+            row = self.to_row(result)
+            latest[row[0]] = row
+
+        updates, appends, unchanged = [], [], 0
+        for key, row in latest.items():
+            existing = self.snapshot.get(key)
+            if existing is None:
+                appends.append(row)
+            elif existing["values"] != row:
+                updates.append((existing["row"], row))
+            else:
+                unchanged += 1
+        return updates, appends, unchanged
+
+    def sync(self, results: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Push new and changed results to the sheet
+
+        Returns:
+            Counts of appended, updated and unchanged rows and API requests made
+        """
+        requests_before = self.requests
+        updates, appends, unchanged = self.diff(results)
+        values = self.service.spreadsheets().values()
+
+        for start in range(0, len(updates), self.max_rows_per_request):
+            chunk = updates[start:start + self.max_rows_per_request]
+            self._execute(values.batchUpdate(spreadsheetId=self.spreadsheet_id, body={
+                "valueInputOption": "RAW",
+                "data": [{"range": f"{self.sheet_name}!A{row}:{self.last_column}{row}", "values": [row_values]}
+                         for row, row_values in chunk],
+            }))
+            for row, row_values in chunk:
+                self.snapshot[row_values[0]] = {"row": row, "values": row_values}
+            self._save_snapshot()
+
+        for start in range(0, len(appends), self.max_rows_per_request):
+            chunk = appends[start:start + self.max_rows_per_request]
+            response = self._execute(values.append(
+                spreadsheetId=self.spreadsheet_id, range=f"{self.sheet_name}!A1",
+                valueInputOption="RAW", insertDataOption="INSERT_ROWS", body={"values": chunk}))
+            first_row = self._first_row(response)
+            for offset, row_values in enumerate(chunk):
+                self.snapshot[row_values[0]] = {"row": first_row + offset, "values": row_values}
+            self.next_row = first_row + len(chunk)
+            # Saved per chunk so a failure part way through never re-appends rows already written
+            self._save_snapshot()
+
+        counts = {"appended": len(appends), "updated": len(updates), "unchanged": unchanged,
+                  "requests": self.requests - requests_before}
+        logger.info(f"Sheet sync: {counts}")
+        return counts
+
+    def _first_row(self, append_response: Dict[str, Any]) -> int:
+        """Row number of the first appended row, from the response's updatedRange (e.g. Jobs!A5:R7)"""
+        updated_range = (append_response.get("updates") or {}).get("updatedRange", "")
+        match = re.search(r"![A-Z]+(\d+)", updated_range)
+        return int(match.group(1)) if match else self.next_row
+
+
+def read_results(path: str) -> List[Dict[str, Any]]:
+    """
+    Read extraction results from a JSONL file (batch output), a JSON file (single scrape)
+    or a job store directory, of which only the sheet's columns are read
+    """
+    if os.path.isdir(path):
+        return list(JobStore(path).iter_rows(columns=SHEET_COLUMNS))
+    with open(path) as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+
+def main():
+    """Sync scrape output to the tracking sheet"""
+    parser = argparse.ArgumentParser(description="Push extracted jobs to a Google Sheet, sending only changes")
+    parser.add_argument('input', type=str,
+                        help='JSONL (batch output) or JSON (single job) results file, or a job store directory')
+    parser.add_argument('--spreadsheet-id', type=str, default=config.SHEETS_SPREADSHEET_ID,
+                        help='Target spreadsheet (default: SHEETS_SPREADSHEET_ID)')
+    parser.add_argument('--sheet', type=str, default=config.SHEETS_SHEET_NAME,
+                        help=f'Sheet tab name (default: {config.SHEETS_SHEET_NAME})')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Re-read the sheet instead of trusting the local snapshot (after manual edits)')
+    args = parser.parse_args()
+
+    manager = SheetsManager(spreadsheet_id=args.spreadsheet_id, sheet_name=args.sheet)
+    if args.refresh:
+        manager.refresh_snapshot()
+    counts = manager.sync(read_results(args.input))
+    print(f"Appended {counts['appended']}, updated {counts['updated']}, "
+          f"{counts['unchanged']} unchanged in {counts['requests']} requests")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
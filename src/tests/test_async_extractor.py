@@ -0,0 +1,155 @@
+"""
+Tests for the async LLM extraction stage, run against a local stub of the Messages API.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anthropic # type: ignore
+
+from src.extraction.async_extractor import AsyncExtractor, RateLimiter
+
+
+class StubMessagesHandler(BaseHTTPRequestHandler):
+    """Answers POST /v1/messages, optionally failing the first few requests."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            failure = server.failures.pop(0) if server.failures else None
+
+        if failure:
+            payload = json.dumps({"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}})
+            self.send_response(failure)
+        else:
+            prompt = body["messages"][0]["content"]
+            url = prompt.split("source_url: ")[1].split()[0]
+            text = "```json\n" + json.dumps({"job_title": "Engineer", "source_url": url}) + "\n```"
+            payload = json.dumps({
+                "id": "msg_stub", "type": "message", "role": "assistant", "model": body["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn", "stop_sequence": None,
+                "usage": {"input_tokens": 100, "output_tokens": 20},
+            })
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(payload.encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncExtractor(unittest.TestCase):
+    """Test cases for the AsyncExtractor class."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubMessagesHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.failures = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def _extractor(self, **kwargs):
+        client = anthropic.AsyncAnthropic(api_key="test", base_url=f"http://127.0.0.1:{self.server.server_port}",
+                                          max_retries=0)
+        options = dict(concurrency=4, requests_per_minute=6000, tokens_per_minute=10 ** 7,
+                       base_delay=0.01, max_delay=0.05, cache_mode="bypass")
+        options.update(kwargs)
+        return AsyncExtractor(client=client, **options)
+
+    def _jobs(self, n):
+        return [{"url": f"https://jobs.lever.co/acme/{i}", "job_title": "Engineer",
+                 "full_text": f"Posting {i}", "platform": "Lever"} for i in range(n)]
+
+    def test_ordered_results(self):
+        results = asyncio.run(self._extractor().extract_all(self._jobs(12), ordered=True))
+
+        self.assertEqual([r["source_url"] for r in results], [j["url"] for j in self._jobs(12)])
+        self.assertEqual(self.server.requests, 12)
+
+    def test_retries_rate_limits_and_server_errors(self):
+        self.server.failures = [429, 529, 500]
+        extractor = self._extractor(concurrency=1)
+
+        results = asyncio.run(extractor.extract_all(self._jobs(2)))
+
+        self.assertTrue(all("error" not in r for r in results))
+        self.assertEqual(extractor.retries, 3)
+        self.assertEqual(self.server.requests, 5)
+
+    def test_gives_up_after_max_retries(self):
+        self.server.failures = [429] * 10
+        results = asyncio.run(self._extractor(concurrency=1, max_retries=2).extract_all(self._jobs(1)))
+
+        self.assertIn("error", results[0])
+        self.assertEqual(self.server.requests, 3)
+
+    def test_scrape_errors_pass_through(self):
+        failed = {"error": "timeout", "url": "https://jobs.lever.co/acme/x"}
+        results = asyncio.run(self._extractor().extract_all([failed]))
+
+        self.assertEqual(results, [failed])
+        self.assertEqual(self.server.requests, 0)
+
+    def test_cache_errors_become_error_results(self):
+        class LockedCache:
+            def get(self, key):
+                raise sqlite3.OperationalError("database is locked")
+
+        extractor = self._extractor(cache=LockedCache(), cache_mode="use")
+        results = asyncio.run(asyncio.wait_for(extractor.extract_all(self._jobs(6)), timeout=10))
+
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all("database is locked" in r["error"] for r in results))
+
+    def test_failed_worker_does_not_stall_the_stream(self):
+        extractor = self._extractor(concurrency=2)
+
+        async def broken(content):
+            raise RuntimeError("worker bug")
+
+        extractor.extract = broken
+        with self.assertRaises(RuntimeError):
+            asyncio.run(asyncio.wait_for(extractor.extract_all(self._jobs(6)), timeout=10))
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the RateLimiter class."""
+
+    def test_request_budget_throttles(self):
+        async def run():
+            limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=10 ** 6)
+            limiter._requests = 0
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(3):
+                await limiter.acquire(1)
+            return loop.time() - start
+
+        # 600 rpm refills one request every 0.1s
+        self.assertGreaterEqual(asyncio.run(run()), 0.25)
+
+    def test_token_budget_throttles(self):
+        async def run():
+            limiter = RateLimiter(requests_per_minute=10 ** 6, tokens_per_minute=6000)
+            await limiter.acquire(6000)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await limiter.acquire(20)
+            return loop.time() - start
+
+        # 6000 tpm refills 100 tokens per second
+        self.assertGreaterEqual(asyncio.run(run()), 0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
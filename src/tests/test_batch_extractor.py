@@ -0,0 +1,108 @@
+"""
+Unit tests for the Message Batches extraction backend.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.extraction.batch_extractor import BatchExtractor, custom_id_for
+from src.extraction.llm_cache import LLMCache
+
+
+def job(i):
+    return {"url": f"https://jobs.lever.co/acme/{i}", "job_title": "Engineer",
+            "full_text": f"Posting {i}", "platform": "Lever"}
+
+
+class FakeBatches:
+    """In-memory stand-in for client.messages.batches."""
+
+    def __init__(self):
+        self.created = []
+        self.status = {}
+
+    def create(self, requests):
+        batch_id = f"msgbatch_{len(self.created)}"
+        self.created.append((batch_id, requests))
+        self.status[batch_id] = "in_progress"
+        return SimpleNamespace(id=batch_id)
+
+    def retrieve(self, batch_id):
+        status = self.status[batch_id]
+        self.status[batch_id] = "ended"
+        return SimpleNamespace(processing_status=status, request_counts={})
+
+    def results(self, batch_id):
+        requests = dict(self.created)[batch_id]
+        for request in requests:
+            if request["custom_id"] == custom_id_for("https://jobs.lever.co/acme/bad"):
+                result = SimpleNamespace(type="errored", error="invalid_request")
+            else:
+                text = "```json\n" + json.dumps({"job_title": "Engineer"}) + "\n```"
+                result = SimpleNamespace(type="succeeded",
+                                         message=SimpleNamespace(content=[SimpleNamespace(text=text)]))
+            yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+
+
+class TestBatchExtractor(unittest.TestCase):
+    """Test cases for the BatchExtractor class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.checkpoint = os.path.join(self.tmpdir.name, "batches.json")
+        self.batches = FakeBatches()
+        self.client = MagicMock()
+        self.client.messages.batches = self.batches
+
+    def _extractor(self, **kwargs):
+        options = dict(checkpoint_path=self.checkpoint, poll_interval=0, cache_mode="bypass")
+        options.update(kwargs)
+        return BatchExtractor(client=self.client, **options)
+
+    def test_results_mapped_back_by_source_url(self):
+        results = self._extractor(max_requests=2).run([job(i) for i in range(5)] + [job("bad")])
+
+        self.assertEqual(len(self.batches.created), 3)
+        self.assertEqual(results[job(3)["url"]]["source_url"], job(3)["url"])
+        self.assertEqual(results[job(3)["url"]]["platform"], "Lever")
+        self.assertIn("error", results[job("bad")["url"]])
+
+    def test_resume_collects_instead_of_resubmitting(self):
+        first = self._extractor()
+        first.submit([job(i) for i in range(3)])
+        # Simulate a crash before collection: a fresh extractor reads the checkpoint
+        resumed = self._extractor()
+        results = resumed.run([job(i) for i in range(4)])
+
+        self.assertEqual(len(self.batches.created), 2)
+        self.assertEqual(len(self.batches.created[1][1]), 1)
+        self.assertEqual(set(results), {job(i)["url"] for i in range(4)})
+        self.assertEqual(resumed.pending_batch_ids(), [])
+
+    def test_structured_fields_survive_the_checkpoint(self):
+        content = {**job(1), "structured": {"company_name": "Acme", "location": "Berlin"}}
+        self._extractor().submit([content])
+        params = self.batches.created[0][1][0]["params"]
+        self.assertNotIn("company_name", params["tools"][0]["input_schema"]["properties"])
+
+        results = self._extractor().run([])
+        self.assertEqual(results[content["url"]]["company_name"], "Acme")
+        self.assertEqual(results[content["url"]]["job_title"], "Engineer")
+
+    def test_cache_hits_are_not_submitted(self):
+        cache = LLMCache(":memory:")
+        self._extractor(cache=cache, cache_mode="use").run([job(1)])
+        results = self._extractor(cache=cache, cache_mode="use").run([job(1), job(2)])
+
+        submitted = [r["custom_id"] for _, requests in self.batches.created for r in requests]
+        self.assertEqual(submitted, [custom_id_for(job(1)["url"]), custom_id_for(job(2)["url"])])
+        self.assertEqual(results[job(1)["url"]]["job_title"], "Engineer")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,324 @@
+"""
+Unit tests for the batch job scraper and its driver pool.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.scrapers import batch_scraper
+from src.scrapers.batch_scraper import DriverPool, fetch_one, read_urls, run_batch, run_batch_async, run_batch_backfill
+from src.scrapers.crawl_store import CrawlStore, content_hash
+from src.scrapers.host_limiter import CircuitOpenError
+from src.scrapers.http_fetcher import EXPIRED, NOT_MODIFIED
+from src.utils import config
+
+
+class FakeScraper:
+    """Stands in for a platform scraper bound to a pooled driver."""
+
+    instances = []
+    platform = "Lever"
+    pages = {}
+    extracted = []
+
+    def __init__(self, headless=True, driver_provider=None, http_fetcher=None, cache_mode="use", compact=True,
+                 client=None):
+        self.driver_provider = driver_provider
+        FakeScraper.instances.append(self)
+
+    def scrape_job(self, url):
+        return {"source_url": url, "driver": id(self.driver_provider())}
+
+    def fetch_job_data(self, url, validators=None):
+        return {"url": url, "full_text": FakeScraper.pages.get(url, "posting text"), "platform": "Lever"}
+
+    def process_with_llm(self, content, platform):
+        FakeScraper.extracted.append(content["url"])
+        return {"source_url": content["url"]}
+
+
+class ConditionalScraper(FakeScraper):
+    """Serves an ETag with every posting and answers with the status set for a URL, if any."""
+
+    statuses = {}
+    validators_seen = {}
+
+    def fetch_job_data(self, url, validators=None):
+        ConditionalScraper.validators_seen[url] = validators
+        if url in ConditionalScraper.statuses:
+            return {"url": url, "platform": "Lever", "status": ConditionalScraper.statuses[url]}
+        return {"url": url, "full_text": "posting text", "platform": "Lever", "http_validators": {"etag": '"v1"'}}
+
+
+class ParkedScraper(FakeScraper):
+    """Finds each posting's domain parked for park_seconds on the first attempt."""
+
+    park_seconds = 0.1
+    attempts = {}
+
+    def fetch_job_data(self, url, validators=None):
+        ParkedScraper.attempts[url] = ParkedScraper.attempts.get(url, 0) + 1
+        if ParkedScraper.attempts[url] == 1:
+            raise CircuitOpenError("lever.co", time.time() + ParkedScraper.park_seconds)
+        return super().fetch_job_data(url, validators)
+
+
+class EchoExtractor:
+    """Extraction stage that returns each posting's URL as the result."""
+
+    def __init__(self):
+        self.contents = []
+
+    async def extract_stream(self, source, ordered=False):
+        async for content in source:
+            self.contents.append(content)
+            yield {"source_url": content["url"]}
+
+    def known_urls(self):
+        return set()
+
+    def run(self, contents, on_results=None):
+        results = {content["url"]: {"source_url": content["url"]} for content in contents}
+        self.contents.extend(contents)
+        on_results(results)
+        return results
+
+
+class TestReadUrls(unittest.TestCase):
+    """Test cases for reading batch input files."""
+
+    def _write(self, suffix, content):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_text_file(self):
+        path = self._write(".txt", "https://a.lever.co/x\n\n# comment\nhttps://a.lever.co/x\nhttps://b.ashbyhq.com/y\n")
+        self.assertEqual(read_urls(path), ["https://a.lever.co/x", "https://b.ashbyhq.com/y"])
+
+    def test_gallery_csv(self):
+        path = self._write(".csv", "url,title,company_info\nhttps://a.lever.co/x,Engineer,Acme\nhttps://boards.greenhouse.io/z,PM,Beta\n")
+        self.assertEqual(read_urls(path), ["https://a.lever.co/x", "https://boards.greenhouse.io/z"])
+
+
+class TestDriverPool(unittest.TestCase):
+    """Test cases for the DriverPool class."""
+
+    def test_reuses_drivers_up_to_size(self):
+        factory = MagicMock(side_effect=lambda headless: MagicMock())
+        pool = DriverPool(2, driver_factory=factory, recycle_after=0)
+
+        seen = set()
+        for _ in range(5):
+            with pool.acquire() as worker:
+                seen.add(id(worker.driver))
+
+        self.assertEqual(factory.call_count, 1)
+        self.assertEqual(len(seen), 1)
+        pool.close()
+
+    def test_recycles_driver_after_limit(self):
+        drivers = []
+        def factory(headless):
+            drivers.append(MagicMock())
+            return drivers[-1]
+
+        pool = DriverPool(1, driver_factory=factory, recycle_after=2)
+        for _ in range(4):
+            with pool.acquire() as worker:
+                worker.driver.get("https://jobs.lever.co/acme")
+
+        self.assertEqual(len(drivers), 2)
+        drivers[0].quit.assert_called_once()
+        pool.close()
+
+    def test_resets_driver_between_jobs(self):
+        driver = MagicMock()
+        pool = DriverPool(1, driver_factory=lambda headless: driver, recycle_after=0)
+        for _ in range(2):
+            with pool.acquire() as worker:
+                worker.driver.get("https://jobs.lever.co/acme")
+
+        driver.execute_cdp_cmd.assert_any_call("Network.clearBrowserCookies", {})
+        driver.quit.assert_not_called()
+        pool.close()
+
+    def test_prewarm_launches_in_background(self):
+        launched = threading.Event()
+        def factory(headless):
+            launched.set()
+            return MagicMock()
+
+        pool = DriverPool(2, driver_factory=factory, prewarm=True)
+        self.assertTrue(launched.wait(5))
+        with pool.acquire() as worker:
+            self.assertIsNotNone(worker.driver)
+        pool.close()
+
+    def test_driver_not_launched_until_used(self):
+        factory = MagicMock()
+        pool = DriverPool(2, driver_factory=factory)
+        with pool.acquire():
+            pass
+        pool.close()
+        factory.assert_not_called()
+
+
+class TestRunBatch(unittest.TestCase):
+    """Test cases for run_batch."""
+
+    def setUp(self):
+        FakeScraper.instances = []
+        fd, self.output = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        self.addCleanup(os.remove, self.output)
+
+    def test_streams_results_and_routes_urls(self):
+        drivers = []
+        lock = threading.Lock()
+        def factory(headless):
+            with lock:
+                drivers.append(MagicMock())
+                return drivers[-1]
+
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(10)] + ["https://example.com/job"]
+        with patch.object(batch_scraper, "get_scraper_class",
+                          side_effect=lambda url: FakeScraper if "lever.co" in url else None):
+            counts = run_batch(urls, self.output, workers=3, driver_factory=factory)
+
+        self.assertEqual(counts, {"succeeded": 10, "failed": 1, "expired": 0, "deferred": 0})
+        self.assertLessEqual(len(drivers), 3)
+        for driver in drivers:
+            driver.quit.assert_called_once()
+
+        with open(self.output) as f:
+            results = [json.loads(line) for line in f]
+        self.assertEqual(len(results), 11)
+        self.assertEqual({r.get("source_url") or r.get("url") for r in results}, set(urls))
+
+    def test_store_resumes_and_skips_unchanged(self):
+        store = CrawlStore(":memory:", refresh_after_days=1)
+        self.addCleanup(store.close)
+        FakeScraper.pages = {}
+        FakeScraper.extracted = []
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(4)]
+
+        with patch.object(batch_scraper, "get_scraper_class", return_value=FakeScraper):
+            counts = run_batch(urls[:2], self.output, workers=2, driver_factory=MagicMock(), store=store)
+            self.assertEqual(counts, {"succeeded": 2, "failed": 0, "expired": 0, "deferred": 0,
+                                      "skipped": 0, "unchanged": 0})
+
+            # A rerun over the full list only processes the postings not done before
+            counts = run_batch(urls, self.output, workers=2, driver_factory=MagicMock(), store=store)
+            self.assertEqual(counts, {"succeeded": 2, "failed": 0, "expired": 0, "deferred": 0,
+                                      "skipped": 2, "unchanged": 0})
+            self.assertEqual(sorted(FakeScraper.extracted), sorted(urls))
+
+        # Once due for a refresh, re-fetched postings with identical content never reach the LLM
+        FakeScraper.extracted = []
+        FakeScraper.pages = {urls[0]: "edited posting text"}
+        with patch.object(batch_scraper, "get_scraper_class", return_value=FakeScraper), \
+                patch("src.scrapers.crawl_store.time.time", return_value=time.time() + 2 * 86400):
+            counts = run_batch(urls, self.output, workers=2, driver_factory=MagicMock(), store=store)
+        self.assertEqual(counts, {"succeeded": 1, "failed": 0, "expired": 0, "deferred": 0,
+                                  "skipped": 0, "unchanged": 3})
+        self.assertEqual(FakeScraper.extracted, [urls[0]])
+
+    def test_conditional_refetch_and_expired_postings(self):
+        store = CrawlStore(":memory:", refresh_after_days=1)
+        self.addCleanup(store.close)
+        ConditionalScraper.statuses = {}
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(3)]
+
+        with patch.object(batch_scraper, "get_scraper_class", return_value=ConditionalScraper):
+            run_batch(urls, self.output, workers=2, driver_factory=MagicMock(), store=store)
+        self.assertEqual(ConditionalScraper.validators_seen, {url: None for url in urls})
+
+        ConditionalScraper.statuses = {urls[0]: NOT_MODIFIED, urls[1]: EXPIRED}
+        with patch.object(batch_scraper, "get_scraper_class", return_value=ConditionalScraper), \
+                patch("src.scrapers.crawl_store.time.time", return_value=time.time() + 2 * 86400):
+            counts = run_batch(urls, self.output, workers=2, driver_factory=MagicMock(), store=store)
+            self.assertEqual(counts, {"succeeded": 0, "failed": 0, "expired": 1, "deferred": 0,
+                                      "skipped": 0, "unchanged": 2})
+            self.assertEqual(ConditionalScraper.validators_seen[urls[0]], {"etag": '"v1"'})
+            self.assertEqual(store.get(urls[0])["extract_status"], "done")
+            self.assertEqual(store.get(urls[1])["fetch_status"], "expired")
+
+        # At the next refresh, expired postings are not fetched again
+        with patch("src.scrapers.crawl_store.time.time", return_value=time.time() + 4 * 86400):
+            self.assertEqual(store.due_urls(urls), [urls[0], urls[2]])
+
+        with open(self.output) as f:
+            expired = [json.loads(line) for line in f if "expired" in line]
+        self.assertEqual(expired, [{"error": "Posting expired", "expired": True, "url": urls[1], "platform": "Lever"}])
+
+    def test_fetch_hashes_text_before_compacting(self):
+        store = CrawlStore(":memory:")
+        self.addCleanup(store.close)
+        url = "https://jobs.lever.co/acme/1"
+        raw = "Backend Engineer\nApply now\nBuild pipelines\nWe use cookies to improve your experience.\nBack to jobs"
+        FakeScraper.pages = {url: raw}
+        pool = DriverPool(1, driver_factory=MagicMock(), compact=True)
+        self.addCleanup(pool.close)
+
+        with patch.object(batch_scraper, "get_scraper_class", return_value=FakeScraper):
+            job_data = fetch_one(pool, url, store)
+
+        self.assertNotIn("Apply now", job_data["full_text"])
+        self.assertEqual(store.get(url)["content_hash"], content_hash(raw))
+
+    def test_parked_domain_is_requeued(self):
+        store = CrawlStore(":memory:")
+        self.addCleanup(store.close)
+        ParkedScraper.attempts, ParkedScraper.park_seconds = {}, 0.1
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(3)]
+
+        with patch.object(batch_scraper, "get_scraper_class", return_value=ParkedScraper):
+            counts = run_batch(urls, self.output, workers=2, driver_factory=MagicMock(), store=store)
+
+        self.assertEqual(counts, {"succeeded": 3, "failed": 0, "expired": 0, "deferred": 0,
+                                  "skipped": 0, "unchanged": 0})
+        self.assertEqual(ParkedScraper.attempts, {url: 2 for url in urls})
+
+    def test_long_park_is_left_for_the_next_run(self):
+        store = CrawlStore(":memory:")
+        self.addCleanup(store.close)
+        ParkedScraper.attempts, ParkedScraper.park_seconds = {}, 3600
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(2)]
+
+        with patch.object(batch_scraper, "get_scraper_class", return_value=ParkedScraper), \
+                patch.object(config, "HOST_REQUEUE_MAX_WAIT", 1):
+            counts = run_batch(urls, self.output, workers=2, driver_factory=MagicMock(), store=store)
+
+        self.assertEqual(counts, {"succeeded": 0, "failed": 0, "expired": 0, "deferred": 2,
+                                  "skipped": 0, "unchanged": 0})
+        self.assertEqual(store.due_urls(urls), urls)
+        with open(self.output) as f:
+            self.assertEqual(f.read(), "")
+
+    def test_parked_domain_is_requeued_by_async_and_backfill_runs(self):
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(3)]
+        for run in (lambda extractor: asyncio.run(run_batch_async(urls, self.output, workers=2, extractor=extractor,
+                                                                  driver_factory=MagicMock())),
+                    lambda extractor: run_batch_backfill(urls, self.output, workers=2, extractor=extractor,
+                                                         driver_factory=MagicMock())):
+            ParkedScraper.attempts, ParkedScraper.park_seconds = {}, 0.1
+            extractor = EchoExtractor()
+            with patch.object(batch_scraper, "get_scraper_class", return_value=ParkedScraper):
+                counts = run(extractor)
+
+            self.assertEqual(counts, {"succeeded": 3, "failed": 0, "expired": 0, "deferred": 0})
+            self.assertEqual(sorted(content["url"] for content in extractor.contents), urls)
+            self.assertEqual(ParkedScraper.attempts, {url: 2 for url in urls})
+
+
+if __name__ == '__main__':
+    unittest.main()
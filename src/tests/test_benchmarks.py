@@ -0,0 +1,76 @@
+"""
+Unit tests for the offline benchmark harness (fixture server, stub client, HTTP-only mode).
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import requests
+
+from src.benchmarks.scrape_bench import (FixtureServer, StubAnthropic, posting_path, process_tree_rss, run,
+                                         write_results)
+from src.scrapers.job_app_scraper import get_scraper_class
+
+
+class TestFixtureServer(unittest.TestCase):
+    """Test cases for the FixtureServer class."""
+
+    def test_serves_fixture_per_platform(self):
+        with FixtureServer() as server:
+            lever = requests.get(server.url(posting_path(0)), timeout=5)
+            gallery = requests.get(server.url("/startups.gallery/jobs/"), timeout=5)
+            missing = requests.get(server.url("/unknown"), timeout=5)
+
+        self.assertEqual(lever.status_code, 200)
+        self.assertIn("posting-headline", lever.text)
+        self.assertIn("Load More", gallery.text)
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(server.requests, 3)
+
+    def test_posting_urls_route_to_real_scrapers(self):
+        platforms = [get_scraper_class("http://127.0.0.1:8000" + posting_path(i)).platform for i in range(3)]
+        self.assertEqual(platforms, ["Lever", "Greenhouse", "Ashby"])
+
+
+class TestScrapeBench(unittest.TestCase):
+    """Test cases for the benchmark runner."""
+
+    def test_stub_response_echoes_prompt_fields(self):
+        prompt = ("JOB POSTING CONTENT:\nData Engineer\nBuild pipelines\n"
+                  "- source_url: http://127.0.0.1/jobs.lever.co/acme/1\n- platform: Lever\n")
+        response = StubAnthropic().messages.create(messages=[{"role": "user", "content": prompt}])
+        data = json.loads(response.content[0].text)
+        self.assertEqual(data["job_title"], "Data Engineer")
+        self.assertEqual(data["source_url"], "http://127.0.0.1/jobs.lever.co/acme/1")
+        self.assertGreater(response.usage.input_tokens, 0)
+
+    def test_http_mode_record(self):
+        record = run(["http"], jobs=6, workers=2)
+        row = record["modes"][0]
+
+        # Ashby postings need a browser, so only Lever and Greenhouse run in http mode
+        self.assertEqual(row["jobs"], 4)
+        self.assertEqual(row["succeeded"], 4)
+        self.assertEqual(row["llm_calls"], 4)
+        self.assertGreater(row["jobs_per_min"], 0)
+        self.assertGreater(row["peak_rss_mb"], 0)
+        stages = {stage["stage"] for stage in row["stages"]}
+        self.assertTrue({"http_fetch", "llm", "json_parse"} <= stages)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results", "bench.jsonl")
+            write_results(record, path)
+            write_results(record, path)
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["settings"]["jobs"], 6)
+
+    def test_process_tree_rss_is_positive(self):
+        self.assertGreater(process_tree_rss(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Unit tests for pre-LLM posting text compaction.
+"""
+
+import unittest
+
+from bs4 import BeautifulSoup # type: ignore
+
+from src.extraction.compaction import CompactionStats, compact_job_data, compact_text, select_main_content
+
+GREENHOUSE_TEXT = """
+Back to jobs
+Acme Corp
+Senior Data Engineer
+San Francisco, CA   (Hybrid)
+Apply
+
+About the role
+We are building the data platform that powers   our product.
+You will design pipelines in Python and SQL.
+
+Requirements
+5+ years of data engineering experience
+Experience with Airflow and Spark
+
+Acme is an equal opportunity employer and values diversity.
+Apply for this job
+First Name *
+Last Name *
+Resume/CV *
+Voluntary Self-Identification
+Powered by Greenhouse
+"""
+
+
+class TestCompactText(unittest.TestCase):
+    """Test cases for compact_text."""
+
+    def test_strips_navigation_forms_and_eeo(self):
+        compacted = compact_text(GREENHOUSE_TEXT)
+
+        self.assertTrue(compacted.startswith("Acme Corp\nSenior Data Engineer"))
+        self.assertIn("We are building the data platform that powers our product.", compacted)
+        self.assertIn("Experience with Airflow and Spark", compacted)
+        for boilerplate in ("Back to jobs", "Apply", "equal opportunity", "First Name", "Powered by"):
+            self.assertNotIn(boilerplate, compacted)
+
+    def test_collapses_blank_lines_and_duplicates(self):
+        compacted = compact_text("Title\n\n\n\nTitle\nBody line\n\n\nBody line\nEnd")
+        self.assertEqual(compacted, "Title\n\nBody line\n\nEnd")
+
+    def test_caps_length_at_line_boundary(self):
+        text = "\n".join(f"Responsibility number {i} for this role" for i in range(200))
+        compacted = compact_text(text, max_tokens=50)
+
+        self.assertLessEqual(len(compacted), 200)
+        self.assertTrue(compacted.endswith("for this role"))
+
+    def test_keeps_heading_like_lines_near_the_top(self):
+        compacted = compact_text("Apply for this job\nSoftware Engineer\nBuild things")
+        self.assertIn("Software Engineer", compacted)
+
+
+class TestCompactJobData(unittest.TestCase):
+    """Test cases for compact_job_data and its stats."""
+
+    def test_records_before_and_after_sizes(self):
+        stats = CompactionStats()
+        job_data = {"url": "u", "job_title": "t", "full_text": GREENHOUSE_TEXT, "platform": "Greenhouse"}
+
+        compacted = compact_job_data(job_data, stats=stats)
+
+        self.assertEqual(job_data["full_text"], GREENHOUSE_TEXT)
+        self.assertLess(len(compacted["full_text"]), len(GREENHOUSE_TEXT))
+        [row] = stats.summary()
+        self.assertEqual(row["platform"], "Greenhouse")
+        self.assertEqual(row["bytes_before"], len(GREENHOUSE_TEXT.encode()))
+        self.assertGreater(row["token_savings"], 0.2)
+
+
+class TestSelectMainContent(unittest.TestCase):
+    """Test cases for main content region selection."""
+
+    def test_prefers_platform_container(self):
+        soup = BeautifulSoup("<body><nav>Jobs</nav><div class='posting-page'><div class='content'>Role</div></div></body>",
+                             "html.parser")
+        element, matched = select_main_content(soup, "Lever")
+        self.assertTrue(matched)
+        self.assertEqual(element.get_text(), "Role")
+
+    def test_falls_back_to_body(self):
+        soup = BeautifulSoup("<body><div>Role</div></body>", "html.parser")
+        element, matched = select_main_content(soup, "Lever")
+        self.assertFalse(matched)
+        self.assertEqual(element.name, "body")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Unit tests for the persistent crawl state store.
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.scrapers.crawl_store import CrawlStore, content_hash
+
+
+class TestCrawlStore(unittest.TestCase):
+    """Test cases for the CrawlStore class."""
+
+    def setUp(self):
+        self.store = CrawlStore(":memory:", refresh_after_days=7, max_attempts=2)
+        self.addCleanup(self.store.close)
+
+    def test_add_urls_reports_only_new(self):
+        cards = [{"url": "https://jobs.lever.co/a/1", "title": "Engineer", "company_info": "Acme"}]
+        self.assertEqual(self.store.add_urls(cards, source="startups.gallery"), ["https://jobs.lever.co/a/1"])
+        self.assertEqual(self.store.add_urls(["https://jobs.lever.co/a/1", "https://jobs.lever.co/a/2"]),
+                         ["https://jobs.lever.co/a/2"])
+
+        state = self.store.get("https://jobs.lever.co/a/1")
+        self.assertEqual(state["title"], "Engineer")
+        self.assertEqual(state["source"], "startups.gallery")
+        self.assertEqual(len(self.store), 2)
+
+    def test_content_hash_ignores_whitespace(self):
+        self.assertEqual(content_hash("Build  pipelines\n"), content_hash("Build pipelines"))
+        self.assertNotEqual(content_hash("Build pipelines"), content_hash("Build dashboards"))
+
+    def test_content_hash_covers_the_whole_text(self):
+        # Edits past the point where compaction would truncate still change the hash
+        body = "Build pipelines. " * 2000
+        self.assertNotEqual(content_hash(body + "Salary: 100k"), content_hash(body + "Salary: 120k"))
+
+    def test_content_hash_ignores_volatile_counters(self):
+        self.assertEqual(content_hash("Engineer\nPosted 3 days ago\n120 applicants\nBuild pipelines"),
+                         content_hash("Engineer\nPosted today\n1,204 applicants\nBuild pipelines"))
+
+    def test_validators_only_for_settled_postings(self):
+        url = "https://jobs.lever.co/a/1"
+        self.store.mark_fetched(url, "text", validators={"etag": '"v1"'})
+        self.assertIsNone(self.store.validators(url))
+
+        self.store.mark_extracted(url)
+        self.assertEqual(self.store.validators(url), {"etag": '"v1"'})
+        self.store.mark_not_modified(url)
+        self.assertEqual(self.store.get(url)["extract_status"], "done")
+
+        self.store.mark_expired(url)
+        self.assertIsNone(self.store.validators(url))
+        self.assertEqual(self.store.stats()["fetch"]["expired"], 1)
+
+    def test_adds_columns_to_older_databases(self):
+        fd, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE postings (url TEXT PRIMARY KEY, source TEXT, platform TEXT, title TEXT, "
+                     "company_info TEXT, discovered_at REAL NOT NULL, last_seen_at REAL NOT NULL, "
+                     "fetch_status TEXT NOT NULL DEFAULT 'pending', fetched_at REAL, content_hash TEXT, "
+                     "extract_status TEXT NOT NULL DEFAULT 'pending', extracted_at REAL, "
+                     "attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT) WITHOUT ROWID")
+        conn.close()
+
+        store = CrawlStore(path)
+        self.addCleanup(store.close)
+        store.mark_fetched("https://jobs.lever.co/a/1", "text", validators={"last_modified": "yesterday"})
+        self.assertEqual(store.get("https://jobs.lever.co/a/1")["last_modified"], "yesterday")
+
+    def test_extracted_postings_are_not_due(self):
+        urls = ["https://jobs.lever.co/a/1", "https://jobs.lever.co/a/2"]
+        self.assertEqual(self.store.due_urls(urls), urls)
+
+        self.assertTrue(self.store.mark_fetched(urls[0], "text", "Lever"))
+        self.store.mark_extracted(urls[0])
+
+        self.assertEqual(self.store.due_urls(urls), [urls[1]])
+        self.assertEqual(self.store.frontier(), [urls[1]])
+
+    def test_unchanged_content_skips_extraction(self):
+        url = "https://jobs.lever.co/a/1"
+        self.store.mark_fetched(url, "same text")
+        self.store.mark_extracted(url)
+
+        self.assertFalse(self.store.mark_fetched(url, "same  text"))
+        self.assertEqual(self.store.get(url)["extract_status"], "done")
+        self.assertTrue(self.store.mark_fetched(url, "new text"))
+        self.assertEqual(self.store.get(url)["extract_status"], "pending")
+
+    def test_reopen_filtered_postings(self):
+        urls = ["https://jobs.lever.co/a/1", "https://jobs.lever.co/a/2"]
+        for url in urls:
+            self.store.mark_fetched(url, "text")
+        self.store.mark_filtered(urls[0], "Near-duplicate of https://jobs.lever.co/a/0")
+        self.store.mark_extracted(urls[1])
+
+        self.store.reopen(urls)
+
+        self.assertEqual(self.store.due_urls(urls), [urls[0]])
+        self.assertEqual(self.store.get(urls[0])["extract_status"], "pending")
+        self.assertTrue(self.store.mark_fetched(urls[0], "text"))
+
+    def test_refresh_after_days(self):
+        url = "https://jobs.lever.co/a/1"
+        self.store.mark_fetched(url, "text")
+        self.store.mark_extracted(url)
+
+        with patch("src.scrapers.crawl_store.time.time", return_value=time.time() + 8 * 86400):
+            self.assertEqual(self.store.due_urls([url]), [url])
+
+    def test_failures_retry_until_max_attempts(self):
+        url = "https://jobs.lever.co/a/1"
+        self.store.mark_fetch_failed(url, "timeout")
+        self.assertEqual(self.store.due_urls([url]), [url])
+
+        self.store.mark_fetch_failed(url, "timeout")
+        self.assertEqual(self.store.due_urls([url]), [])
+        self.assertEqual(self.store.get(url)["last_error"], "timeout")
+        self.assertEqual(self.store.stats()["fetch"]["failed"], 1)
+
+    def test_lookups_scale_past_parameter_limit(self):
+        urls = [f"https://jobs.lever.co/a/{i}" for i in range(5000)]
+        self.assertEqual(len(self.store.add_urls(urls)), 5000)
+        self.assertEqual(self.store.add_urls(urls), [])
+        self.assertEqual(len(self.store.due_urls(urls)), 5000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Unit tests for Chrome options, lean-mode resource blocking, chromedriver resolution and driver reset.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.scrapers import driver_factory
+from src.scrapers.driver_factory import (BLOCKED_URL_PATTERNS, block_resources, build_chrome_options,
+                                         reset_driver, resolve_chromedriver)
+
+
+class FakeCdpDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+
+class TestChromeOptions(unittest.TestCase):
+    """Test cases for build_chrome_options and block_resources."""
+
+    def test_default_profile_is_unchanged(self):
+        options = build_chrome_options(headless=True, user_agent=None, lean=False)
+        self.assertEqual(options.arguments, ["--headless=new", "--window-size=1920,1080"])
+        self.assertEqual(options.page_load_strategy, "normal")
+
+    def test_lean_profile(self):
+        options = build_chrome_options(headless=True, user_agent=None, lean=True, renderer_memory_mb=256)
+        self.assertEqual(options.page_load_strategy, "eager")
+        self.assertIn("--blink-settings=imagesEnabled=false", options.arguments)
+        self.assertIn("--js-flags=--max-old-space-size=256", options.arguments)
+        self.assertTrue(any(argument.startswith("--disable-features=") for argument in options.arguments))
+        self.assertEqual(options.experimental_options["prefs"]["profile.managed_default_content_settings.images"], 2)
+
+    def test_block_resources_uses_cdp(self):
+        driver = FakeCdpDriver()
+        block_resources(driver)
+        self.assertEqual(driver.commands[0], ("Network.enable", {}))
+        self.assertEqual(driver.commands[1], ("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}))
+        self.assertIn("*.woff2", BLOCKED_URL_PATTERNS)
+
+
+class TestResolveChromedriver(unittest.TestCase):
+    """Test cases for resolve_chromedriver."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_path = os.path.join(tmp.name, "cache", "chromedriver.json")
+        self.binary = os.path.join(tmp.name, "chromedriver")
+        open(self.binary, "w").close()
+        patcher = patch.object(driver_factory, "_chromedriver_path", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_manager_runs_once_per_host(self):
+        with patch.object(driver_factory, "ChromeDriverManager") as manager:
+            manager.return_value.install.return_value = self.binary
+            self.assertEqual(resolve_chromedriver(self.cache_path), self.binary)
+            self.assertEqual(resolve_chromedriver(self.cache_path), self.binary)
+        manager.return_value.install.assert_called_once()
+
+        # A new process reads the on-disk cache instead of asking the manager again
+        driver_factory._chromedriver_path = None
+        with patch.object(driver_factory, "ChromeDriverManager") as manager:
+            self.assertEqual(resolve_chromedriver(self.cache_path), self.binary)
+        manager.assert_not_called()
+
+    def test_offline_uses_stale_cache_or_path(self):
+        os.makedirs(os.path.dirname(self.cache_path))
+        with open(self.cache_path, "w") as f:
+            json.dump({"path": self.binary, "resolved_at": 0}, f)
+
+        with patch.object(driver_factory, "ChromeDriverManager") as manager:
+            self.assertEqual(resolve_chromedriver(self.cache_path, max_age_days=7, offline=True), self.binary)
+        manager.assert_not_called()
+
+        driver_factory._chromedriver_path = None
+        os.remove(self.cache_path)
+        with patch.object(driver_factory.shutil, "which", return_value="/usr/bin/chromedriver"):
+            self.assertEqual(resolve_chromedriver(self.cache_path, offline=True), "/usr/bin/chromedriver")
+
+    def test_network_failure_falls_back(self):
+        with patch.object(driver_factory, "ChromeDriverManager") as manager, \
+                patch.object(driver_factory.shutil, "which", return_value=None):
+            manager.return_value.install.side_effect = ConnectionError("offline")
+            with self.assertRaises(RuntimeError):
+                resolve_chromedriver(self.cache_path)
+
+
+class TestResetDriver(unittest.TestCase):
+    """Test cases for reset_driver."""
+
+    def test_closes_extra_tabs_and_clears_state(self):
+        driver = MagicMock()
+        driver.window_handles = ["main", "popup"]
+        driver.execute_script.return_value = "https://jobs.lever.co"
+
+        reset_driver(driver)
+
+        driver.close.assert_called_once()
+        driver.switch_to.window.assert_called_with("main")
+        driver.execute_cdp_cmd.assert_any_call("Storage.clearDataForOrigin",
+                                               {"origin": "https://jobs.lever.co", "storageTypes": "all"})
+        driver.execute_cdp_cmd.assert_any_call("Network.clearBrowserCookies", {})
+        driver.get.assert_called_with("about:blank")
+
+
+if __name__ == '__main__':
+    unittest.main()
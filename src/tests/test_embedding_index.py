@@ -0,0 +1,141 @@
+"""
+Unit tests for the embedding-based job matching index.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.filtering.embedding_index import (MIN_CAPACITY, EmbeddingIndex, HashingEmbedder, posting_embedding_text,
+                                           read_postings)
+from src.scrapers.job_store import JobStore
+
+POSTINGS = [
+    {"source_url": "https://jobs.lever.co/acme/1", "job_title": "Backend Engineer", "company_name": "Acme",
+     "required_skills": ["Python", "PostgreSQL", "Kubernetes"],
+     "responsibilities": ["Build data pipelines and backend APIs"],
+     "job_description": "Own Python services that move data between our platform and customers."},
+    {"source_url": "https://jobs.ashbyhq.com/globex/2", "job_title": "Product Designer", "company_name": "Globex",
+     "required_skills": ["Figma", "User research", "Prototyping"],
+     "responsibilities": ["Design onboarding flows", "Run usability studies"],
+     "job_description": "Shape the visual language and interaction design of our mobile app."},
+    {"source_url": "https://boards.greenhouse.io/initech/jobs/3", "job_title": "Account Executive",
+     "company_name": "Initech", "required_skills": ["Negotiation", "Salesforce"],
+     "responsibilities": ["Close enterprise deals", "Manage quota"],
+     "job_description": "Grow revenue by selling to enterprise accounts."},
+]
+PROFILE = "Python backend engineer who builds data pipelines, APIs and services on PostgreSQL and Kubernetes"
+
+
+class TestEmbeddingText(unittest.TestCase):
+    """Test cases for the text embedded per posting."""
+
+    def test_joins_matching_fields(self):
+        text = posting_embedding_text({"job_title": "Engineer", "required_skills": ["Python", None, "SQL"],
+                                       "responsibilities": [], "job_description": "Not found", "benefits": ["Dental"]})
+        self.assertEqual(text, "Engineer\nPython; SQL")
+
+    def test_hashing_embedder_is_stable(self):
+        vectors = HashingEmbedder().embed(["Python backend engineer", "Python backend engineer"])
+        self.assertEqual(vectors.shape, (2, 384))
+        np.testing.assert_array_equal(vectors[0], HashingEmbedder().embed(["Python backend engineer"])[0])
+        self.assertAlmostEqual(float(np.linalg.norm(vectors[0])), 1.0, places=5)
+
+
+class TestEmbeddingIndex(unittest.TestCase):
+    """Test cases for the EmbeddingIndex class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.embedder = HashingEmbedder()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "index")
+
+    def test_ranks_postings_against_a_profile(self):
+        index = EmbeddingIndex(None, embedder=self.embedder)
+        self.assertEqual(index.add(POSTINGS + [{"error": "Posting expired", "url": "u"}]), 3)
+
+        matches = index.query(PROFILE, k=2)
+
+        self.assertEqual([match["url"] for match in matches][0], "https://jobs.lever.co/acme/1")
+        self.assertEqual(len(matches), 2)
+        self.assertEqual(matches[0]["company_name"], "Acme")
+        self.assertGreater(matches[0]["score"], matches[1]["score"])
+        self.assertEqual(len(index.query(PROFILE, k=10)), 3)
+
+    def test_persists_and_appends_incrementally(self):
+        index = EmbeddingIndex(self.path, embedder=self.embedder)
+        index.add(POSTINGS[:2])
+        index.close()
+
+        index = EmbeddingIndex(self.path, embedder=self.embedder)
+        self.assertEqual(len(index), 2)
+        index.add(POSTINGS[2:])
+        # A re-extracted posting replaces its row
+        index.add([{**POSTINGS[0], "job_title": "Senior Backend Engineer"}])
+        index.close()
+
+        index = EmbeddingIndex(self.path, embedder=self.embedder)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.query(PROFILE, k=1)[0]["job_title"], "Senior Backend Engineer")
+
+    def test_grows_the_vector_file(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((MIN_CAPACITY + 10, 384))
+        labels = [{"url": f"u{i}"} for i in range(len(vectors))]
+        index = EmbeddingIndex(self.path, embedder=self.embedder)
+        index.add_vectors(vectors[:10], labels[:10])
+        self.assertEqual(os.path.getsize(os.path.join(self.path, "vectors.f32")), MIN_CAPACITY * 384 * 4)
+        index.add_vectors(vectors[10:], labels[10:])
+        index.close()
+
+        self.assertEqual(os.path.getsize(os.path.join(self.path, "vectors.f32")), 2 * MIN_CAPACITY * 384 * 4)
+        index = EmbeddingIndex(self.path, embedder=self.embedder)
+        self.assertEqual(index.query_vector(vectors[MIN_CAPACITY + 5], k=1)[0]["url"], f"u{MIN_CAPACITY + 5}")
+        with self.assertRaises(ValueError):
+            index.add_vectors(np.ones((1, 8)), [{"url": "short"}])
+
+    def test_uncommitted_rows_are_ignored(self):
+        index = EmbeddingIndex(self.path, embedder=self.embedder)
+        index.add(POSTINGS[:1])
+        index.close()
+        # An append interrupted after the labels were written but before the count was committed
+        with open(os.path.join(self.path, "labels.jsonl"), "a") as f:
+            f.write(json.dumps({"row": 1, "url": "https://jobs.lever.co/acme/lost"}) + "\n")
+            f.write('{"row": 2, "url": "https://jobs')
+
+        index = EmbeddingIndex(self.path, embedder=self.embedder)
+        self.assertEqual(len(index), 1)
+        index.add(POSTINGS[1:2])
+        index.close()
+
+        index = EmbeddingIndex(self.path, embedder=self.embedder)
+        self.assertEqual(len(index), 2)
+        self.assertEqual({match["url"] for match in index.query(PROFILE, k=5)},
+                         {POSTINGS[0]["source_url"], POSTINGS[1]["source_url"]})
+
+    def test_another_model_starts_over(self):
+        index = EmbeddingIndex(self.path, embedder=self.embedder)
+        index.add(POSTINGS)
+        index.close()
+
+        index = EmbeddingIndex(self.path, embedder=HashingEmbedder(dim=128))
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.query(PROFILE), [])
+
+    def test_reads_postings_from_the_job_store(self):
+        store_path = os.path.join(self.path, "jobs")
+        with JobStore(store_path) as store:
+            store.extend([{**posting, "platform": "Lever"} for posting in POSTINGS])
+        index = EmbeddingIndex(None, embedder=self.embedder)
+        self.assertEqual(index.add(read_postings(store_path)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Unit tests for the two-tier relevance filter.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+from src.filtering.claude_filter import FilterCriteria, FilterStats, RelevanceFilter
+
+CRITERIA = FilterCriteria(
+    profile="Backend software engineer building Python data pipelines and distributed systems",
+    title_keywords=["engineer"],
+    exclude_title_keywords=["sales", "recruiter"],
+    locations=["remote"],
+    exclude_locations=["london"],
+)
+
+
+def make_client(reply):
+    client = MagicMock()
+    client.messages.create.return_value.content = [MagicMock(text=reply)]
+    return client
+
+
+class TestRelevanceFilter(unittest.TestCase):
+    """Test cases for the RelevanceFilter class."""
+
+    def setUp(self):
+        self.client = make_client('{"relevant": true, "reason": "Python data work"}')
+        self.filter = RelevanceFilter(CRITERIA, client=self.client, accept_score=0.35, reject_score=0.05)
+
+    def test_rules_reject_without_scoring(self):
+        decisions = self.filter.classify([
+            {"url": "a", "title": "Enterprise Sales Lead"},
+            {"url": "b", "title": "Office Manager", "company_info": "Acme - London"},
+        ])
+
+        self.assertEqual([d["decision"] for d in decisions], ["reject", "reject"])
+        self.assertEqual({d["tier"] for d in decisions}, {"rules"})
+        self.client.messages.create.assert_not_called()
+
+    def test_remote_overrides_excluded_location(self):
+        self.assertIsNone(self.filter.apply_rules({"title": "Engineer", "company_info": "London or Remote"}))
+
+    def test_tfidf_settles_clear_cases(self):
+        postings = [
+            {"url": "match", "job_title": "Backend Software Engineer",
+             "full_text": "Build Python data pipelines and distributed systems. Remote."},
+            {"url": "unrelated", "title": "Pastry Chef", "company_info": "Bakery"},
+        ]
+        scores = self.filter.score(postings)
+        self.assertGreater(scores[0], scores[1])
+
+        decisions = self.filter.classify(postings)
+        self.assertEqual([(d["decision"], d["tier"]) for d in decisions], [("accept", "tfidf"), ("reject", "tfidf")])
+        self.client.messages.create.assert_not_called()
+
+    def test_scores_do_not_depend_on_the_batch(self):
+        posting = {"url": "maybe", "title": "Solutions Engineer", "full_text": "Python APIs for fintech customers"}
+        others = [{"url": str(i), "title": f"Pastry Chef {i}", "company_info": "Bakery"} for i in range(10)]
+
+        alone = self.filter.score([posting])[0]
+        self.assertEqual(self.filter.score([posting] + others)[0], alone)
+        self.assertEqual(self.filter.score(others[:3] + [posting])[3], alone)
+
+    def test_ambiguous_band_goes_to_llm(self):
+        posting = {"url": "maybe", "title": "Solutions Engineer", "company_info": "Fintech startup"}
+        decision = self.filter.classify([posting])[0]
+
+        self.assertEqual((decision["decision"], decision["tier"]), ("accept", "llm"))
+        self.assertEqual(decision["reason"], "Python data work")
+        prompt = self.client.messages.create.call_args[1]["messages"][0]["content"]
+        self.assertIn("Solutions Engineer", prompt)
+        self.assertIn("Target profile", prompt)
+
+    def test_llm_rejection_and_errors(self):
+        self.filter.client = make_client('```json\n{"relevant": false, "reason": "Hardware role"}\n```')
+        posting = {"url": "maybe", "title": "Solutions Engineer"}
+        self.assertEqual(self.filter.filter([posting]), [])
+
+        self.filter.client = make_client("not json")
+        self.assertEqual(self.filter.filter([posting]), [posting])
+        self.assertEqual(self.filter.stats.summary()["llm_errors"], 1)
+
+    def test_stats_report_pass_rates_and_calls_avoided(self):
+        self.filter.classify([
+            {"url": "a", "title": "Recruiter"},
+            {"url": "b", "title": "Pastry Chef"},
+            {"url": "c", "title": "Solutions Engineer"},
+            {"url": "d", "job_title": "Backend Software Engineer",
+             "full_text": "Python data pipelines, distributed systems, remote"},
+        ])
+        summary = self.filter.stats.summary()
+
+        self.assertEqual(summary["evaluated"], 4)
+        self.assertEqual(summary["tiers"]["rules"]["pass_rate"], 0.75)
+        self.assertEqual(summary["tiers"]["tfidf"]["seen"], 3)
+        self.assertEqual(summary["llm_calls"], 1)
+        self.assertEqual(summary["llm_calls_avoided"], 0.75)
+        self.assertEqual(len(self.filter.stats.format_summary()), 4)
+
+    def test_empty_input(self):
+        self.assertEqual(self.filter.classify([]), [])
+        self.assertEqual(FilterStats().summary()["llm_calls_avoided"], 0.0)
+
+    def test_invalid_thresholds(self):
+        with self.assertRaises(ValueError):
+            RelevanceFilter(CRITERIA, client=self.client, accept_score=0.1, reject_score=0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
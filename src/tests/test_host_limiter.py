@@ -0,0 +1,195 @@
+"""
+Unit tests for per-domain adaptive rate limiting and the circuit breaker.
+"""
+
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from selenium.common.exceptions import TimeoutException, WebDriverException # type: ignore
+
+from src.scrapers.host_limiter import CircuitOpenError, HostLimiter, host_key, parse_retry_after
+from src.scrapers.http_fetcher import HttpJobFetcher
+from src.scrapers.job_app_scraper import AshbyJobScraper
+
+URL = "https://jobs.lever.co/acme/1"
+
+
+class TestHelpers(unittest.TestCase):
+    """Test cases for domain keys and header parsing."""
+
+    def test_host_key(self):
+        self.assertEqual(host_key("https://boards.greenhouse.io/acme/jobs/1"), "greenhouse.io")
+        self.assertEqual(host_key("https://boards-api.greenhouse.io/v1/boards/acme/jobs/1"), "greenhouse.io")
+        self.assertEqual(host_key("http://127.0.0.1:8000/jobs.lever.co/acme/1"), "127.0.0.1")
+        self.assertEqual(host_key("u"), "")
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("30"), 30.0)
+        self.assertIsNone(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class TestHostLimiter(unittest.TestCase):
+    """Test cases for the HostLimiter class."""
+
+    def test_paces_each_domain_separately(self):
+        limiter = HostLimiter(delay=0.1, burst=1)
+        start = time.monotonic()
+        limiter.acquire(URL)
+        limiter.acquire("https://jobs.ashbyhq.com/acme/1")
+        self.assertLess(time.monotonic() - start, 0.05)
+        limiter.acquire(URL)
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_unlimited_hosts_are_not_limited(self):
+        limiter = HostLimiter(delay=10, burst=1, unlimited_hosts={"127.0.0.1"})
+        for _ in range(5):
+            limiter.acquire("http://127.0.0.1:8000/jobs.lever.co/acme/1")
+        self.assertEqual(limiter.summary(), [])
+
+        # Nothing is exempt by default, not even a local server
+        limiter = HostLimiter(delay=10, burst=1)
+        limiter.acquire("http://127.0.0.1:8000/jobs.lever.co/acme/1")
+        self.assertEqual(limiter.summary()[0]["host"], "127.0.0.1")
+
+    def test_adapts_rate_to_responses(self):
+        limiter = HostLimiter(delay=1, max_rate=1.5, step=0.25)
+        for _ in range(4):
+            limiter.record(URL, 200, latency=0.2)
+        self.assertEqual(limiter.summary()[0]["rate"], 1.5)
+
+        limiter.record(URL, 429, latency=0.2)
+        self.assertEqual(limiter.summary()[0]["rate"], 0.75)
+        limiter.record(URL, error=TimeoutError("read timed out"))
+        row = limiter.summary()[0]
+        self.assertEqual((row["rate"], row["throttled"]), (0.375, 2))
+
+    def test_slows_down_when_latency_rises(self):
+        limiter = HostLimiter(delay=1, max_rate=5, step=0.5)
+        for _ in range(3):
+            limiter.record(URL, 200, latency=0.1)
+        rate = limiter.summary()[0]["rate"]
+        limiter.record(URL, 200, latency=2.0)
+        self.assertLess(limiter.summary()[0]["rate"], rate)
+
+    def test_retry_after_holds_the_domain_back(self):
+        limiter = HostLimiter(delay=0, max_rate=100, min_rate=1, burst=1)
+        limiter.acquire(URL)
+        limiter.record(URL, 429, retry_after=0.2)
+        start = time.monotonic()
+        limiter.acquire(URL)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_long_retry_after_parks_the_domain(self):
+        limiter = HostLimiter(delay=0, max_rate=100, burst=1, retry_after_park=5)
+        limiter.acquire(URL)
+        limiter.record(URL, 429, retry_after=120)
+
+        start = time.monotonic()
+        with self.assertRaises(CircuitOpenError) as context:
+            limiter.acquire(URL)
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertGreater(context.exception.retry_at - time.time(), 110)
+        self.assertEqual(limiter.summary()[0]["breaker"], "open")
+
+    def test_breaker_parks_and_probes(self):
+        limiter = HostLimiter(delay=0, max_rate=100, failure_threshold=2, cooldown=0.1, max_cooldown=1)
+        limiter.record(URL, 503)
+        limiter.acquire(URL)
+        limiter.record(URL, 429)
+
+        with self.assertRaises(CircuitOpenError) as context:
+            limiter.acquire(URL)
+        self.assertEqual(context.exception.host, "lever.co")
+        self.assertGreater(limiter.retry_at(URL), time.time())
+        self.assertEqual(limiter.summary()[0]["breaker"], "open")
+
+        # A failed probe parks the domain for twice as long
+        time.sleep(0.12)
+        limiter.acquire(URL)
+        limiter.record(URL, 429)
+        self.assertGreater(limiter.retry_at(URL) - time.time(), 0.15)
+
+        time.sleep(0.22)
+        limiter.acquire(URL)
+        limiter.record(URL, 200)
+        limiter.acquire(URL)
+        row = limiter.summary()[0]
+        self.assertEqual((row["breaker"], row["trips"]), ("closed", 2))
+        self.assertIsNone(limiter.retry_at(URL))
+        self.assertIn("2 trips", limiter.format_summary()[0])
+
+    def test_request_records_exceptions(self):
+        limiter = HostLimiter(delay=0, failure_threshold=1, cooldown=60)
+        with self.assertRaises(TimeoutError):
+            with limiter.request(URL):
+                raise TimeoutError("page load timed out")
+        with self.assertRaises(CircuitOpenError):
+            limiter.acquire(URL)
+
+    def test_request_skips_errors_not_blamed_on_the_domain(self):
+        limiter = HostLimiter(delay=0, failure_threshold=1, cooldown=0.05)
+        limiter.record(URL, 503)
+        time.sleep(0.06)
+
+        # The probe fails for an unrelated reason, so the next request probes instead
+        with self.assertRaises(ValueError):
+            with limiter.request(URL, blame=lambda e: False):
+                raise ValueError("local failure")
+        limiter.acquire(URL)
+        limiter.record(URL, 200)
+        row = limiter.summary()[0]
+        self.assertEqual((row["breaker"], row["errors"]), ("closed", 1))
+
+
+class TestFetcherLimiting(unittest.TestCase):
+    """Test cases for host limiting in the HTTP fetcher."""
+
+    def test_throttled_responses_park_the_domain(self):
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=429, headers={"Retry-After": "0"})
+        limiter = HostLimiter(delay=0, failure_threshold=2, cooldown=60)
+        fetcher = HttpJobFetcher(session=session, host_limiter=limiter)
+
+        self.assertIsNone(fetcher.fetch("https://jobs.lever.co/acme", "Lever"))
+        self.assertIsNone(fetcher.fetch("https://jobs.lever.co/acme", "Lever"))
+        with self.assertRaises(CircuitOpenError):
+            fetcher.fetch("https://jobs.lever.co/acme", "Lever")
+        self.assertEqual(session.get.call_count, 2)
+
+
+class TestScraperLimiting(unittest.TestCase):
+    """Test cases for host limiting of browser page loads."""
+
+    def test_browser_start_failures_do_not_park_the_domain(self):
+        url = "https://jobs.ashbyhq.com/acme/1"
+        limiter = HostLimiter(delay=0, failure_threshold=1, cooldown=60)
+        scraper = AshbyJobScraper(host_limiter=limiter, client=MagicMock())
+        with patch("src.scrapers.job_app_scraper.create_driver", side_effect=RuntimeError("chromedriver missing")):
+            with self.assertRaises(RuntimeError):
+                scraper.load_page(url)
+
+        self.assertIsNone(limiter.retry_at(url))
+        limiter.acquire(url)
+        self.assertEqual(limiter.summary()[0]["errors"], 0)
+
+    def test_only_timeouts_count_against_the_domain(self):
+        url = "https://jobs.ashbyhq.com/acme/1"
+        limiter = HostLimiter(delay=0, failure_threshold=1, cooldown=60)
+        driver = MagicMock()
+        scraper = AshbyJobScraper(host_limiter=limiter, client=MagicMock(), driver_provider=lambda: driver)
+
+        driver.get.side_effect = WebDriverException("chrome not reachable")
+        with self.assertRaises(WebDriverException):
+            scraper.load_page(url)
+        self.assertIsNone(limiter.retry_at(url))
+
+        driver.get.side_effect = TimeoutException("page load timed out")
+        with self.assertRaises(TimeoutException):
+            scraper.load_page(url)
+        self.assertIsNotNone(limiter.retry_at(url))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Unit tests for the browserless HTTP job fetcher.
+"""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.scrapers.host_limiter import HostLimiter
+from src.scrapers.http_fetcher import EXPIRED, NOT_MODIFIED, HttpJobFetcher, parse_greenhouse_url, parse_lever_url
+from src.scrapers.job_app_scraper import GreenhouseJobScraper, LeverJobScraper
+
+LEVER_ID = "4af33618-2c94-420c-9337-a1ea2ae92801"
+DESCRIPTION = "We are hiring engineers to build our data platform. " * 10
+
+
+def make_response(status_code=200, json_data=None, text="", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    if json_data is None:
+        response.json.side_effect = ValueError("no json")
+    else:
+        response.json.return_value = json_data
+    return response
+
+
+class TestUrlParsing(unittest.TestCase):
+    """Test cases for posting URL parsing."""
+
+    def test_greenhouse_urls(self):
+        self.assertEqual(parse_greenhouse_url("https://boards.greenhouse.io/acme/jobs/123"), ("acme", "123"))
+        self.assertEqual(parse_greenhouse_url("https://job-boards.greenhouse.io/acme/jobs/123?gh_src=x"), ("acme", "123"))
+        self.assertEqual(parse_greenhouse_url("https://boards.greenhouse.io/embed/job_app?for=acme&token=123"), ("acme", "123"))
+        self.assertIsNone(parse_greenhouse_url("https://boards.greenhouse.io/acme"))
+
+    def test_lever_urls(self):
+        self.assertEqual(parse_lever_url(f"https://jobs.lever.co/cardless/{LEVER_ID}/"), ("cardless", LEVER_ID))
+        self.assertEqual(parse_lever_url(f"https://jobs.lever.co/cardless/{LEVER_ID}/apply"), ("cardless", LEVER_ID))
+        self.assertIsNone(parse_lever_url("https://jobs.lever.co/cardless"))
+
+
+class TestHttpJobFetcher(unittest.TestCase):
+    """Test cases for the HttpJobFetcher class."""
+
+    def setUp(self):
+        self.session = MagicMock()
+        self.fetcher = HttpJobFetcher(session=self.session, host_limiter=HostLimiter(delay=0, burst=100))
+
+    def test_greenhouse_api(self):
+        self.session.get.return_value = make_response(json_data={
+            "title": "Backend Engineer",
+            "location": {"name": "Remote"},
+            "content": "&lt;p&gt;" + DESCRIPTION + "&lt;/p&gt;"
+        })
+
+        job_data = self.fetcher.fetch("https://boards.greenhouse.io/acme/jobs/123", "Greenhouse")
+
+        self.session.get.assert_called_once()
+        self.assertIn("boards-api.greenhouse.io/v1/boards/acme/jobs/123", self.session.get.call_args[0][0])
+        self.assertEqual(job_data["job_title"], "Backend Engineer")
+        self.assertEqual(job_data["platform"], "Greenhouse")
+        self.assertEqual(job_data["url"], "https://boards.greenhouse.io/acme/jobs/123")
+        self.assertIn("Remote", job_data["full_text"])
+        self.assertNotIn("<p>", job_data["full_text"])
+        self.assertEqual(job_data["structured"], {"job_title": "Backend Engineer", "location": "Remote"})
+
+    def test_lever_api(self):
+        self.session.get.return_value = make_response(json_data={
+            "text": "Data Engineer",
+            "categories": {"location": "NYC", "commitment": "Full-time"},
+            "descriptionPlain": DESCRIPTION,
+            "lists": [{"text": "Requirements", "content": "<li>Python</li><li>SQL</li>"}],
+        })
+
+        job_data = self.fetcher.fetch(f"https://jobs.lever.co/cardless/{LEVER_ID}", "Lever")
+
+        self.assertEqual(job_data["job_title"], "Data Engineer")
+        self.assertIn("Requirements\nPython\nSQL", job_data["full_text"])
+
+    def test_falls_back_to_html_when_api_fails(self):
+        page = f"<html><head><title>Backend Engineer | Acme</title><script>var x=1;</script></head><body><div>{DESCRIPTION}</div></body></html>"
+        self.session.get.side_effect = [make_response(status_code=404), make_response(text=page)]
+
+        job_data = self.fetcher.fetch("https://boards.greenhouse.io/acme/jobs/123", "Greenhouse")
+
+        self.assertEqual(job_data["job_title"], "Backend Engineer")
+        self.assertNotIn("var x", job_data["full_text"])
+        self.assertEqual(job_data["structured"], {})
+
+    def test_html_reads_json_ld_before_stripping_scripts(self):
+        posting = {"@type": "JobPosting", "title": "Backend Engineer", "hiringOrganization": {"name": "Acme"}}
+        page = (f'<html><head><script type="application/ld+json">{json.dumps(posting)}</script></head>'
+                f"<body><div>{DESCRIPTION}</div></body></html>")
+        self.session.get.return_value = make_response(text=page)
+
+        job_data = self.fetcher.fetch("https://jobs.ashbyhq.com/acme/1", "Ashby")
+
+        self.assertEqual(job_data["structured"], {"job_title": "Backend Engineer", "company_name": "Acme"})
+        self.assertNotIn("JobPosting", job_data["full_text"])
+
+    def test_returns_none_without_usable_text(self):
+        self.session.get.return_value = make_response(text="<html><body><div id='app'></div></body></html>")
+        self.assertIsNone(self.fetcher.fetch("https://jobs.lever.co/cardless", "Lever"))
+
+    def test_conditional_request(self):
+        url = f"https://jobs.lever.co/cardless/{LEVER_ID}"
+        self.session.get.return_value = make_response(
+            json_data={"text": "Data Engineer", "descriptionPlain": DESCRIPTION},
+            headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        job_data = self.fetcher.fetch(url, "Lever")
+        self.assertEqual(job_data["http_validators"], {"etag": '"abc"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        self.assertIsNone(self.session.get.call_args[1]["headers"])
+
+        self.session.get.return_value = make_response(status_code=304)
+        job_data = self.fetcher.fetch(url, "Lever", job_data["http_validators"])
+        self.assertEqual(job_data, {"url": url, "platform": "Lever", "status": NOT_MODIFIED})
+        self.assertEqual(self.session.get.call_args[1]["headers"],
+                         {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    def test_missing_page_is_expired(self):
+        url = f"https://jobs.lever.co/cardless/{LEVER_ID}"
+        # The API 404s for unknown boards too, so only the posting page's 404 marks it expired
+        self.session.get.side_effect = [make_response(status_code=404), make_response(status_code=404)]
+        self.assertEqual(self.fetcher.fetch(url, "Lever"), {"url": url, "platform": "Lever", "status": EXPIRED})
+
+
+class TestStaticFetchFallback(unittest.TestCase):
+    """Test cases for the HTTP-first path in the platform scrapers."""
+
+    def test_static_fetch_skips_browser(self):
+        fetcher = MagicMock()
+        fetcher.fetch.return_value = {"url": "u", "job_title": "t", "full_text": DESCRIPTION, "platform": "Lever"}
+        provider = MagicMock()
+        scraper = LeverJobScraper(driver_provider=provider, http_fetcher=fetcher, compact=False)
+
+        self.assertEqual(scraper.fetch_job_data("u")["full_text"], DESCRIPTION)
+        provider.assert_not_called()
+
+    def test_falls_back_to_browser(self):
+        fetcher = MagicMock()
+        fetcher.fetch.return_value = None
+        scraper = GreenhouseJobScraper(driver=MagicMock(), http_fetcher=fetcher, compact=False)
+
+        with patch.object(GreenhouseJobScraper, "fetch_with_browser", return_value={"full_text": "from browser"}) as browser:
+            self.assertEqual(scraper.fetch_job_data("u")["full_text"], "from browser")
+        browser.assert_called_once_with("u")
+
+    def test_browser_path_reads_single_payload(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = {"title": "Data Engineer", "document_title": "Data Engineer | Acme",
+                                              "text": DESCRIPTION, "main_content_matched": True}
+        scraper = LeverJobScraper(driver=driver, use_http=False, compact=False)
+
+        job_data = scraper.fetch_job_data("u")
+
+        self.assertEqual(job_data["job_title"], "Data Engineer")
+        self.assertEqual(job_data["full_text"], DESCRIPTION)
+        driver.execute_script.assert_called_once()
+        self.assertEqual(driver.execute_script.call_args[0][1], ".posting-headline h2")
+        driver.find_elements.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
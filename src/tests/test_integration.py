@@ -0,0 +1,269 @@
+"""
+Integration tests for the streaming pipeline in src/main.py, with fake scrapers, LLM and sheet.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.extraction.async_extractor import AsyncExtractor
+from src.extraction.compaction import CompactionStats
+from src.filtering.claude_filter import FilterCriteria, RelevanceFilter
+from src.filtering.embedding_index import EmbeddingIndex, HashingEmbedder
+from src.filtering.near_duplicates import NearDuplicateIndex
+from src.main import Pipeline, Stage, _DONE
+from src.scrapers import batch_scraper
+from src.scrapers.crawl_store import CrawlStore
+from src.scrapers.host_limiter import CircuitOpenError
+from src.utils import config
+from src.sheets_integration.sheets_manager import SheetsManager
+from src.tests.test_sheets import FakeSheetsService
+
+CRITERIA = FilterCriteria(profile="Python backend engineer", title_keywords=["engineer"],
+                          exclude_title_keywords=["sales"], locations=[], exclude_locations=[])
+
+
+class FakeScraper:
+    """Platform scraper whose fetch returns canned text and tracks concurrency."""
+
+    platform = "Lever"
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, **kwargs):
+        pass
+
+    def fetch_job_data(self, url, validators=None):
+        with FakeScraper.lock:
+            FakeScraper.active += 1
+            FakeScraper.peak = max(FakeScraper.peak, FakeScraper.active)
+        time.sleep(0.01)
+        with FakeScraper.lock:
+            FakeScraper.active -= 1
+        if url.endswith("broken"):
+            raise RuntimeError("page did not load")
+        title = "Account Sales Executive" if "sales" in url else "Backend Engineer"
+        return {"url": url, "job_title": title, "platform": "Lever",
+                "full_text": f"{title}\nBuild Python backend services.\nApply now\n"}
+
+
+class ParkedScraper(FakeScraper):
+    """Finds the domain of each posting listed in park parked for park_seconds on the first attempt."""
+
+    park = set()
+    park_seconds = 0.1
+    attempts = {}
+
+    def fetch_job_data(self, url, validators=None):
+        ParkedScraper.attempts[url] = ParkedScraper.attempts.get(url, 0) + 1
+        if url in ParkedScraper.park and ParkedScraper.attempts[url] == 1:
+            raise CircuitOpenError("lever.co", time.time() + ParkedScraper.park_seconds)
+        return super().fetch_job_data(url, validators)
+
+
+class FakeMessages:
+    def __init__(self):
+        self.calls = 0
+        # URLs whose replies are never valid JSON, so their extraction fails
+        self.garbled = set()
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.001)
+        prompt = kwargs["messages"][0]["content"]
+        url = prompt.split("source_url: ")[1].split()[0]
+        text = "not json" if url in self.garbled else json.dumps({"job_title": "Backend Engineer", "source_url": url})
+        return SimpleNamespace(content=[SimpleNamespace(text=text)],
+                               usage=SimpleNamespace(input_tokens=100, output_tokens=20))
+
+
+class BrokenExtractor:
+    """Extractor whose stream fails after taking its first posting."""
+
+    async def extract_stream(self, source, ordered=False):
+        async for _ in source:
+            raise RuntimeError("extractor crashed")
+        yield  # pragma: no cover
+
+
+class TestStage(unittest.TestCase):
+    """Test cases for the Stage worker pool."""
+
+    def test_batches_and_terminates(self):
+        inbox, outbox = queue.Queue(), queue.Queue()
+        for i in range(10):
+            inbox.put({"url": str(i)})
+        inbox.put(_DONE)
+        batches = []
+
+        def process(batch):
+            batches.append(len(batch))
+            if batch[0]["url"] == "0":
+                raise ValueError("boom")
+            return batch
+
+        Stage("test", process, inbox, outbox, workers=1, batch_size=4).start().join()
+
+        outputs = []
+        while True:
+            item = outbox.get()
+            if item is _DONE:
+                break
+            outputs.append(item)
+        self.assertEqual(batches, [4, 4, 2])
+        self.assertEqual(len(outputs), 10)
+        self.assertEqual(sum("error" in item for item in outputs), 4)
+
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for the end-to-end Pipeline."""
+
+    def setUp(self):
+        FakeScraper.active = FakeScraper.peak = 0
+        fd, self.output = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        self.addCleanup(os.remove, self.output)
+        self.store = CrawlStore(":memory:")
+        self.addCleanup(self.store.close)
+        self.messages = FakeMessages()
+        self.sheet_service = FakeSheetsService()
+        patcher = patch.object(batch_scraper, "get_scraper_class", return_value=FakeScraper)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def pipeline(self, **kwargs):
+        extractor = AsyncExtractor(client=SimpleNamespace(messages=self.messages), concurrency=3,
+                                   requests_per_minute=100000, tokens_per_minute=10 ** 9, cache_mode="bypass")
+        relevance_filter = RelevanceFilter(CRITERIA, client=MagicMock(), accept_score=0.1, reject_score=0.05)
+        sheets = SheetsManager("sheet-id", service=self.sheet_service, snapshot_path=None, requests_per_minute=0,
+                               columns=["source_url", "job_title"])
+        options = dict(fetch_workers=4, driver_factory=MagicMock(), extractor=extractor,
+                       relevance_filter=relevance_filter, store=self.store, sheets=sheets, queue_size=2,
+                       compaction_stats=CompactionStats())
+        options.update(kwargs)
+        return Pipeline(self.output, **options)
+
+    def test_runs_all_stages(self):
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(20)]
+        source = urls + [urls[0], "https://jobs.lever.co/acme/sales", "https://jobs.lever.co/acme/broken"]
+
+        counts = self.pipeline().run(source)
+
+        self.assertEqual(counts, {"discovered": 23, "duplicates": 1, "unchanged": 0, "filtered": 1,
+                                  "succeeded": 20, "failed": 1, "expired": 0, "near_duplicates": 0, "deferred": 0})
+        self.assertEqual(self.messages.calls, 20)
+        self.assertGreater(FakeScraper.peak, 1)
+        with open(self.output) as f:
+            results = [json.loads(line) for line in f]
+        self.assertEqual({r["source_url"] for r in results if "error" not in r}, set(urls))
+        self.assertEqual(len(self.sheet_service.grid), 21)
+        self.assertEqual(self.store.get("https://jobs.lever.co/acme/sales")["extract_status"], "filtered")
+        self.assertEqual(self.store.get(urls[3])["extract_status"], "done")
+
+    def test_rerun_skips_processed_postings(self):
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(5)] + ["https://jobs.lever.co/acme/sales"]
+        self.pipeline().run(urls)
+        self.messages.calls = 0
+
+        counts = self.pipeline().run(urls + ["https://jobs.lever.co/acme/new"])
+
+        self.assertEqual(counts["duplicates"], 6)
+        self.assertEqual(counts["succeeded"], 1)
+        self.assertEqual(self.messages.calls, 1)
+
+    def test_near_duplicates_skip_extraction(self):
+        # Every fake posting has the same text, so all but the first are copies under other URLs
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(5)]
+        index = NearDuplicateIndex(None)
+
+        counts = self.pipeline(fetch_workers=1, near_duplicates=index).run(urls)
+
+        self.assertEqual((counts["succeeded"], counts["near_duplicates"]), (1, 4))
+        self.assertEqual(self.messages.calls, 1)
+        self.assertEqual(index.clusters(), {urls[0]: urls})
+        self.assertEqual(self.store.get(urls[4])["extract_status"], "filtered")
+        self.assertIn(urls[0], self.store.get(urls[4])["last_error"])
+
+    def test_copies_take_over_from_a_failed_canonical_posting(self):
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(5)]
+        index = NearDuplicateIndex(None)
+        self.messages.garbled = {urls[0]}
+
+        first = self.pipeline(fetch_workers=1, near_duplicates=index).run(urls)
+        second = self.pipeline(fetch_workers=1, near_duplicates=index).run(urls)
+
+        # A copy is extracted in place of the failed posting (in the first run if it arrives
+        # after the failure, else in the next one), and the other copies are settled behind it
+        self.assertEqual(first["failed"], 1)
+        self.assertEqual(first["succeeded"] + second["succeeded"], 1)
+        states = {url: self.store.get(url) for url in urls[1:]}
+        extracted = [url for url, state in states.items() if state["extract_status"] == "done"]
+        self.assertEqual(len(extracted), 1)
+        self.assertEqual(index.canonical(urls[0]), extracted[0])
+        for url, state in states.items():
+            if url != extracted[0]:
+                self.assertEqual(state["extract_status"], "filtered")
+                self.assertIn(extracted[0], state["last_error"])
+
+    def test_results_are_embedded_for_matching(self):
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(3)]
+        index = EmbeddingIndex(None, embedder=HashingEmbedder())
+
+        self.pipeline(embedding_index=index).run(urls + ["https://jobs.lever.co/acme/broken"])
+
+        self.assertEqual(len(index), 3)
+        self.assertIn(index.query("Backend Engineer", k=1)[0]["url"], urls)
+
+    def test_compaction_happens_in_its_own_stage(self):
+        stats = CompactionStats()
+        self.pipeline(relevance_filter=None, store=None, sheets=None, compaction_stats=stats).run(
+            ["https://jobs.lever.co/acme/1"])
+        self.assertEqual(stats.summary()[0]["postings"], 1)
+
+    def test_parked_domain_is_requeued(self):
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(6)]
+        ParkedScraper.park, ParkedScraper.park_seconds, ParkedScraper.attempts = set(urls[:2]), 0.1, {}
+
+        with patch.object(batch_scraper, "get_scraper_class", return_value=ParkedScraper):
+            counts = self.pipeline().run(urls)
+
+        self.assertEqual((counts["succeeded"], counts["deferred"]), (6, 0))
+        self.assertEqual(ParkedScraper.attempts[urls[0]], 2)
+        self.assertEqual(self.messages.calls, 6)
+
+    def test_long_park_is_left_for_the_next_run(self):
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(3)]
+        ParkedScraper.park, ParkedScraper.park_seconds, ParkedScraper.attempts = {urls[0]}, 3600, {}
+
+        with patch.object(batch_scraper, "get_scraper_class", return_value=ParkedScraper), \
+                patch.object(config, "HOST_REQUEUE_MAX_WAIT", 1):
+            counts = self.pipeline().run(urls)
+
+        self.assertEqual((counts["succeeded"], counts["deferred"]), (2, 1))
+        self.assertEqual(self.store.due_urls(urls), [urls[0]])
+
+    def test_extractor_failure_does_not_hang(self):
+        urls = [f"https://jobs.lever.co/acme/{i}" for i in range(20)]
+        counts = {}
+        runner = threading.Thread(target=lambda: counts.update(
+            self.pipeline(extractor=BrokenExtractor(), relevance_filter=None).run(urls)), daemon=True)
+        runner.start()
+        runner.join(timeout=30)
+
+        self.assertFalse(runner.is_alive())
+        # The posting the extractor had taken and those still queued are all reported as failed
+        self.assertEqual((counts["succeeded"], counts["failed"]), (0, 20))
+        with open(self.output) as f:
+            self.assertIn("Extract stage failed", json.loads(f.readline())["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
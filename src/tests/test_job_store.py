@@ -0,0 +1,129 @@
+"""
+Unit tests for the partitioned Parquet job store and its readers.
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.scrapers.batch_scraper import read_urls
+from src.scrapers.job_store import GALLERY_SCHEMA, GalleryJob, JobStore
+from src.scrapers.startup_gall_scrape import StartupJobScraper
+from src.sheets_integration.sheets_manager import read_results
+
+DAY = 86400
+
+
+def posting(i, platform="Lever"):
+    return {"source_url": f"https://jobs.lever.co/acme/{i}", "job_title": f"Engineer {i}", "platform": platform,
+            "required_skills": ["Python", "SQL"], "job_description": "Build pipelines"}
+
+
+class TestJobStore(unittest.TestCase):
+    """Test cases for the JobStore class."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "jobs")
+
+    def test_rows_are_buffered_and_partitioned(self):
+        store = JobStore(self.path, flush_rows=3)
+        store.append(posting(1), scraped_at=0)
+        store.append(posting(2, "Greenhouse"), scraped_at=0)
+        self.assertFalse(os.path.exists(self.path))
+
+        store.append(posting(3), scraped_at=DAY)
+        partitions = sorted(os.path.relpath(root, self.path) for root, _, files in os.walk(self.path) if files)
+        self.assertEqual(partitions, ["scrape_date=1970-01-01/platform=Greenhouse",
+                                      "scrape_date=1970-01-01/platform=Lever",
+                                      "scrape_date=1970-01-02/platform=Lever"])
+        self.assertEqual((store.rows_written, store.files_written), (3, 3))
+
+        # Later appends add files instead of rewriting earlier ones
+        store.append(posting(4), scraped_at=DAY)
+        store.close()
+        self.assertEqual(store.count(), 4)
+
+    def test_failed_write_keeps_rows_buffered(self):
+        store = JobStore(self.path, flush_rows=10)
+        store.append(posting(1), scraped_at=0)
+        store.append(posting(2, "Greenhouse"), scraped_at=0)
+
+        with patch("src.scrapers.job_store.pq.write_table", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                store.flush()
+        self.assertEqual((store.rows_written, store.files_written), (0, 0))
+
+        self.assertEqual(store.flush(), 2)
+        self.assertEqual(store.count(), 2)
+        self.assertEqual([files for _, _, files in os.walk(self.path) if files and files[0].startswith(".")], [])
+
+    def test_column_projection_and_partition_filters(self):
+        with JobStore(self.path) as store:
+            for i, platform in enumerate(["Lever", "Greenhouse", "Lever"]):
+                store.append(posting(i, platform), scraped_at=i * DAY)
+
+        store = JobStore(self.path)
+        table = store.read(columns=["source_url", "required_skills"], platforms=["Lever"], since="1970-01-02")
+        self.assertEqual(table.column_names, ["source_url", "required_skills"])
+        self.assertEqual(table.to_pylist(), [{"source_url": "https://jobs.lever.co/acme/2",
+                                              "required_skills": ["Python", "SQL"]}])
+        self.assertEqual(store.count(until="1970-01-02"), 2)
+        rows = list(store.iter_rows(columns=["job_title", "platform"], platforms=["Greenhouse"]))
+        self.assertEqual(rows, [{"job_title": "Engineer 1", "platform": "Greenhouse"}])
+
+    def test_empty_store(self):
+        store = JobStore(self.path)
+        self.assertEqual(store.read(columns=["source_url"]).num_rows, 0)
+        self.assertEqual(list(store.iter_rows()), [])
+        self.assertEqual(store.count(), 0)
+
+    def test_downstream_readers(self):
+        with JobStore(self.path) as store:
+            store.extend([posting(1), posting(2)])
+        results = read_results(self.path)
+        self.assertEqual([result["source_url"] for result in results],
+                         ["https://jobs.lever.co/acme/1", "https://jobs.lever.co/acme/2"])
+        self.assertEqual(results[0]["platform"], "Lever")
+
+        gallery_path = os.path.join(self.path, "gallery")
+        with JobStore(gallery_path, schema=GALLERY_SCHEMA) as gallery:
+            gallery.extend([GalleryJob("https://jobs.lever.co/acme/1", "Engineer", "Acme")] * 2, platform="Lever")
+        self.assertEqual(read_urls(gallery_path), ["https://jobs.lever.co/acme/1"])
+
+
+class TestGallerySaving(unittest.TestCase):
+    """Test cases for saving organized gallery jobs to CSV and the job store."""
+
+    def setUp(self):
+        with patch.object(StartupJobScraper, "setup_driver"):
+            self.scraper = StartupJobScraper()
+        self.scraper.organize_data(["Engineer", "Designer", "Engineer"], ["Acme", "Beta", "Acme"],
+                                   ["https://jobs.lever.co/acme/1", "https://example.com/jobs/2",
+                                    "https://jobs.lever.co/acme/1"])
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def test_save_to_csv(self):
+        self.assertIsInstance(self.scraper.organized_jobs["https://jobs.lever.co/acme/1"], GalleryJob)
+        path = os.path.join(self.dir, "jobs.csv")
+        self.scraper.save_to_csv(path)
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows, [{"url": "https://jobs.lever.co/acme/1", "title": "Engineer", "company_info": "Acme"},
+                                {"url": "https://example.com/jobs/2", "title": "Designer", "company_info": "Beta"}])
+
+    def test_save_to_store(self):
+        store = JobStore(os.path.join(self.dir, "gallery"), schema=GALLERY_SCHEMA)
+        self.scraper.save_to_store(store)
+        rows = store.read(columns=["url", "platform"]).to_pylist()
+        self.assertEqual(sorted((row["platform"], row["url"]) for row in rows),
+                         [("Lever", "https://jobs.lever.co/acme/1"), ("other", "https://example.com/jobs/2")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Unit tests for the LLM extraction cache.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.extraction.llm_cache import LLMCache, cache_key
+from src.scrapers.job_app_scraper import LeverJobScraper
+
+JOB_DATA = {"url": "https://jobs.lever.co/acme/1", "job_title": "Engineer",
+            "full_text": "Engineer\nBuild   things.", "platform": "Lever"}
+
+
+def make_client(text='{"job_title": "Engineer"}'):
+    client = MagicMock()
+    client.messages.create.return_value.content = [MagicMock(text=text)]
+    return client
+
+
+class TestCacheKey(unittest.TestCase):
+    """Test cases for content addressing."""
+
+    def test_whitespace_insensitive(self):
+        self.assertEqual(cache_key("Build   things.\n", "Lever"), cache_key("Build things.", "Lever"))
+
+    def test_platform_and_prompt_version_change_key(self):
+        base = cache_key("Build things.", "Lever", "1")
+        self.assertNotEqual(base, cache_key("Build things.", "Ashby", "1"))
+        self.assertNotEqual(base, cache_key("Build things.", "Lever", "2"))
+
+
+class TestLLMCache(unittest.TestCase):
+    """Test cases for the LLMCache class."""
+
+    def test_hit_and_miss_counters(self):
+        cache = LLMCache(":memory:")
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", {"job_title": "Engineer"})
+        self.assertEqual(cache.get("k"), {"job_title": "Engineer"})
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_ttl_expiry(self):
+        cache = LLMCache(":memory:", ttl_days=1)
+        with patch("src.extraction.llm_cache.time.time", return_value=1000.0):
+            cache.put("k", {"a": 1})
+        with patch("src.extraction.llm_cache.time.time", return_value=1000.0 + 2 * 86400):
+            self.assertIsNone(cache.get("k"))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = LLMCache(":memory:", ttl_days=0, max_entries=2)
+        with patch("src.extraction.llm_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.put("a", {"v": "a"})
+            cache.put("b", {"v": "b"})
+            cache.get("a")
+            cache.put("c", {"v": "c"})
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+    def test_persists_across_instances(self):
+        fd, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        LLMCache(path).put("k", {"a": 1})
+        self.assertEqual(LLMCache(path).get("k"), {"a": 1})
+
+
+class TestProcessWithLLMCache(unittest.TestCase):
+    """Test cases for cache use in JobScraper.process_with_llm."""
+
+    def _scraper(self, cache, mode):
+        scraper = LeverJobScraper(driver=MagicMock(), use_http=False, cache=cache, cache_mode=mode)
+        scraper.client = make_client()
+        return scraper
+
+    def test_second_call_is_served_from_cache(self):
+        cache = LLMCache(":memory:")
+        scraper = self._scraper(cache, "use")
+        first = scraper.process_with_llm(JOB_DATA, "Lever")
+        second = scraper.process_with_llm(dict(JOB_DATA, url="https://jobs.lever.co/acme/2"), "Lever")
+
+        self.assertEqual(scraper.client.messages.create.call_count, 1)
+        self.assertEqual(first["job_title"], second["job_title"])
+        self.assertEqual(second["source_url"], "https://jobs.lever.co/acme/2")
+
+    def test_refresh_skips_reads_but_writes(self):
+        cache = LLMCache(":memory:")
+        cache.put(cache_key(JOB_DATA["full_text"], "Lever"), {"job_title": "Stale"})
+        scraper = self._scraper(cache, "refresh")
+
+        self.assertEqual(scraper.process_with_llm(JOB_DATA, "Lever")["job_title"], "Engineer")
+        self.assertEqual(cache.get(cache_key(JOB_DATA["full_text"], "Lever"))["job_title"], "Engineer")
+
+    def test_bypass_ignores_cache(self):
+        cache = LLMCache(":memory:")
+        scraper = self._scraper(cache, "bypass")
+        scraper.process_with_llm(JOB_DATA, "Lever")
+        scraper.process_with_llm(JOB_DATA, "Lever")
+
+        self.assertEqual(scraper.client.messages.create.call_count, 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_failed_extractions_are_not_cached(self):
+        cache = LLMCache(":memory:")
+        scraper = self._scraper(cache, "use")
+        scraper.client = make_client("not json")
+
+        self.assertIn("error", scraper.process_with_llm(JOB_DATA, "Lever"))
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Unit tests for MinHash/LSH near-duplicate posting detection.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from src.filtering.near_duplicates import NearDuplicateIndex, posting_fingerprint_text, shingles
+
+VOCABULARY = ["python", "data", "pipelines", "backend", "services", "remote", "team", "build", "scale", "cloud",
+              "design", "own", "ship", "api", "customers", "platform", "reliability", "mentor", "hiring", "growth"]
+
+
+def posting_text(seed, words=300):
+    rng = random.Random(seed)
+    return " ".join(f"{rng.choice(VOCABULARY)}{rng.randint(0, 30)}" for _ in range(words))
+
+
+class TestShingles(unittest.TestCase):
+    """Test cases for shingling and fingerprint text."""
+
+    def test_ignores_case_and_punctuation(self):
+        self.assertEqual(shingles("Build Python backend services, at scale!", size=3),
+                         shingles("build python   backend services at SCALE", size=3))
+        self.assertEqual(len(shingles("one two", size=5)), 1)
+        self.assertEqual(shingles("", size=5), set())
+
+    def test_fingerprint_text(self):
+        job_data = {"job_title": "Backend Engineer", "company_info": "Acme", "full_text": "Build things", "url": "u"}
+        self.assertEqual(posting_fingerprint_text(job_data), "Backend Engineer\nAcme\nBuild things")
+        self.assertEqual(posting_fingerprint_text({"job_title": "Not found", "full_text": "Build"}), "Build")
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Test cases for the NearDuplicateIndex class."""
+
+    def setUp(self):
+        self.index = NearDuplicateIndex(None)
+
+    def test_signature_estimates_jaccard(self):
+        text_a, text_b = posting_text(1), posting_text(1) + " " + posting_text(2, words=60)
+        a, b = shingles(text_a), shingles(text_b)
+        estimate = (self.index.signature(text_a) == self.index.signature(text_b)).mean()
+        self.assertAlmostEqual(estimate, len(a & b) / len(a | b), delta=0.1)
+        self.assertLess((self.index.signature(posting_text(1)) == self.index.signature(posting_text(2))).mean(), 0.1)
+
+    def test_signature_does_not_overflow(self):
+        # The vectorized hashing must match the same arithmetic on unbounded Python ints
+        text = posting_text(3, words=50)
+        p, mask = (1 << 61) - 1, (1 << 32) - 1
+        expected = [min(((int(a) * x + int(b)) % p) & mask for x in shingles(text))
+                    for a, b in zip(self.index._a, self.index._b)]
+        self.assertEqual(self.index.signature(text).tolist(), expected)
+
+    def test_estimates_track_exact_jaccard(self):
+        base = posting_text(1).split()
+        errors = []
+        for keep in (300, 240, 180, 120, 60):
+            text_a, text_b = " ".join(base), " ".join(base[:keep] + posting_text(keep, words=300 - keep).split())
+            a, b = shingles(text_a), shingles(text_b)
+            estimate = (self.index.signature(text_a) == self.index.signature(text_b)).mean()
+            errors.append(abs(estimate - len(a & b) / len(a | b)))
+        self.assertLess(max(errors), 0.15)
+        self.assertLess(sum(errors) / len(errors), 0.06)
+
+    def test_clusters_copies_of_a_posting(self):
+        body = posting_text(1)
+        self.assertEqual(self.index.add("https://startups.gallery/jobs/1", "Backend Engineer\nAcme\n" + body),
+                         "https://startups.gallery/jobs/1")
+        # The same role on another board, with its own header and footer
+        copy = "Backend Engineer - Acme | Greenhouse\n" + body + "\nApply for this job"
+        self.assertEqual(self.index.add("https://boards.greenhouse.io/acme/jobs/1", copy),
+                         "https://startups.gallery/jobs/1")
+        self.assertEqual(self.index.add("https://jobs.ashbyhq.com/acme/2", posting_text(2)),
+                         "https://jobs.ashbyhq.com/acme/2")
+
+        self.assertEqual(self.index.clusters(), {"https://startups.gallery/jobs/1": [
+            "https://startups.gallery/jobs/1", "https://boards.greenhouse.io/acme/jobs/1"]})
+        self.assertEqual(self.index.stats(), {"postings": 3, "clusters": 2, "duplicates": 1})
+        self.assertEqual(self.index.query(body)[0][0], "https://startups.gallery/jobs/1")
+
+    def test_readding_a_posting_replaces_it(self):
+        self.assertEqual(self.index.add("u1", posting_text(1)), "u1")
+        self.assertEqual(self.index.add("u1", posting_text(1)), "u1")
+        self.assertEqual(self.index.add("u1", posting_text(2)), "u1")
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.query(posting_text(1)), [])
+
+    def test_removing_the_canonical_posting_promotes_a_copy(self):
+        for url in ("u1", "u2", "u3"):
+            self.index.add(url, posting_text(1))
+        self.index.add("other", posting_text(2))
+
+        self.assertEqual(self.index.remove("u1"), ["u2", "u3"])
+        self.assertEqual(self.index.clusters(), {"u2": ["u2", "u3"]})
+        self.assertEqual(self.index.add("u1", posting_text(1)), "u2")
+        self.assertEqual(self.index.remove("u3"), ["u2", "u1"])
+        self.assertEqual(self.index.remove("missing"), [])
+
+    def test_empty_text_is_not_indexed(self):
+        self.assertEqual(self.index.add("u1", ""), "u1")
+        self.assertEqual(self.index.add("u2", "   "), "u2")
+        self.assertEqual(len(self.index), 0)
+
+    def test_bands_must_divide_permutations(self):
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(None, num_perm=128, bands=10)
+
+    def test_persists_across_runs(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "near_duplicates.sqlite")
+
+        index = NearDuplicateIndex(path)
+        index.add("u1", posting_text(1))
+        index.close()
+
+        index = NearDuplicateIndex(path)
+        self.assertEqual(index.add("u2", posting_text(1) + " apply now"), "u1")
+        index.add("u3", posting_text(1))
+        index.remove("u1")
+        index.close()
+
+        index = NearDuplicateIndex(path)
+        self.assertEqual(index.clusters(), {"u2": ["u2", "u3"]})
+        index.close()
+
+        # Signatures built with other parameters cannot be compared, so the index starts over
+        index = NearDuplicateIndex(path, num_perm=64, bands=8)
+        self.assertEqual(len(index), 0)
+        index.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Unit tests for the job record schema, tolerant JSON parsing and repair re-asks.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.extraction.async_extractor import AsyncExtractor
+from src.extraction.schema import (EXTRACTION_TOOL, EXTRACTION_TOOL_NAME, IncrementalJSONParser, JobRecord,
+                                   ParseStats, SchemaError, loads_tolerant, parse_extraction_message)
+from src.scrapers.job_app_scraper import LeverJobScraper
+
+CONTENT = {"url": "https://jobs.lever.co/acme/1", "full_text": "Data Engineer\nBuild pipelines", "platform": "Lever"}
+
+
+def tool_reply(data):
+    return SimpleNamespace(content=[SimpleNamespace(type="tool_use", name=EXTRACTION_TOOL_NAME, input=data)],
+                           usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+
+
+def text_reply(text):
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)],
+                           usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+
+
+class TestTolerantParsing(unittest.TestCase):
+    """Test cases for IncrementalJSONParser and loads_tolerant."""
+
+    def test_ignores_prose_and_fences(self):
+        text = 'Here is the data:\n```json\n{"job_title": "Engineer", "note": "uses {braces}"}\n```\nHope it helps!'
+        self.assertEqual(loads_tolerant(text), {"job_title": "Engineer", "note": "uses {braces}"})
+
+    def test_closes_truncated_object(self):
+        self.assertEqual(loads_tolerant('{"job_title": "Engineer", "required_skills": ["Python", "SQ'),
+                         {"job_title": "Engineer", "required_skills": ["Python", "SQ"]})
+        self.assertEqual(loads_tolerant('{"job_title": "Engineer", "compan'), {"job_title": "Engineer"})
+        self.assertEqual(loads_tolerant('{"job_title": "Engineer", "location":'),
+                         {"job_title": "Engineer", "location": None})
+
+    def test_trailing_commas(self):
+        self.assertEqual(loads_tolerant('{"benefits": ["Dental",],}'), {"benefits": ["Dental"]})
+
+    def test_incremental_feed(self):
+        parser = IncrementalJSONParser()
+        for chunk in ['Sure: {"job_', 'title": "Eng\\"ineer"', '} trailing {"ignored": 1}']:
+            parser.feed(chunk)
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.value(), {"job_title": 'Eng"ineer'})
+
+    def test_no_object(self):
+        with self.assertRaises(ValueError):
+            loads_tolerant("I could not find a job posting on this page.")
+
+
+class TestJobRecord(unittest.TestCase):
+    """Test cases for JobRecord validation and the extraction tool schema."""
+
+    def test_normalizes_values(self):
+        record = JobRecord.from_dict({"job_title": " Engineer ", "compensation": 150000, "benefits": "Dental",
+                                      "required_skills": ["Python", None, ""], "location": "N/A", "extra": 1})
+        self.assertEqual(record.job_title, "Engineer")
+        self.assertEqual(record.compensation, "150000")
+        self.assertEqual(record.benefits, ["Dental"])
+        self.assertEqual(record.required_skills, ["Python"])
+        self.assertIsNone(record.location)
+        self.assertEqual(len(record.to_dict()), 18)
+
+    def test_rejects_wrong_types(self):
+        with self.assertRaises(SchemaError) as context:
+            JobRecord.from_dict({"job_title": {"name": "Engineer"}, "benefits": [{"name": "Dental"}]})
+        self.assertEqual(len(context.exception.problems), 2)
+        with self.assertRaises(SchemaError):
+            JobRecord.from_dict(["not", "an", "object"])
+
+    def test_tool_schema_covers_every_field(self):
+        self.assertEqual(set(EXTRACTION_TOOL["input_schema"]["properties"]), set(JobRecord.from_dict({}).to_dict()))
+
+    def test_parse_message_prefers_tool_input(self):
+        record, method = parse_extraction_message(tool_reply({"job_title": "Engineer"}), CONTENT, "Lever")
+        self.assertEqual(method, "tool_use")
+        self.assertEqual(record["source_url"], CONTENT["url"])
+        self.assertEqual(record["platform"], "Lever")
+
+        record, method = parse_extraction_message(text_reply('{"job_title": "Engineer"}'), CONTENT, "Lever")
+        self.assertEqual((record["job_title"], method), ("Engineer", "text"))
+
+
+class TestRepair(unittest.TestCase):
+    """Test cases for the repair re-ask in the sync and async extraction paths."""
+
+    def test_sync_repair_resends_only_the_bad_reply(self):
+        stats = ParseStats()
+        scraper = LeverJobScraper(cache_mode="bypass", client=MagicMock(), parse_stats=stats)
+        scraper.client.messages.create.side_effect = [tool_reply({"job_title": {"nested": "Engineer"}}),
+                                                      tool_reply({"job_title": "Engineer"})]
+
+        result = scraper.process_with_llm(CONTENT, "Lever")
+
+        self.assertEqual(result["job_title"], "Engineer")
+        first, repair = scraper.client.messages.create.call_args_list
+        self.assertEqual(first[1]["tool_choice"], {"type": "tool", "name": EXTRACTION_TOOL_NAME})
+        repair_prompt = repair[1]["messages"][0]["content"]
+        self.assertNotIn("Build pipelines", repair_prompt)
+        self.assertIn("nested", repair_prompt)
+        self.assertEqual(stats.summary()[0]["repaired"], 1)
+
+    def test_async_failure_after_repair_is_counted(self):
+        stats = ParseStats()
+        client = MagicMock()
+
+        async def create(**kwargs):
+            return text_reply("Sorry, I cannot help with that.")
+        client.messages.create.side_effect = create
+        extractor = AsyncExtractor(client=client, cache_mode="bypass", repair_attempts=1, parse_stats=stats)
+
+        result = asyncio.run(extractor.extract(CONTENT))
+
+        self.assertIn("error", result)
+        self.assertEqual(client.messages.create.call_count, 2)
+        row = stats.summary()[0]
+        self.assertEqual((row["failed"], row["failure_rate"]), (1, 1.0))
+        self.assertIn("100% failure rate", stats.format_summary()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
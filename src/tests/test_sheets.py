@@ -0,0 +1,173 @@
+"""
+Unit tests for the diff-based Google Sheets sync, run against a local fake of the Sheets API.
+"""
+
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.sheets_integration.sheets_manager import SheetsManager, cell_value, column_letter
+
+COLUMNS = ["source_url", "job_title", "required_skills"]
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = MagicMock(status=status)
+
+
+class FakeRequest:
+    def __init__(self, service, method, kwargs):
+        self.service = service
+        self.method = method
+        self.kwargs = kwargs
+
+    def execute(self):
+        self.service.calls.append(self.method)
+        if self.service.failures:
+            raise FakeHttpError(self.service.failures.pop(0))
+        return getattr(self.service, "_" + self.method)(**self.kwargs)
+
+
+class FakeSheetsService:
+    """In-memory spreadsheet implementing the values get/update/append/batchUpdate calls used by SheetsManager."""
+
+    def __init__(self, rows=None):
+        self.grid = [list(row) for row in rows or []]
+        self.calls = []
+        self.failures = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        return FakeRequest(self, "get", kwargs)
+
+    def update(self, **kwargs):
+        return FakeRequest(self, "update", kwargs)
+
+    def append(self, **kwargs):
+        return FakeRequest(self, "append", kwargs)
+
+    def batchUpdate(self, **kwargs):
+        return FakeRequest(self, "batchUpdate", kwargs)
+
+    def _write(self, range, values):
+        row = int(re.search(r"![A-Z]+(\d+)", range).group(1))
+        for offset, row_values in enumerate(values):
+            while len(self.grid) < row + offset:
+                self.grid.append([])
+            self.grid[row + offset - 1] = list(row_values)
+
+    def _get(self, spreadsheetId, range):
+        # Like the real API: trailing empty cells are trimmed and empty sheets have no values key
+        rows = [list(row) for row in self.grid]
+        for row in rows:
+            while row and row[-1] == "":
+                row.pop()
+        return {"values": rows} if rows else {}
+
+    def _update(self, spreadsheetId, range, valueInputOption, body):
+        self._write(range, body["values"])
+        return {}
+
+    def _batchUpdate(self, spreadsheetId, body):
+        for data in body["data"]:
+            self._write(data["range"], data["values"])
+        return {}
+
+    def _append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        first_row = len(self.grid) + 1
+        self.grid.extend(list(row) for row in body["values"])
+        last_row = len(self.grid)
+        return {"updates": {"updatedRange": f"Jobs!A{first_row}:C{last_row}"}}
+
+
+def result(url, title="Engineer", skills=("Python",)):
+    return {"source_url": url, "job_title": title, "required_skills": list(skills)}
+
+
+class TestSheetsManager(unittest.TestCase):
+    """Test cases for the SheetsManager class."""
+
+    def setUp(self):
+        self.service = FakeSheetsService()
+        fd, self.snapshot_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        os.remove(self.snapshot_path)
+        self.addCleanup(lambda: os.path.exists(self.snapshot_path) and os.remove(self.snapshot_path))
+
+    def manager(self, **kwargs):
+        options = {"columns": COLUMNS, "snapshot_path": self.snapshot_path, "requests_per_minute": 0,
+                   "base_delay": 0}
+        options.update(kwargs)
+        return SheetsManager("sheet-id", service=self.service, **options)
+
+    def test_first_sync_writes_header_and_appends(self):
+        counts = self.manager().sync([result("a"), result("b", skills=["Go", "SQL"]), {"error": "x", "url": "c"}])
+
+        self.assertEqual(counts["appended"], 2)
+        self.assertEqual(self.service.grid, [COLUMNS, ["a", "Engineer", "Python"], ["b", "Engineer", "Go; SQL"]])
+        self.assertEqual(self.service.calls, ["get", "update", "append"])
+
+    def test_only_changed_rows_are_sent(self):
+        self.manager().sync([result("a"), result("b")])
+        self.service.calls = []
+
+        # A new manager reuses the on-disk snapshot instead of re-reading the sheet
+        counts = self.manager().sync([result("a"), result("b", title="Staff Engineer"), result("c")])
+
+        self.assertEqual(counts, {"appended": 1, "updated": 1, "unchanged": 1, "requests": 2})
+        self.assertEqual(self.service.calls, ["batchUpdate", "append"])
+        self.assertEqual(self.service.grid[2], ["b", "Staff Engineer", "Python"])
+        self.assertEqual(self.service.grid[3], ["c", "Engineer", "Python"])
+
+        self.assertEqual(self.manager().sync([result("a"), result("c")])["requests"], 0)
+
+    def test_existing_sheet_is_read_into_snapshot(self):
+        self.service.grid = [COLUMNS, ["a", "Engineer", "Python"], ["b", "Engineer", ""]]
+        counts = self.manager().sync([result("a"), result("b", skills=[])])
+
+        self.assertEqual(counts["unchanged"], 2)
+        self.assertEqual(self.service.calls, ["get"])
+
+    def test_writes_are_chunked(self):
+        counts = self.manager(max_rows_per_request=2).sync([result(str(i)) for i in range(5)])
+
+        self.assertEqual(self.service.calls.count("append"), 3)
+        self.assertEqual(counts["appended"], 5)
+        self.assertEqual(len(self.service.grid), 6)
+
+    def test_backs_off_on_quota_errors(self):
+        manager = self.manager()
+        manager.refresh_snapshot()
+        self.service.failures = [429, 503]
+
+        with patch("src.sheets_integration.sheets_manager.time.sleep") as sleep:
+            manager.sync([result("a")])
+
+        self.assertEqual(manager.retries, 2)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(self.service.grid[1], ["a", "Engineer", "Python"])
+
+    def test_non_retryable_errors_raise(self):
+        manager = self.manager()
+        manager.refresh_snapshot()
+        self.service.failures = [403]
+        with self.assertRaises(FakeHttpError):
+            manager.sync([result("a")])
+
+    def test_helpers(self):
+        self.assertEqual([column_letter(i) for i in (0, 17, 25, 26, 27)], ["A", "R", "Z", "AA", "AB"])
+        self.assertEqual(cell_value(None), "")
+        self.assertEqual(cell_value({"min": 1}), '{"min": 1}')
+
+
+if __name__ == '__main__':
+    unittest.main()
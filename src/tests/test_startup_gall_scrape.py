@@ -0,0 +1,93 @@
+"""
+Unit tests for the incremental startups.gallery crawl.
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.scrapers.crawl_store import CrawlStore
+from src.scrapers.startup_gall_scrape import StartupJobScraper
+from src.scrapers.waits import WaitStats
+
+
+class FakeGalleryDriver:
+    """Simulates the gallery page: each Load More click appends page_size cards."""
+
+    def __init__(self, page_size=3, pages=3):
+        self.page_size = page_size
+        self.pages = pages
+        self.loaded = page_size
+        self.scripts = []
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, value):
+        button = MagicMock()
+        button.click.side_effect = self._load_more
+        return button
+
+    def find_elements(self, by, value):
+        return [object()] * self.loaded
+
+    def _load_more(self):
+        self.loaded = min(self.loaded + self.page_size, self.page_size * self.pages)
+
+    def execute_script(self, script, selector, offset):
+        self.scripts.append(offset)
+        cards = [{"url": f"https://jobs.lever.co/acme/{i}", "title": f"Role {i}", "company_info": f"Company {i}"}
+                 for i in range(offset, self.loaded)]
+        return {"total": self.loaded, "cards": cards}
+
+
+class TestIncrementalCrawl(unittest.TestCase):
+    """Test cases for StartupJobScraper.iter_new_jobs and stream_to_csv."""
+
+    def setUp(self):
+        with patch.object(StartupJobScraper, "setup_driver"):
+            self.scraper = StartupJobScraper(wait_stats=WaitStats())
+        self.scraper.driver = FakeGalleryDriver()
+
+    def test_only_new_cards_are_extracted(self):
+        jobs = list(self.scraper.iter_new_jobs(num_clicks=2))
+
+        self.assertEqual([job["url"] for job in jobs], [f"https://jobs.lever.co/acme/{i}" for i in range(9)])
+        self.assertEqual(self.scraper.driver.scripts, [0, 3, 6])
+        self.assertEqual(self.scraper.organized_jobs, {})
+
+    def test_store_skips_cards_from_earlier_runs(self):
+        store = CrawlStore(":memory:")
+        self.addCleanup(store.close)
+        store.add_urls([f"https://jobs.lever.co/acme/{i}" for i in range(4)])
+        self.scraper.store = store
+
+        jobs = list(self.scraper.iter_new_jobs(num_clicks=2))
+
+        self.assertEqual([job["url"] for job in jobs], [f"https://jobs.lever.co/acme/{i}" for i in range(4, 9)])
+        self.assertEqual(store.get("https://jobs.lever.co/acme/5")["source"], "startups.gallery")
+        self.assertEqual(len(store), 9)
+
+    def test_stops_when_no_more_cards_load(self):
+        self.scraper.driver.pages = 2
+        with patch("src.scrapers.waits.config.WAIT_TIMEOUTS", {"StartupsGallery": 0.05}):
+            jobs = list(self.scraper.iter_new_jobs(num_clicks=5))
+        self.assertEqual(len(jobs), 6)
+
+    def test_stream_to_csv(self):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        count = self.scraper.stream_to_csv(num_clicks=1, filename=path)
+
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(count, 6)
+        self.assertEqual(rows[0], {"url": "https://jobs.lever.co/acme/0", "title": "Role 0", "company_info": "Company 0"})
+
+
+if __name__ == '__main__':
+    unittest.main()
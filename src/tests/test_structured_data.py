@@ -0,0 +1,156 @@
+"""
+Unit tests for reading posting fields from structured data instead of the LLM.
+"""
+
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from bs4 import BeautifulSoup # type: ignore
+
+from src.extraction.prompts import build_extraction_prompt, content_request, requested_fields, structured_savings
+from src.extraction.schema import EXTRACTION_TOOL_NAME, parse_extraction_message
+from src.extraction.structured_data import (StructuredFieldStats, fields_from_greenhouse_api, fields_from_html,
+                                            fields_from_json_ld, fields_from_lever_api, fields_from_page_payload)
+from src.scrapers.job_app_scraper import LeverJobScraper
+
+JSON_LD = json.dumps({"@context": "https://schema.org", "@graph": [
+    {"@type": "Organization", "name": "Not the posting"},
+    {"@type": "JobPosting", "title": "Backend Engineer", "hiringOrganization": {"name": "Acme"},
+     "employmentType": ["FULL_TIME"], "validThrough": "2026-12-01T00:00:00Z", "jobLocationType": "TELECOMMUTE",
+     "jobLocation": [{"@type": "Place", "address": {"addressLocality": "Berlin", "addressCountry": {"name": "DE"}}}],
+     "baseSalary": {"currency": "EUR", "value": {"minValue": 70000, "maxValue": 90000, "unitText": "YEAR"}}},
+]})
+APP_DATA = {"organization": {"name": "Globex"},
+            "posting": {"title": "Product Designer", "locationName": "New York", "employmentType": "FullTime",
+                        "departmentName": "Design", "isRemote": False}}
+CONTENT = {"url": "https://jobs.lever.co/acme/1", "full_text": "Backend Engineer\nBuild data pipelines in Python.",
+           "platform": "Lever", "structured": {"job_title": "Backend Engineer", "location": "Berlin",
+                                                 "employment_type": "Full-time", "department": "Engineering"}}
+
+
+def tool_message(data, output_tokens=50):
+    return SimpleNamespace(content=[SimpleNamespace(type="tool_use", name=EXTRACTION_TOOL_NAME, input=data)],
+                           usage=SimpleNamespace(input_tokens=100, output_tokens=output_tokens))
+
+
+class TestExtractors(unittest.TestCase):
+    """Test cases for the per-source field extractors."""
+
+    def test_json_ld_job_posting(self):
+        self.assertEqual(fields_from_json_ld(["not json", JSON_LD]), {
+            "job_title": "Backend Engineer", "company_name": "Acme", "location": "Berlin, DE; Remote",
+            "employment_type": "Full-time", "application_deadline": "2026-12-01",
+            "compensation": "EUR 70,000-90,000 per year"})
+        self.assertEqual(fields_from_json_ld([json.dumps({"@type": "WebPage"})]), {})
+
+    def test_html_reads_scripts(self):
+        soup = BeautifulSoup(f"""<html><body><h1>Product Designer</h1>
+            <script>window.__appData = {json.dumps(APP_DATA)};</script></body></html>""", "html.parser")
+        self.assertEqual(fields_from_html(soup), {"job_title": "Product Designer", "company_name": "Globex",
+                                                  "location": "New York", "employment_type": "Full-time",
+                                                  "department": "Design"})
+
+        soup = BeautifulSoup(f'<script type="application/ld+json">{JSON_LD}</script>', "html.parser")
+        self.assertEqual(fields_from_html(soup)["company_name"], "Acme")
+        self.assertEqual(fields_from_page_payload({"ld_json": [JSON_LD], "app_data": json.dumps(APP_DATA)})
+                         ["job_title"], "Backend Engineer")
+        self.assertEqual(fields_from_page_payload({"text": "no data scripts"}), {})
+
+    def test_board_apis(self):
+        self.assertEqual(fields_from_greenhouse_api({
+            "title": "Data Engineer", "company_name": "Initech", "location": {"name": "Austin, TX"},
+            "departments": [{"name": "Data"}]}),
+            {"job_title": "Data Engineer", "company_name": "Initech", "location": "Austin, TX", "department": "Data"})
+        self.assertEqual(fields_from_lever_api({
+            "text": "Account Executive", "workplaceType": "remote",
+            "categories": {"location": "London", "team": "Sales", "commitment": "Full-time"},
+            "salaryRange": {"currency": "GBP", "min": 60000, "max": 60000, "interval": "per-year-salary"}}),
+            {"job_title": "Account Executive", "location": "London (Remote)", "employment_type": "Full-time",
+             "department": "Sales", "compensation": "GBP 60,000 per year"})
+
+
+class TestReducedPrompt(unittest.TestCase):
+    """Test cases for asking the LLM only for what structured data did not give."""
+
+    def test_full_prompt_without_structured_data(self):
+        content = {key: value for key, value in CONTENT.items() if key != "structured"}
+        self.assertEqual(len(requested_fields(content)), 18)
+        self.assertIn("- source_url: https://jobs.lever.co/acme/1", build_extraction_prompt(content, "Lever"))
+        self.assertEqual(structured_savings(content, "Lever"), (0, 0, 0))
+
+    def test_known_fields_are_not_requested(self):
+        request = content_request(CONTENT, "Lever")
+        prompt = request["messages"][0]["content"]
+        properties = request["tools"][0]["input_schema"]["properties"]
+
+        for name in ("job_title", "location", "employment_type", "department", "source_url", "platform"):
+            self.assertNotIn(f"- {name}:", prompt)
+            self.assertNotIn(name, properties)
+        self.assertIn("- good_fit_indicators:", prompt)
+        self.assertIn("company_name", properties)
+
+        filled, input_saved, output_saved = structured_savings(CONTENT, "Lever")
+        self.assertEqual(filled, 4)
+        self.assertGreater(input_saved, 0)
+        self.assertGreater(output_saved, 0)
+
+    def test_structured_fields_override_the_reply(self):
+        record, method = parse_extraction_message(
+            tool_message({"job_title": "Engineer", "required_skills": ["Python"], "company_name": "Acme"}),
+            CONTENT, "Lever")
+        self.assertEqual(method, "tool_use")
+        self.assertEqual((record["job_title"], record["location"], record["company_name"]),
+                         ("Backend Engineer", "Berlin", "Acme"))
+        self.assertEqual((record["source_url"], record["platform"]), ("https://jobs.lever.co/acme/1", "Lever"))
+
+    def test_scraper_records_savings(self):
+        client = MagicMock()
+        client.messages.create.return_value = tool_message({"required_skills": ["Python"]})
+        stats = StructuredFieldStats(seconds_per_output_token=0.01)
+        scraper = LeverJobScraper(cache_mode="bypass", client=client, structured_stats=stats)
+
+        record = scraper.process_with_llm(CONTENT, "Lever")
+
+        self.assertEqual(record["department"], "Engineering")
+        self.assertNotIn("job_title", client.messages.create.call_args.kwargs["tools"][0]["input_schema"]["properties"])
+        row = stats.summary()[0]
+        self.assertEqual((row["postings"], row["structured"], row["fields_filled"]), (1, 1, 4))
+        self.assertGreater(row["latency_saved_per_posting"], 0)
+
+    def test_repair_asks_for_the_same_fields(self):
+        client = MagicMock()
+        client.messages.create.side_effect = [tool_message({"required_skills": {"nested": "Python"}}),
+                                              tool_message({"required_skills": ["Python"], "location": "Paris"})]
+        scraper = LeverJobScraper(cache_mode="bypass", client=client, structured_stats=StructuredFieldStats())
+
+        record = scraper.process_with_llm(CONTENT, "Lever")
+
+        first, repair = client.messages.create.call_args_list
+        self.assertEqual(repair.kwargs["tools"], first.kwargs["tools"])
+        self.assertNotIn("location", repair.kwargs["tools"][0]["input_schema"]["properties"])
+        self.assertEqual((record["location"], record["required_skills"]), ("Berlin", ["Python"]))
+
+
+class TestStructuredFieldStats(unittest.TestCase):
+    """Test cases for the StructuredFieldStats class."""
+
+    def test_fits_seconds_per_output_token(self):
+        stats = StructuredFieldStats(seconds_per_output_token=0.5)
+        self.assertEqual(stats.seconds_per_output_token(), 0.5)
+        for tokens in (100, 200, 400):
+            stats.observe(tokens, 1.0 + tokens * 0.02)
+        self.assertAlmostEqual(stats.seconds_per_output_token(), 0.02)
+
+        stats.record("Lever", 4, 60, 30)
+        stats.record("Lever", 0, 0, 0)
+        row = stats.summary()[0]
+        self.assertEqual((row["postings"], row["structured"], row["input_tokens_saved_per_posting"],
+                          row["output_tokens_saved_per_posting"], row["latency_saved_per_posting"]),
+                         (2, 1, 30.0, 15.0, 0.3))
+        self.assertIn("1/2 postings", stats.format_summary()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
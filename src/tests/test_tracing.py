@@ -0,0 +1,82 @@
+"""
+Unit tests for per-stage span tracing.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from src.utils.tracing import Tracer, percentile
+
+
+class TestTracer(unittest.TestCase):
+    """Test cases for the Tracer class."""
+
+    def test_percentile_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(percentile([2.0], 99), 2.0)
+
+    def test_summary_groups_by_stage_and_platform(self):
+        tracer = Tracer()
+        for seconds in (0.1, 0.2, 0.3):
+            tracer.record("page_load", seconds, platform="Lever")
+        tracer.record("page_load", 1.0, platform="Ashby")
+
+        rows = {(row["stage"], row["platform"]): row for row in tracer.summary()}
+        self.assertEqual(rows[("page_load", "Lever")]["count"], 3)
+        self.assertEqual(rows[("page_load", "Lever")]["p50_seconds"], 0.2)
+        self.assertEqual(rows[("page_load", "all")]["count"], 4)
+        self.assertEqual(rows[("page_load", "all")]["max_seconds"], 1.0)
+
+    def test_spans_inherit_context(self):
+        tracer = Tracer()
+        with tracer.context(url="https://jobs.lever.co/a/1", platform="Lever"):
+            with tracer.span("dom_extract"):
+                pass
+        with tracer.span("dom_extract"):
+            pass
+
+        platforms = {row["platform"] for row in tracer.summary()}
+        self.assertEqual(platforms, {"Lever", "Unknown", "all"})
+
+    def test_errors_and_tokens_are_counted(self):
+        tracer = Tracer()
+        with tracer.span("llm", platform="Lever") as span:
+            span.set(input_tokens=100, output_tokens=20)
+        with self.assertRaises(ValueError):
+            with tracer.span("llm", platform="Lever"):
+                raise ValueError("bad response")
+
+        row = next(row for row in tracer.summary() if row["platform"] == "Lever")
+        self.assertEqual(row["count"], 2)
+        self.assertEqual(row["errors"], 1)
+        self.assertEqual(row["input_tokens"], 100)
+        self.assertEqual(row["output_tokens"], 20)
+        self.assertIn("100 input tokens", tracer.format_summary()[0])
+
+    def test_trace_file_gets_one_line_per_span(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "traces", "run.jsonl")
+            tracer = Tracer(path)
+            with tracer.context(url="https://jobs.lever.co/a/1", platform="Lever"):
+                with tracer.span("page_load"):
+                    pass
+                tracer.record("wait", 0.5, condition="job_content")
+            tracer.close()
+
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+
+        self.assertEqual([line["stage"] for line in lines], ["page_load", "wait"])
+        self.assertEqual(lines[1]["url"], "https://jobs.lever.co/a/1")
+        self.assertEqual(lines[1]["condition"], "job_content")
+        self.assertEqual(lines[1]["seconds"], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Unit tests for the readiness-driven page waits.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+from selenium.common.exceptions import TimeoutException # type: ignore
+from selenium.webdriver.common.by import By # type: ignore
+
+from src.scrapers.waits import PageWaiter, WaitStats
+
+CARDS = (By.CSS_SELECTOR, "a.job-card")
+
+
+class TestPageWaiter(unittest.TestCase):
+    """Test cases for the PageWaiter class."""
+
+    def setUp(self):
+        self.driver = MagicMock()
+        self.stats = WaitStats()
+
+    def test_count_increased_returns_new_count(self):
+        self.driver.find_elements.side_effect = [[1] * 10, [1] * 10, [1] * 20]
+        waiter = PageWaiter(self.driver, "StartupsGallery", self.stats, timeout=2, poll_interval=0.01)
+
+        self.assertEqual(waiter.count_increased(CARDS, 10), 20)
+        [row] = self.stats.summary()
+        self.assertEqual((row["platform"], row["condition"], row["count"], row["timeouts"]),
+                         ("StartupsGallery", "count_increased", 1, 0))
+
+    def test_timeout_is_recorded_and_raised(self):
+        self.driver.find_elements.return_value = [1] * 10
+        waiter = PageWaiter(self.driver, "StartupsGallery", self.stats, timeout=0.05, poll_interval=0.01)
+
+        with self.assertRaises(TimeoutException):
+            waiter.count_increased(CARDS, 10, "job_cards_appended")
+        [row] = self.stats.summary()
+        self.assertEqual(row["timeouts"], 1)
+        self.assertGreaterEqual(row["max_seconds"], 0.05)
+
+    def test_element_present(self):
+        element = MagicMock()
+        self.driver.find_element.return_value = element
+        waiter = PageWaiter(self.driver, "Lever", self.stats, timeout=1)
+
+        self.assertIs(waiter.element_present((By.CLASS_NAME, "posting-headline")), element)
+
+    def test_network_idle_waits_for_stable_resource_count(self):
+        self.driver.execute_script.side_effect = [["loading", 3], ["complete", 5], ["complete", 5], ["complete", 5]]
+        waiter = PageWaiter(self.driver, "Greenhouse", self.stats, timeout=2, poll_interval=0.01)
+
+        self.assertTrue(waiter.network_idle(idle_ms=0))
+        self.assertEqual(self.driver.execute_script.call_count, 3)
+
+    def test_network_idle_returns_false_on_timeout(self):
+        counter = iter(range(1000))
+        self.driver.execute_script.side_effect = lambda script: ["complete", next(counter)]
+        waiter = PageWaiter(self.driver, "Greenhouse", self.stats, timeout=0.05, poll_interval=0.01)
+
+        self.assertFalse(waiter.network_idle(idle_ms=10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,8 +9,129 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 GOOGLE_CREDENTIALS_PATH = os.getenv("GOOGLE_CREDENTIALS_PATH")
 
 # Scraping Configuration
-SCRAPING_DELAY = int(os.getenv("SCRAPING_DELAY", "3"))
+SCRAPING_DELAY = float(os.getenv("SCRAPING_DELAY", "3"))  # starting seconds between requests to one domain
 USER_AGENT = os.getenv("USER_AGENT", "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)")
 
 # Logging Configuration
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
\ No newline at end of file
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+TRACE_PATH = os.getenv("TRACE_PATH")  # JSONL span trace; unset keeps spans in memory for the run summary
+
+# Browser Configuration
+LEAN_BROWSER = os.getenv("LEAN_BROWSER", "false").lower() == "true"  # block images/media/fonts/trackers, eager loads
+RENDERER_MEMORY_MB = int(os.getenv("RENDERER_MEMORY_MB", "512"))
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")  # skips ChromeDriverManager entirely
+CHROMEDRIVER_CACHE_PATH = os.getenv("CHROMEDRIVER_CACHE_PATH", os.path.join(".cache", "chromedriver.json"))
+CHROMEDRIVER_CACHE_DAYS = float(os.getenv("CHROMEDRIVER_CACHE_DAYS", "7"))
+OFFLINE = os.getenv("OFFLINE", "false").lower() == "true"
+DRIVER_PREWARM = os.getenv("DRIVER_PREWARM", "false").lower() == "true"  # launch pool browsers before the first job
+DRIVER_RESET_BETWEEN_JOBS = os.getenv("DRIVER_RESET_BETWEEN_JOBS", "true").lower() == "true"
+
+# Batch Scraping Configuration
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+DRIVER_RECYCLE_AFTER = int(os.getenv("DRIVER_RECYCLE_AFTER", "200"))
+
+# HTTP Fetch Configuration
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+MIN_STATIC_TEXT_LENGTH = int(os.getenv("MIN_STATIC_TEXT_LENGTH", "200"))
+
+# Per-Domain Rate Limiting Configuration (starts at one request per SCRAPING_DELAY seconds)
+HOST_MAX_RATE = float(os.getenv("HOST_MAX_RATE", "2"))  # requests/second a healthy domain can ramp up to
+HOST_MIN_RATE = float(os.getenv("HOST_MIN_RATE", "0.05"))
+HOST_RATE_STEP = float(os.getenv("HOST_RATE_STEP", "0.05"))  # requests/second added per healthy response
+HOST_BURST = float(os.getenv("HOST_BURST", "2"))
+HOST_LATENCY_FACTOR = float(os.getenv("HOST_LATENCY_FACTOR", "2"))  # slow down once latency exceeds its baseline by this
+HOST_BREAKER_FAILURES = int(os.getenv("HOST_BREAKER_FAILURES", "5"))  # consecutive failures before a domain is parked
+HOST_BREAKER_COOLDOWN = float(os.getenv("HOST_BREAKER_COOLDOWN", "60"))  # doubles each time the domain trips again
+HOST_BREAKER_MAX_COOLDOWN = float(os.getenv("HOST_BREAKER_MAX_COOLDOWN", "900"))
+HOST_RETRY_AFTER_PARK = float(os.getenv("HOST_RETRY_AFTER_PARK", "10"))  # longer Retry-After pauses park the domain
+HOST_REQUEUE_MAX_WAIT = float(os.getenv("HOST_REQUEUE_MAX_WAIT", "300"))  # longer parks are left for the next run
+
+# Page Wait Configuration (seconds per platform)
+WAIT_TIMEOUTS = {
+    "Ashby": float(os.getenv("ASHBY_WAIT_TIMEOUT", "10")),
+    "Greenhouse": float(os.getenv("GREENHOUSE_WAIT_TIMEOUT", "10")),
+    "Lever": float(os.getenv("LEVER_WAIT_TIMEOUT", "10")),
+    "StartupsGallery": float(os.getenv("GALLERY_WAIT_TIMEOUT", "15")),
+}
+DEFAULT_WAIT_TIMEOUT = float(os.getenv("DEFAULT_WAIT_TIMEOUT", "10"))
+WAIT_POLL_INTERVAL = float(os.getenv("WAIT_POLL_INTERVAL", "0.1"))
+NETWORK_IDLE_MS = int(os.getenv("NETWORK_IDLE_MS", "500"))
+
+# LLM Extraction Cache Configuration
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_extractions.sqlite"))
+LLM_CACHE_TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "use")  # use, bypass or refresh
+
+# Async LLM Extraction Configuration
+ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL")
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "50"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "40000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "60"))
+LLM_REPAIR_MODEL = os.getenv("LLM_REPAIR_MODEL", "claude-3-5-haiku-20241022")
+LLM_REPAIR_ATTEMPTS = int(os.getenv("LLM_REPAIR_ATTEMPTS", "1"))
+
+# Message Batches Configuration
+LLM_BATCH_CHECKPOINT_PATH = os.getenv("LLM_BATCH_CHECKPOINT_PATH", os.path.join(".cache", "llm_batches.json"))
+LLM_BATCH_POLL_INTERVAL = float(os.getenv("LLM_BATCH_POLL_INTERVAL", "60"))
+LLM_BATCH_MAX_REQUESTS = int(os.getenv("LLM_BATCH_MAX_REQUESTS", "10000"))
+
+# Pre-LLM Text Compaction Configuration
+COMPACT_TEXT = os.getenv("COMPACT_TEXT", "true").lower() == "true"
+COMPACT_MAX_TOKENS = int(os.getenv("COMPACT_MAX_TOKENS", "3000"))
+
+# Structured Field Configuration (fields read from JSON-LD and board APIs instead of the LLM)
+STRUCTURED_FIELDS = os.getenv("STRUCTURED_FIELDS", "true").lower() == "true"
+# Used to estimate latency saved until enough LLM calls have been timed to fit it
+LLM_SECONDS_PER_OUTPUT_TOKEN = float(os.getenv("LLM_SECONDS_PER_OUTPUT_TOKEN", "0.015"))
+
+# Crawl State Configuration
+CRAWL_STORE_PATH = os.getenv("CRAWL_STORE_PATH", os.path.join(".cache", "crawl_state.sqlite"))
+CRAWL_REFRESH_DAYS = float(os.getenv("CRAWL_REFRESH_DAYS", "7"))
+CRAWL_MAX_ATTEMPTS = int(os.getenv("CRAWL_MAX_ATTEMPTS", "3"))
+
+# Job Store Configuration (Parquet dataset partitioned by scrape date and platform)
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH")  # unset keeps results in JSON/JSONL only
+JOB_STORE_FLUSH_ROWS = int(os.getenv("JOB_STORE_FLUSH_ROWS", "5000"))
+
+# Relevance Filter Configuration (keyword lists are comma-separated)
+FILTER_MODEL = os.getenv("FILTER_MODEL", "claude-3-5-haiku-20241022")
+FILTER_PROFILE = os.getenv("FILTER_PROFILE", "Software engineer building backend services, APIs, data pipelines "
+                                             "and machine learning systems in Python on cloud infrastructure")
+FILTER_TITLE_KEYWORDS = [k.strip() for k in os.getenv("FILTER_TITLE_KEYWORDS", "engineer,developer,scientist").split(",") if k.strip()]
+FILTER_EXCLUDE_TITLE_KEYWORDS = [k.strip() for k in os.getenv("FILTER_EXCLUDE_TITLE_KEYWORDS", "sales,account executive,recruiter,marketing").split(",") if k.strip()]
+FILTER_LOCATIONS = [k.strip() for k in os.getenv("FILTER_LOCATIONS", "remote").split(",") if k.strip()]
+FILTER_EXCLUDE_LOCATIONS = [k.strip() for k in os.getenv("FILTER_EXCLUDE_LOCATIONS", "").split(",") if k.strip()]
+FILTER_ACCEPT_SCORE = float(os.getenv("FILTER_ACCEPT_SCORE", "0.35"))
+FILTER_REJECT_SCORE = float(os.getenv("FILTER_REJECT_SCORE", "0.05"))
+
+# Near-Duplicate Detection Configuration (MinHash/LSH over posting text)
+DEDUP_NEAR_DUPLICATES = os.getenv("DEDUP_NEAR_DUPLICATES", "true").lower() == "true"
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", os.path.join(".cache", "near_duplicates.sqlite"))
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))  # estimated Jaccard similarity of word shingles
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16"))  # must divide DEDUP_NUM_PERM
+DEDUP_SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", "5"))
+
+# Job Matching Index Configuration (embeddings of extracted postings, queried with a profile)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "transformers")  # transformers, or hashing (no model download)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))  # hashing backend only; models have their own
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_INDEX_PATH = os.getenv("EMBEDDING_INDEX_PATH", os.path.join(".cache", "embedding_index"))
+
+# Google Sheets Sync Configuration
+SHEETS_SPREADSHEET_ID = os.getenv("SHEETS_SPREADSHEET_ID")
+SHEETS_SHEET_NAME = os.getenv("SHEETS_SHEET_NAME", "Jobs")
+SHEETS_SNAPSHOT_PATH = os.getenv("SHEETS_SNAPSHOT_PATH", os.path.join(".cache", "sheets_snapshot.json"))
+SHEETS_MAX_ROWS_PER_REQUEST = int(os.getenv("SHEETS_MAX_ROWS_PER_REQUEST", "500"))
+SHEETS_REQUESTS_PER_MINUTE = int(os.getenv("SHEETS_REQUESTS_PER_MINUTE", "60"))
+SHEETS_MAX_RETRIES = int(os.getenv("SHEETS_MAX_RETRIES", "5"))
+
+# Pipeline Configuration
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "100"))
+PIPELINE_FETCH_WORKERS = int(os.getenv("PIPELINE_FETCH_WORKERS", str(BATCH_WORKERS)))
+PIPELINE_FILTER_BATCH_SIZE = int(os.getenv("PIPELINE_FILTER_BATCH_SIZE", "32"))
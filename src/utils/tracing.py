@@ -0,0 +1,176 @@
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Span:
+    """Attributes of an in-progress span; set() adds fields such as token counts before it is recorded"""
+
+    def __init__(self, attrs: Dict[str, Any]):
+        self.attrs = attrs
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """
+    Records per-URL timing spans (page load, waits, DOM extraction, LLM calls...) to an
+    optional JSONL trace and summarizes them as p50/p95/p99 per stage and platform.
+
+    Spans inherit url and platform from the enclosing context() on the same thread, so
+    helpers deep in a scraper do not need them passed in.
+    """
+
+    def __init__(self, trace_path: Optional[str] = None):
+        """
+        Args:
+            trace_path: JSONL file to append one line per span to (None keeps spans in memory only)
+        """
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._durations: Dict[Tuple[str, str], List[float]] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._tokens: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._file = None
+        if trace_path:
+            self.open(trace_path)
+
+    def open(self, trace_path: str) -> None:
+        """Start appending spans to a JSONL file"""
+        if os.path.dirname(trace_path):
+            os.makedirs(os.path.dirname(trace_path), exist_ok=True)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(trace_path, "a", buffering=1)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _context(self) -> Dict[str, Any]:
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else {}
+
+    @contextmanager
+    def context(self, **attrs: Any) -> Iterator[None]:
+        """Attach attributes (typically url and platform) to every span recorded on this thread inside the block"""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append({**(stack[-1] if stack else {}), **attrs})
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    @contextmanager
+    def span(self, stage: str, **attrs: Any) -> Iterator[Span]:
+        """Time the enclosed block as one span; exceptions are recorded and re-raised"""
+        span = Span(attrs)
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - start, started_at=started_at, **span.attrs)
+
+    def record(self, stage: str, seconds: float, started_at: Optional[float] = None, **attrs: Any) -> None:
+        """Record a span measured elsewhere"""
+        entry = {**self._context(), **attrs}
+        platform = entry.get("platform") or "Unknown"
+        key = (stage, platform)
+        with self._lock:
+            self._durations.setdefault(key, []).append(seconds)
+            if entry.get("error"):
+                self._errors[key] = self._errors.get(key, 0) + 1
+            for name, value in entry.items():
+                if name.endswith("_tokens") and isinstance(value, int):
+                    totals = self._tokens.setdefault(key, {})
+                    totals[name] = totals.get(name, 0) + value
+            if self._file is not None:
+                line = {"ts": round(started_at if started_at is not None else time.time() - seconds, 3),
+                        "stage": stage, "seconds": round(seconds, 4), **entry}
+                self._file.write(json.dumps(line, default=str) + "\n")
+
+    @staticmethod
+    def _row(stage: str, platform: str, durations: List[float], errors: int, tokens: Dict[str, int]) -> Dict[str, Any]:
+        values = sorted(durations)
+        row: Dict[str, Any] = {"stage": stage, "platform": platform, "count": len(values)}
+        for pct in PERCENTILES:
+            row[f"p{pct}_seconds"] = round(percentile(values, pct), 4)
+        row["max_seconds"] = round(values[-1], 4) if values else 0.0
+        row["total_seconds"] = round(sum(values), 4)
+        row["errors"] = errors
+        row.update(tokens)
+        return row
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per (stage, platform) span counts, percentiles, errors and token totals, plus an 'all' row per stage"""
+        with self._lock:
+            rows = []
+            by_stage: Dict[str, Dict[str, Any]] = {}
+            for (stage, platform), durations in sorted(self._durations.items()):
+                errors = self._errors.get((stage, platform), 0)
+                tokens = dict(self._tokens.get((stage, platform), {}))
+                rows.append(self._row(stage, platform, durations, errors, tokens))
+
+                combined = by_stage.setdefault(stage, {"durations": [], "errors": 0, "tokens": {}})
+                combined["durations"].extend(durations)
+                combined["errors"] += errors
+                for name, value in tokens.items():
+                    combined["tokens"][name] = combined["tokens"].get(name, 0) + value
+
+            for stage, combined in sorted(by_stage.items()):
+                rows.append(self._row(stage, "all", combined["durations"], combined["errors"], combined["tokens"]))
+            return rows
+
+    def format_summary(self) -> List[str]:
+        """Return one human-readable line per (stage, platform)"""
+        lines = []
+        for row in self.summary():
+            line = (f"Span {row['stage']}/{row['platform']}: {row['count']} spans, "
+                    f"p50 {row['p50_seconds']}s, p95 {row['p95_seconds']}s, p99 {row['p99_seconds']}s, "
+                    f"max {row['max_seconds']}s, {row['errors']} errors")
+            tokens = {name: value for name, value in row.items() if name.endswith("_tokens")}
+            if tokens:
+                line += ", " + ", ".join(f"{value} {name.replace('_', ' ')}" for name, value in sorted(tokens.items()))
+            lines.append(line)
+        return lines
+
+    def log_summary(self) -> None:
+        for line in self.format_summary():
+            logger.info(line)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._errors.clear()
+            self._tokens.clear()
+
+
+# Shared by all scrapers and extractors unless one is given its own
+DEFAULT_TRACER = Tracer()